@@ -1,36 +1,93 @@
+import gc
 import pygame
 import sys
 import random
 import math
 
-# Инициализация Pygame
-pygame.init()
+from gamekit.dirty import DirtyRenderer
+from gamekit.layers import LayeredRenderer
+from gamekit.loop import FixedStepLoop, lerp
+from gamekit.pool import ActiveList, FreeList
+from gamekit.profiler import FrameProfiler
+from gamekit.replay import Recorder
+from gamekit.spatial import BATCHED, SpatialHash, collide_circles
+from gamekit.sprites import RotationAtlas, trim
+from gamekit.text import TextLabel
+from gamekit.window import open_window
+
+# Векторный режим фигур и пакетная среда для ботов требуют NumPy
+try:
+    from gamekit.shape_store import RowField, ShapeStore
+    from gamekit.shooter_env import ShooterEnv
+except ImportError:
+    RowField = ShapeStore = ShooterEnv = None
 
 # Константы для настроек игры
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
-FPS = 60
+TICK_RATE = 60                   # Шагов игры в секунду (все скорости заданы на один шаг)
+MAX_FPS = 60                     # Предел частоты кадров; None — без ограничения (позиции интерполируются между шагами)
 BACKGROUND_COLOR = (20, 25, 45)  # Темно-синий
 PLAYER_COLOR = (0, 200, 255)     # Голубой
 ENEMY_COLORS = [(255, 100, 100), (255, 150, 50), (255, 50, 150)]
 SHAPE_TYPES = ['circle', 'square', 'triangle']
+SHAPE_CORNERS = {'square': 4, 'triangle': 3}  # Количество вершин у многоугольных фигур
 LASER_COLOR = (0, 255, 200)      # Цвет луча
+COLLISION_CELL = None            # Размер клетки сетки для поиска столкновений; None — по радиусам фигур и лучей
+BATCH_COLLISION_PAIRS = 5000     # С этого числа пар «луч x фигура» столкновения ищутся одним расчётом NumPy
+VECTORIZED_SHAPES = False        # Хранить фигуры в массивах NumPy (для тысяч фигур)
+SPRITE_ROTATION_STEP = 3         # Шаг углов (градусы) для заранее нарисованных фигур
+EXACT_SHAPE_DRAWING = False      # True — рисовать многоугольники точно, без кэша спрайтов
+SPRITE_CACHE_MB = None           # Предел памяти кэша спрайтов фигур; None — все кадры (около 72 МБ)
+SPRITE_MAX_EVICTION_RATE = 0.05  # При большей доле вытеснений новые кадры фигур рисуются точно
+SHAPE_SIZES = (15, 40)           # Наименьший и наибольший размер фигуры
+LASER_DIRECTIONS = 64            # Направлений луча в кэше спрайтов (голова и хвост одним кадром)
+EXACT_LASER_DRAWING = False      # True — рисовать лучи кругами, без кэша спрайтов
+DIRTY_RECTS = True               # Обновлять на экране только изменившиеся прямоугольники
+RECORDED_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN)  # Клавиши для записи сессии
+POOL_OBJECTS = False             # Брать лучи и фигуры из пулов (bench/bench_pool.py: сборок и пауз не убавляет)
+POOL_LIMIT = 4096                # Сколько отработавших лучей и фигур держать в пуле
+
+# Баланс (подбирается через tools/sweep.py)
+START_SHAPES = 5                 # Фигур в начале игры
+SPAWN_DELAY = 60                 # Кадров между появлением новых фигур
+MAX_SHAPES = 15                  # Больше фигур по таймеру не появляется
+LASER_COOLDOWN = 20              # Перезарядка луча (кадры)
+LEVEL_SCORE = 500                # Очков на каждый уровень
+
+# Подсказки по управлению в правом верхнем углу
+CONTROLS_TEXT = [
+    "Управление: стрелки для движения",
+    "Пробел или ЛКМ - выстрел лазером",
+    "Цель: избегайте фигур и стреляйте по ним",
+    "R - перезапуск игры, ESC - выход"
+]
 
 # Класс луча (пули)
 class Laser:
+    __slots__ = ("x", "y", "prev_x", "prev_y", "direction_x", "direction_y", "angle", "frame", "speed", "radius", "color",
+                 "active", "lifetime")
+
     def __init__(self, x, y, direction_x, direction_y):
-        self.x = x
-        self.y = y
+        self.reset(x, y, direction_x, direction_y)
+
+    def reset(self, x, y, direction_x, direction_y):
+        """Заполнение луча заново (и при повторном использовании из пула)"""
+        self.x = self.prev_x = x
+        self.y = self.prev_y = y
         self.direction_x = direction_x
         self.direction_y = direction_y
+        self.angle = math.degrees(math.atan2(direction_y, direction_x))  # По нему выбирается спрайт
+        self.frame = None  # Кадр из кэша laser_sprites (направление за время жизни не меняется)
         self.speed = 10
         self.radius = 5
         self.color = LASER_COLOR
         self.active = True
-        self.lifetime = 60  # Луч существует 60 кадров (1 секунда при FPS=60)
+        self.lifetime = 60  # Луч существует 60 шагов (1 секунда при TICK_RATE=60)
         
     def move(self):
         """Движение луча"""
+        self.prev_x, self.prev_y = self.x, self.y
         self.x += self.direction_x * self.speed
         self.y += self.direction_y * self.speed
         self.lifetime -= 1
@@ -41,53 +98,56 @@ class Laser:
             self.lifetime <= 0):
             self.active = False
             
-    def draw(self, screen):
-        """Отрисовка луча"""
+    def draw(self, screen, alpha=1.0):
+        """Отрисовка луча (alpha — доля шага для интерполяции); возвращает прямоугольник, который был нарисован"""
         if self.active:
+            x, y = lerp(self.prev_x, self.x, alpha), lerp(self.prev_y, self.y, alpha)
             # Основной круг луча
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
+            rect = pygame.draw.circle(screen, self.color, (int(x), int(y)), self.radius)
             
             # Эффект свечения луча (внутренний круг)
-            pygame.draw.circle(screen, (255, 255, 255), (int(self.x), int(self.y)), self.radius - 2)
+            pygame.draw.circle(screen, (255, 255, 255), (int(x), int(y)), self.radius - 2)
             
             # Эффект хвоста луча
             tail_length = 15
             tail_points = []
             for i in range(5):
-                tail_x = self.x - self.direction_x * i * 3
-                tail_y = self.y - self.direction_y * i * 3
+                tail_x = x - self.direction_x * i * 3
+                tail_y = y - self.direction_y * i * 3
                 tail_radius = self.radius * (1 - i/5)
-                pygame.draw.circle(screen, self.color, (int(tail_x), int(tail_y)), int(tail_radius))
+                rect.union_ip(pygame.draw.circle(screen, self.color, (int(tail_x), int(tail_y)), int(tail_radius)))
+            return rect
+        return None
                 
     def check_collision(self, shape):
         """Проверка столкновения луча с фигурой"""
         if not self.active:
             return False
             
-        distance = math.sqrt((self.x - shape.x)**2 + (self.y - shape.y)**2)
+        # Сравниваем квадраты расстояний, чтобы не считать корень
+        dx = self.x - shape.x
+        dy = self.y - shape.y
         
-        # Для квадратов и треугольников используем упрощенную проверку
-        if shape.shape_type == 'circle':
-            return distance < (self.radius + shape.size)
-        else:
-            # Для квадратов и треугольников используем проверку по bounding circle
-            return distance < (self.radius + shape.size * 1.2)
+        # Для квадратов и треугольников — проверка по описанному кругу (shape.reach())
+        reach = self.radius + shape.reach()
+        return dx * dx + dy * dy < reach * reach
 
 # Класс игрока
 class Player:
     def __init__(self, x, y):
-        self.x = x
-        self.y = y
+        self.x = self.prev_x = x
+        self.y = self.prev_y = y  # prev_* — позиция до последнего шага (для интерполяции)
         self.radius = 20
         self.speed = 5
         self.color = PLAYER_COLOR
         self.score = 0
         self.lives = 3
         self.laser_cooldown = 0  # Время перезарядки луча
-        self.max_cooldown = 20   # Максимальное время перезарядки (кадры)
+        self.max_cooldown = LASER_COOLDOWN  # Максимальное время перезарядки (кадры)
         
     def move(self, keys):
         """Движение игрока по нажатию клавиш"""
+        self.prev_x, self.prev_y = self.x, self.y
         if keys[pygame.K_LEFT] and self.x > self.radius:
             self.x -= self.speed
         if keys[pygame.K_RIGHT] and self.x < SCREEN_WIDTH - self.radius:
@@ -123,36 +183,47 @@ class Player:
             start_x = self.x + direction_x * (self.radius + 5)
             start_y = self.y + direction_y * (self.radius + 5)
             
-            lasers.append(Laser(start_x, start_y, direction_x, direction_y))
+            lasers.append(laser_pool.acquire(start_x, start_y, direction_x, direction_y))
             self.laser_cooldown = self.max_cooldown
             return True
         return False
             
-    def draw(self, screen):
-        """Отрисовка игрока"""
-        pygame.draw.circle(screen, self.color, (self.x, self.y), self.radius)
+    def draw(self, screen, alpha=1.0):
+        """Отрисовка игрока; возвращает прямоугольник, который был нарисован"""
+        x, y = lerp(self.prev_x, self.x, alpha), lerp(self.prev_y, self.y, alpha)
+        rect = pygame.draw.circle(screen, self.color, (x, y), self.radius)
         # Добавляем небольшой внутренний круг для визуального эффекта
-        pygame.draw.circle(screen, (255, 255, 255), (self.x, self.y), self.radius - 8, 2)
+        pygame.draw.circle(screen, (255, 255, 255), (x, y), self.radius - 8, 2)
         
         # Отображение индикатора перезарядки
         if self.laser_cooldown > 0:
             cooldown_percent = self.laser_cooldown / self.max_cooldown
             angle = 360 * cooldown_percent
-            pygame.draw.arc(screen, (255, 50, 50), 
-                           (self.x - 25, self.y - 25, 50, 50),
-                           math.radians(0), math.radians(angle), 3)
+            rect.union_ip(pygame.draw.arc(screen, (255, 50, 50), 
+                                          (x - 25, y - 25, 50, 50),
+                                          math.radians(0), math.radians(angle), 3))
+        return rect
         
     def check_collision(self, enemy):
         """Проверка столкновения с врагом"""
-        distance = math.sqrt((self.x - enemy.x)**2 + (self.y - enemy.y)**2)
-        return distance < (self.radius + enemy.size)
+        dx = self.x - enemy.x
+        dy = self.y - enemy.y
+        reach = self.radius + enemy.size
+        return dx * dx + dy * dy < reach * reach
 
 # Базовый класс для геометрических фигур
 class GeometricShape:
+    __slots__ = ("size", "x", "y", "prev_x", "prev_y", "color", "speed_x", "speed_y", "shape_type", "rotation", "rotation_speed", "health")
+
     def __init__(self):
-        self.size = random.randint(15, 40)
+        self.reset()
+
+    def reset(self):
+        """Новая случайная фигура (и при повторном использовании из пула)"""
+        self.size = random.randint(*SHAPE_SIZES)
         self.x = random.randint(self.size, SCREEN_WIDTH - self.size)
         self.y = random.randint(self.size, SCREEN_HEIGHT - self.size)
+        self.prev_x, self.prev_y = self.x, self.y
         self.color = random.choice(ENEMY_COLORS)
         self.speed_x = random.uniform(-2, 2)
         self.speed_y = random.uniform(-2, 2)
@@ -161,8 +232,16 @@ class GeometricShape:
         self.rotation_speed = random.uniform(-3, 3)
         self.health = 1  # Здоровье фигуры (по умолчанию 1)
         
+    def reach(self):
+        """Радиус, в пределах которого фигура может задеть луч"""
+        if self.shape_type == 'circle':
+            return self.size
+        # Для квадратов и треугольников — описанный круг
+        return self.size * 1.2
+        
     def move(self):
         """Движение фигуры с отскоками от границ экрана"""
+        self.prev_x, self.prev_y = self.x, self.y
         self.x += self.speed_x
         self.y += self.speed_y
         
@@ -175,247 +254,506 @@ class GeometricShape:
         # Вращение фигуры
         self.rotation += self.rotation_speed
         
-    def draw(self, screen):
-        """Отрисовка фигуры в зависимости от её типа"""
+    def draw(self, screen, alpha=1.0):
+        """Отрисовка фигуры в зависимости от её типа; alpha — доля шага для интерполяции"""
+        x, y = lerp(self.prev_x, self.x, alpha), lerp(self.prev_y, self.y, alpha)
         if self.shape_type == 'circle':
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size)
+            rect = pygame.draw.circle(screen, self.color, (int(x), int(y)), self.size)
             # Декоративный внутренний круг
-            pygame.draw.circle(screen, (255, 255, 255), (int(self.x), int(self.y)), self.size - 5, 2)
+            pygame.draw.circle(screen, (255, 255, 255), (int(x), int(y)), self.size - 5, 2)
+            return rect
             
-        elif self.shape_type == 'square':
-            # Создаем повернутый квадрат
-            points = []
-            for i in range(4):
-                angle = self.rotation + i * 90
-                rad_angle = math.radians(angle)
-                px = self.x + self.size * math.cos(rad_angle)
-                py = self.y + self.size * math.sin(rad_angle)
-                points.append((px, py))
-            pygame.draw.polygon(screen, self.color, points)
-            
-        elif self.shape_type == 'triangle':
-            # Создаем повернутый треугольник
-            points = []
-            for i in range(3):
-                angle = self.rotation + i * 120
-                rad_angle = math.radians(angle)
-                px = self.x + self.size * math.cos(rad_angle)
-                py = self.y + self.size * math.sin(rad_angle)
-                points.append((px, py))
-            pygame.draw.polygon(screen, self.color, points)
+        elif self.shape_type in SHAPE_CORNERS:
+            # Поворот за шаг постоянный, поэтому прошлый угол не хранится
+            rotation = self.rotation - self.rotation_speed * (1 - alpha)
+            # Готовый кадр с ближайшим углом поворота (None, если кэш не успевает за числом фигур)
+            sprite = None if EXACT_SHAPE_DRAWING else shape_sprites.lookup(
+                (self.shape_type, self.size, self.color), rotation, 360 // SHAPE_CORNERS[self.shape_type])
+            if sprite is None:
+                # Точная отрисовка: считаем вершины каждый кадр
+                points = shape_points(self.shape_type, x, y, self.size, rotation)
+                return pygame.draw.polygon(screen, self.color, points)
+            half = sprite.get_width() // 2
+            return screen.blit(sprite, (int(x) - half, int(y) - half))
+
+def shape_points(shape_type, x, y, size, rotation):
+    """Вершины повернутого квадрата или треугольника с центром в (x, y)"""
+    corners = SHAPE_CORNERS[shape_type]
+    points = []
+    for i in range(corners):
+        angle = rotation + i * 360 / corners
+        rad_angle = math.radians(angle)
+        px = x + size * math.cos(rad_angle)
+        py = y + size * math.sin(rad_angle)
+        points.append((px, py))
+    return points
+
+def render_shape_sprite(key, rotation):
+    """Рисует один кадр фигуры для кэша спрайтов"""
+    shape_type, size, color = key
+    half = size + 1
+    sprite = pygame.Surface((half * 2, half * 2))
+    # Прозрачный фон через цветовой ключ: такие спрайты с RLE копируются быстрее, чем SRCALPHA
+    sprite.fill((0, 0, 0))
+    sprite.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+    pygame.draw.polygon(sprite, color, shape_points(shape_type, half, half, size, rotation))
+    if pygame.display.get_surface() is not None:
+        sprite = sprite.convert()
+    return sprite
+
+# Пулы отработавших лучей и фигур: новые объекты создаются, только когда пул пуст
+# (с выключенным POOL_OBJECTS ёмкость 0 — каждый объект создаётся заново)
+laser_pool = FreeList(Laser, POOL_LIMIT if POOL_OBJECTS else 0)
+shape_pool = FreeList(GeometricShape, POOL_LIMIT if POOL_OBJECTS else 0)
+
+def render_laser_sprite(key, angle):
+    """Луч, летящий под углом angle: голова и хвост как в Laser.draw; кадр — (спрайт, сдвиг от центра головы)"""
+    color, radius = key
+    direction_x = math.cos(math.radians(angle))
+    direction_y = math.sin(math.radians(angle))
+    half = radius + 4 * 3 + 1  # Хвост тянется на 4 шага по 3 пикселя
+    sprite = pygame.Surface((half * 2 + 1, half * 2 + 1))
+    sprite.fill((0, 0, 0))
+    pygame.draw.circle(sprite, color, (half, half), radius)
+    pygame.draw.circle(sprite, (255, 255, 255), (half, half), radius - 2)
+    for i in range(5):
+        center = (half + round(-direction_x * i * 3), half + round(-direction_y * i * 3))
+        pygame.draw.circle(sprite, color, center, int(radius * (1 - i/5)))
+    if pygame.display.get_surface() is not None:
+        sprite = sprite.convert()
+    # Ключ ставится до обрезки: без него get_bounding_rect считает весь кадр непрозрачным
+    sprite.set_colorkey((0, 0, 0))
+    sprite, (left, top) = trim(sprite)
+    sprite.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+    return sprite, (left - half, top - half)
+
+def draw_lasers(screen, lasers, alpha=1.0):
+    """Все активные лучи одним вызовом Surface.blits; возвращает нарисованные прямоугольники"""
+    if EXACT_LASER_DRAWING:
+        return [laser.draw(screen, alpha) for laser in lasers]
+    batch = []
+    for laser in lasers:
+        if laser.active:
+            frame = laser.frame
+            if frame is None:
+                frame = laser.frame = laser_sprites.get((laser.color, laser.radius), laser.angle)
+            sprite, (left, top) = frame
+            batch.append((sprite, (int(lerp(laser.prev_x, laser.x, alpha)) + left,
+                                   int(lerp(laser.prev_y, laser.y, alpha)) + top)))
+    return screen.blits(batch)
+
+# Кэш лучей по направлениям: для одного цвета не больше LASER_DIRECTIONS маленьких кадров
+laser_sprites = RotationAtlas(render_laser_sprite, 360 / LASER_DIRECTIONS)
+
+def shape_sprite_bytes():
+    """Память всех кадров фигур, которые может запросить игра (все размеры, цвета и углы)"""
+    total = 0
+    for corners in SHAPE_CORNERS.values():
+        frames = round(360 / corners / SPRITE_ROTATION_STEP)
+        for size in range(SHAPE_SIZES[0], SHAPE_SIZES[1] + 1):
+            total += frames * len(ENEMY_COLORS) * (size + 1) ** 2 * 16  # Кадр (2 * (size + 1))² по 4 байта
+    return total
+
+# Кэш повернутых квадратов и треугольников: по умолчанию вмещает все кадры, поэтому
+# не вытесняет; с меньшим бюджетом при частых вытеснениях уступает точной отрисовке
+shape_sprites = RotationAtlas(render_shape_sprite, SPRITE_ROTATION_STEP,
+                              budget_bytes=shape_sprite_bytes() if SPRITE_CACHE_MB is None else SPRITE_CACHE_MB * 1024 * 1024,
+                              max_eviction_rate=SPRITE_MAX_EVICTION_RATE)
+
+def paint_background(surface):
+    """Фон с декоративной сеткой: рисуется один раз и кэшируется"""
+    width, height = surface.get_size()
+    surface.fill(BACKGROUND_COLOR)
+    for x in range(0, width, 50):
+        pygame.draw.line(surface, (30, 35, 60), (x, 0), (x, height), 1)
+    for y in range(0, height, 50):
+        pygame.draw.line(surface, (30, 35, 60), (0, y), (width, y), 1)
+
+# Фигура из векторного хранилища: те же поля и методы, но числа лежат в строке массивов
+if ShapeStore is not None:
+    class ShapeView(GeometricShape):
+        x = RowField()
+        y = RowField()
+        prev_x = RowField()
+        prev_y = RowField()
+        speed_x = RowField()
+        speed_y = RowField()
+        size = RowField(int)
+        rotation = RowField()
+        rotation_speed = RowField()
+
+        __slots__ = ("_store", "_row")
+
+        def __init__(self, store):
+            self.reset(store)
+
+        def reset(self, store):
+            store.add(self)
+            super().reset()
+
+    view_pool = FreeList(ShapeView, POOL_LIMIT if POOL_OBJECTS else 0)
 
 # Класс игры
 class Game:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Геометрическое приключение с лазером!")
-        self.clock = pygame.time.Clock()
+    def __init__(self, vectorized=VECTORIZED_SHAPES, headless=False, profiler=None):
+        # Без окна (headless) игра только считает: нет экрана, шрифтов и отрисовки
+        self.headless = headless
+        if headless:
+            self.screen = None
+        else:
+            self.screen = open_window((SCREEN_WIDTH, SCREEN_HEIGHT), "Геометрическое приключение с лазером!")
+            # Шрифт по умолчанию: SysFont при первом вызове опрашивает все шрифты системы
+            self.font = pygame.font.Font(None, 36)
+            self.small_font = pygame.font.Font(None, 24)
+            self.large_font = pygame.font.Font(None, 72)
+            # Строки счёта рендерятся только при смене значений, подсказки — один раз
+            self.hud = {
+                "score": TextLabel(self.font, "Счет: {}", (255, 255, 255), (10, 10)),
+                "lives": TextLabel(self.font, "Жизни: {}", (255, 255, 255), (10, 50)),
+                "level": TextLabel(self.font, "Уровень: {}", (255, 255, 255), (10, 90)),
+                "shapes": TextLabel(self.small_font, "Фигур: {}", (200, 200, 200), (10, 130)),
+                "lasers": TextLabel(self.small_font, "Лучей: {}", (200, 200, 200), (10, 160)),
+            }
+            self.controls = [(self.small_font.render(text, True, (180, 180, 220)), (SCREEN_WIDTH - 350, 10 + i * 25))
+                             for i, text in enumerate(CONTROLS_TEXT)]
+        self.game_over_screen = None  # Готовый экран окончания игры: собирается раз за игру
         self.player = Player(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
-        self.shapes = []
-        self.lasers = []  # Список активных лучей
-        self.font = pygame.font.SysFont(None, 36)
-        self.small_font = pygame.font.SysFont(None, 24)
+        self.shapes = ActiveList()
+        self.lasers = ActiveList()  # Активные лучи
+        self.running = True
         self.game_over = False
         self.level = 1
-        self.shape_count = 5
+        self.shape_count = START_SHAPES
         self.spawn_timer = 0
-        self.spawn_delay = 60  # кадры между спавном новых фигур
+        self.spawn_delay = SPAWN_DELAY  # кадры между спавном новых фигур
         self.mouse_pos = None  # Позиция курсора мыши
+        self.background = LayeredRenderer([paint_background])  # Статичный фон
+        self.renderer = DirtyRenderer(self.background, DIRTY_RECTS)  # Вывод кадра на экран
+        self.max_shapes = MAX_SHAPES  # Максимальное количество фигур для спавна по таймеру
+        self.shape_grid = SpatialHash(COLLISION_CELL)  # Сетка фигур для проверки лучей
+        self.profiler = profiler or FrameProfiler()  # Время фаз кадра (по умолчанию выключен)
+        # Массивы фигур для векторного режима (None — обычные объекты)
+        if vectorized and ShapeStore is not None:
+            self.shape_store = ShapeStore(SCREEN_WIDTH, SCREEN_HEIGHT)
+        else:
+            self.shape_store = None
         
         # Создаем начальные фигуры
         for _ in range(self.shape_count):
-            self.shapes.append(GeometricShape())
+            self.shapes.append(self.new_shape())
             
-    def handle_events(self):
+    def new_shape(self):
+        """Новая фигура: обычный объект или строка в векторном хранилище"""
+        if self.shape_store is not None:
+            return view_pool.acquire(self.shape_store)
+        return shape_pool.acquire()
+        
+    def remove_shape(self, shape):
+        """Удаление фигуры из списка (и из хранилища в векторном режиме); фигура уходит в пул"""
+        self.shapes.remove(shape)
+        if self.shape_store is not None:
+            self.shape_store.remove(shape)
+            view_pool.release(shape)
+        else:
+            shape_pool.release(shape)
+            
+    def handle_events(self, events=None):
         """Обработка событий игры"""
         self.mouse_pos = None  # Сбрасываем позицию мыши
         
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_r and self.game_over:
-                    self.restart_game()
-                if event.key == pygame.K_ESCAPE:
-                    pygame.quit()
-                    sys.exit()
-                if event.key == pygame.K_SPACE and not self.game_over:
-                    # Выстрел при нажатии пробела (стреляет вперед)
-                    self.player.shoot(self.lasers, None)
-            if event.type == pygame.MOUSEBUTTONDOWN and not self.game_over:
-                if event.button == 1:  # Левая кнопка мыши
-                    # Выстрел при клике мыши (стреляет в сторону курсора)
-                    self.mouse_pos = pygame.mouse.get_pos()
-                    self.player.shoot(self.lasers, self.mouse_pos)
+        for event in pygame.event.get() if events is None else events:
+            self.handle_event(event)
+            
+    def handle_event(self, event):
+        """Обработка одного события (из очереди pygame или из сценария)"""
+        self.profiler.handle_event(event)
+        if event.type == pygame.QUIT:
+            self.running = False
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_r and self.game_over:
+                self.restart_game()
+            if event.key == pygame.K_ESCAPE:
+                self.running = False
+            if event.key == pygame.K_SPACE and not self.game_over:
+                # Выстрел при нажатии пробела (стреляет вперед)
+                self.player.shoot(self.lasers, None)
+        if event.type == pygame.MOUSEBUTTONDOWN and not self.game_over:
+            if event.button == 1:  # Левая кнопка мыши
+                # Выстрел при клике мыши (стреляет в сторону курсора)
+                self.mouse_pos = event.pos
+                self.player.shoot(self.lasers, self.mouse_pos)
                     
-    def update(self):
-        """Обновление состояния игры"""
+    def update(self, keys=None):
+        """Обновление состояния игры; keys — состояние клавиш (по умолчанию с клавиатуры)"""
+        lap = self.profiler.lap
         if not self.game_over:
             # Движение игрока
-            keys = pygame.key.get_pressed()
+            if keys is None:
+                keys = pygame.key.get_pressed()
             self.player.move(keys)
             
             # Обновление фигур
-            for shape in self.shapes:
-                shape.move()
+            if self.shape_store is not None:
+                self.shape_store.step()
+                lap("update")
+                hits = self.shape_store.collide(self.player.x, self.player.y, self.player.radius)
+            else:
+                for shape in self.shapes:
+                    shape.move()
+                lap("update")
+                hits = [shape for shape in self.shapes if self.player.check_collision(shape)]
                 
-                # Проверка столкновений игрока с фигурой
-                if self.player.check_collision(shape):
-                    self.player.lives -= 1
-                    self.shapes.remove(shape)
-                    # Добавляем новую фигуру взамен удаленной
-                    self.shapes.append(GeometricShape())
+            # Столкновения игрока с фигурами (после движения всех фигур, в порядке списка)
+            for shape in hits:
+                self.player.lives -= 1
+                self.remove_shape(shape)
+                # Добавляем новую фигуру взамен удаленной
+                self.shapes.append(self.new_shape())
+                
+                # Проверяем, остались ли жизни у игрока
+                if self.player.lives <= 0:
+                    self.game_over = True
                     
-                    # Проверяем, остались ли жизни у игрока
-                    if self.player.lives <= 0:
-                        self.game_over = True
-                        
-            # Обновление лучей
-            for laser in self.lasers[:]:  # Используем копию списка для безопасного удаления
+            # Обновление лучей: каждый луч проверяет только фигуры из соседних клеток
+            # (в том же порядке, что и в списке). Лучи летят независимо от фигур, поэтому сначала сдвигаются все
+            for laser in self.lasers:
                 laser.move()
-                
+            grid = fresh = self.shape_grid
+            batch = None
+            if BATCHED and len(self.lasers) * len(self.shapes) >= BATCH_COLLISION_PAIRS:
+                # Все пары «луч — фигура» одним расчётом по спискам координат; кто кого сбил, решается ниже по порядку
+                active = [laser for laser in self.lasers if laser.active]
+                shapes = list(self.shapes)
+                hits = collide_circles(shapes, [shape.x for shape in shapes], [shape.y for shape in shapes],
+                                       [shape.reach() for shape in shapes],
+                                       [laser.x for laser in active], [laser.y for laser in active],
+                                       [laser.radius for laser in active])
+                batch = {laser: index for index, laser in enumerate(active)}
+                downed = set()  # Фигуры из расчёта, которые уже сбиты (объект мог вернуться из пула новой фигурой)
+                # Фигуры, появившиеся во время обхода, расчёт не видел: они в своей сетке
+                fresh = SpatialHash(COLLISION_CELL)
+            elif self.lasers:
+                grid.rebuild(self.shapes, GeometricShape.reach, max(laser.radius for laser in self.lasers))
+            spent = []
+            for laser in self.lasers:
                 # Проверка столкновений лучей с фигурами
-                for shape in self.shapes[:]:
-                    if laser.check_collision(shape):
+                if laser.active:
+                    if batch is None:
+                        shape = grid.first_hit(laser.x, laser.y, laser.radius, laser.check_collision)
+                    else:
+                        # Первая ещё не сбитая фигура из пар; новые фигуры появились позже всех
+                        shape = next((shape for shape in hits.objects(batch[laser]) if shape not in downed), None)
+                        if shape is None and fresh:
+                            shape = fresh.first_hit(laser.x, laser.y, laser.radius, laser.check_collision)
+                    if shape is not None:
                         # Уничтожаем фигуру
-                        self.shapes.remove(shape)
+                        self.remove_shape(shape)
+                        if batch is not None and shape not in fresh:
+                            downed.add(shape)
+                        else:
+                            fresh.remove(shape)
                         # Добавляем очки за уничтожение
                         self.player.score += 100
                         # Помечаем луч как неактивный
                         laser.active = False
-                        # Добавляем новую фигуру
-                        self.shapes.append(GeometricShape())
-                        break
-                
-                # Удаляем неактивные лучи
+                        # Добавляем новую фигуру (её тоже могут задеть следующие лучи)
+                        new_shape = self.new_shape()
+                        self.shapes.append(new_shape)
+                        fresh.insert(new_shape, new_shape.x, new_shape.y, new_shape.reach())
+
+                # Погасшие лучи убираются после обхода и возвращаются в пул
                 if not laser.active:
-                    self.lasers.remove(laser)
+                    spent.append(laser)
+            for laser in spent:
+                self.lasers.remove(laser)
+                laser_pool.release(laser)
+            lap("collision")
             
             # Увеличение счета со временем
             self.player.score += 0.1
             
             # Уровень сложности увеличивается со временем
-            if self.player.score > self.level * 500:
+            if self.player.score > self.level * LEVEL_SCORE:
                 self.level += 1
                 self.shape_count += 2
                 # Добавляем новые фигуры при повышении уровня
                 for _ in range(2):
-                    self.shapes.append(GeometricShape())
+                    self.shapes.append(self.new_shape())
                     
             # Периодическое добавление новых фигур
             self.spawn_timer += 1
             if self.spawn_timer >= self.spawn_delay:
                 self.spawn_timer = 0
-                if len(self.shapes) < 15:  # Максимальное количество фигур
-                    self.shapes.append(GeometricShape())
+                if len(self.shapes) < self.max_shapes:  # Максимальное количество фигур
+                    self.shapes.append(self.new_shape())
+        lap("update")
                     
-    def draw(self):
-        """Отрисовка всех элементов игры"""
-        # Заливка фона
-        self.screen.fill(BACKGROUND_COLOR)
-        
-        # Отрисовка сетки на фоне для декоративного эффекта
-        for x in range(0, SCREEN_WIDTH, 50):
-            pygame.draw.line(self.screen, (30, 35, 60), (x, 0), (x, SCREEN_HEIGHT), 1)
-        for y in range(0, SCREEN_HEIGHT, 50):
-            pygame.draw.line(self.screen, (30, 35, 60), (0, y), (SCREEN_WIDTH, y), 1)
+    def draw(self, alpha=1.0):
+        """Отрисовка всех элементов игры; alpha — доля шага после последнего update (для интерполяции)"""
+        if self.game_over:
+            # update больше не двигает объекты, и prev_* навсегда отстали на шаг: рисуем последние позиции
+            alpha = 1.0
+        # Фон с сеткой (целиком или только под прошлыми позициями объектов)
+        lap = self.profiler.lap
+        self.renderer.begin(self.screen)
+        dirty = self.renderer.add
+        lap("draw-background")
         
         # Отрисовка фигур
         for shape in self.shapes:
-            shape.draw(self.screen)
+            dirty(shape.draw(self.screen, alpha))
             
-        # Отрисовка лучей
-        for laser in self.lasers:
-            laser.draw(self.screen)
+        # Отрисовка лучей (одним пакетом из кэша спрайтов)
+        self.renderer.add_all(draw_lasers(self.screen, self.lasers, alpha))
             
         # Отрисовка игрока
-        self.player.draw(self.screen)
-        
-        # Отрисовка информации (счет, жизни, уровень)
-        score_text = self.font.render(f"Счет: {int(self.player.score)}", True, (255, 255, 255))
-        lives_text = self.font.render(f"Жизни: {self.player.lives}", True, (255, 255, 255))
-        level_text = self.font.render(f"Уровень: {self.level}", True, (255, 255, 255))
-        shapes_text = self.small_font.render(f"Фигур: {len(self.shapes)}", True, (200, 200, 200))
-        lasers_text = self.small_font.render(f"Лучей: {len(self.lasers)}", True, (200, 200, 200))
+        dirty(self.player.draw(self.screen, alpha))
+        lap("draw-entities")
         
-        self.screen.blit(score_text, (10, 10))
-        self.screen.blit(lives_text, (10, 50))
-        self.screen.blit(level_text, (10, 90))
-        self.screen.blit(shapes_text, (10, 130))
-        self.screen.blit(lasers_text, (10, 160))
+        self.draw_hud(dirty)
+            
+        # Таблица профилировщика (F3)
+        dirty(self.profiler.draw(self.screen))
+        lap("hud")
+            
+        # Обновление экрана
+        self.renderer.present()
+        lap("flip")
         
-        # Инструкции по управлению
-        controls_text = [
-            "Управление: стрелки для движения",
-            "Пробел или ЛКМ - выстрел лазером",
-            "Цель: избегайте фигур и стреляйте по ним",
-            "R - перезапуск игры, ESC - выход"
-        ]
+    def draw_hud(self, dirty):
+        """Счёт, подсказки и экран окончания игры; dirty получает нарисованные прямоугольники"""
+        # Отрисовка информации (счет, жизни, уровень)
+        hud = self.hud
+        dirty(hud["score"].draw(self.screen, int(self.player.score)))
+        dirty(hud["lives"].draw(self.screen, self.player.lives))
+        dirty(hud["level"].draw(self.screen, self.level))
+        dirty(hud["shapes"].draw(self.screen, len(self.shapes)))
+        dirty(hud["lasers"].draw(self.screen, len(self.lasers)))
         
-        for i, text in enumerate(controls_text):
-            control_text = self.small_font.render(text, True, (180, 180, 220))
-            self.screen.blit(control_text, (SCREEN_WIDTH - 350, 10 + i * 25))
+        # Инструкции по управлению (отрендерены при запуске)
+        for rect in self.screen.blits(self.controls):
+            dirty(rect)
         
         # Если игра окончена, показываем сообщение
         if self.game_over:
-            self.draw_game_over()
-            
-        # Обновление экрана
-        pygame.display.flip()
+            dirty(self.draw_game_over())
         
     def draw_game_over(self):
-        """Отрисовка экрана окончания игры"""
+        """Отрисовка экрана окончания игры: готовые поверхности одним вызовом blits"""
+        if self.game_over_screen is None:
+            self.game_over_screen = self.render_game_over()
+        self.screen.blits(self.game_over_screen, doreturn=False)
+        return self.screen.get_rect()  # Затемнение покрывает весь экран
+        
+    def render_game_over(self):
+        """Экран окончания игры — список (поверхность, позиция); пока игра окончена, счёт и уровень не меняются"""
         # Полупрозрачное наложение
         overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
-        
-        # Текст "Игра окончена"
-        game_over_font = pygame.font.SysFont(None, 72)
-        game_over_text = game_over_font.render("ИГРА ОКОНЧЕНА", True, (255, 50, 50))
-        self.screen.blit(game_over_text, (SCREEN_WIDTH//2 - game_over_text.get_width()//2, SCREEN_HEIGHT//2 - 100))
         
-        # Финальный счет
-        score_text = self.font.render(f"Финальный счет: {int(self.player.score)}", True, (255, 255, 255))
-        self.screen.blit(score_text, (SCREEN_WIDTH//2 - score_text.get_width()//2, SCREEN_HEIGHT//2 - 20))
-        
-        # Уровень
-        level_text = self.font.render(f"Достигнутый уровень: {self.level}", True, (255, 255, 255))
-        self.screen.blit(level_text, (SCREEN_WIDTH//2 - level_text.get_width()//2, SCREEN_HEIGHT//2 + 20))
-        
-        # Статистика по выстрелам
+        # Текст "Игра окончена", финальный счет, уровень
         lasers_fired = int(self.player.score / 100)  # Примерное количество выстрелов
-        lasers_text = self.font.render(f"Уничтожено фигур: {lasers_fired}", True, (255, 255, 255))
-        self.screen.blit(lasers_text, (SCREEN_WIDTH//2 - lasers_text.get_width()//2, SCREEN_HEIGHT//2 + 60))
-        
-        # Инструкция по перезапуску
-        restart_text = self.font.render("Нажмите R для перезапуска игры", True, (100, 255, 100))
-        self.screen.blit(restart_text, (SCREEN_WIDTH//2 - restart_text.get_width()//2, SCREEN_HEIGHT//2 + 120))
+        lines = [
+            (self.large_font, "ИГРА ОКОНЧЕНА", (255, 50, 50), -100),
+            (self.font, f"Финальный счет: {int(self.player.score)}", (255, 255, 255), -20),
+            (self.font, f"Достигнутый уровень: {self.level}", (255, 255, 255), 20),
+            # Статистика по выстрелам
+            (self.font, f"Уничтожено фигур: {lasers_fired}", (255, 255, 255), 60),
+            # Инструкция по перезапуску
+            (self.font, "Нажмите R для перезапуска игры", (100, 255, 100), 120),
+        ]
+        composite = [(overlay, (0, 0))]
+        for font, text, color, offset in lines:
+            surface = font.render(text, True, color)
+            composite.append((surface, (SCREEN_WIDTH//2 - surface.get_width()//2, SCREEN_HEIGHT//2 + offset)))
+        return composite
         
     def restart_game(self):
         """Перезапуск игры"""
         self.player = Player(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
-        self.shapes = []
-        self.lasers = []
+        # Прежние фигуры и лучи возвращаются в пулы
+        if self.shape_store is not None:
+            self.shape_store.clear()
+            for shape in self.shapes:
+                view_pool.release(shape)
+        else:
+            for shape in self.shapes:
+                shape_pool.release(shape)
+        for laser in self.lasers:
+            laser_pool.release(laser)
+        self.shapes = ActiveList()
+        self.lasers = ActiveList()
         self.game_over = False
+        self.game_over_screen = None
         self.level = 1
-        self.shape_count = 5
+        self.shape_count = START_SHAPES
         self.spawn_timer = 0
         
         # Создаем начальные фигуры
         for _ in range(self.shape_count):
-            self.shapes.append(GeometricShape())
+            self.shapes.append(self.new_shape())
             
-    def run(self):
-        """Основной игровой цикл"""
-        while True:
-            self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(FPS)
+    def state_signature(self):
+        """Состояние игры для контрольной суммы записи"""
+        return (self.level, self.player.score, self.player.lives, self.game_over,
+                self.player.x, self.player.y, self.player.laser_cooldown,
+                [(shape.x, shape.y, shape.size, shape.shape_type) for shape in self.shapes],
+                [(laser.x, laser.y) for laser in self.lasers])
+            
+    def quit(self):
+        """Выход из игры со статистикой вывода кадров и кэшей спрайтов"""
+        print(self.renderer.summary())
+        print(shape_sprites.summary("фигур"))
+        print(laser_sprites.summary("лучей"))
+        self.profiler.finish()
+        pygame.quit()
+        sys.exit()
+            
+    def run(self, recorder=None, loop=None):
+        """Основной игровой цикл; recorder записывает ввод для воспроизведения, loop задаёт темп шагов и кадров"""
+        profiler = self.profiler
+        loop = loop or FixedStepLoop(TICK_RATE, MAX_FPS)
+        # Всё, что создано при запуске (модули, шрифты, кэши), живёт до выхода:
+        # сборщик мусора больше не обходит эти объекты при полных сборках
+        gc.collect()
+        gc.freeze()
+        events = []
+        while self.running:
+            profiler.begin_frame()
+            # События копятся до ближайшего шага: запись и воспроизведение идут по шагам
+            events.extend(pygame.event.get())
+            profiler.lap("events")
+            for _ in range(loop.ticks()):
+                keys = pygame.key.get_pressed()
+                if recorder is not None:
+                    recorder.record(keys, events)
+                self.handle_events(events)
+                events = []
+                profiler.lap("events")
+                self.update(keys)
+            self.draw(loop.alpha)
+            profiler.end_frame()
+            loop.wait()
+        print(loop.summary())
+        if recorder is not None:
+            print(f"Сессия записана в {recorder.save(self)}")
+        self.quit()
+
+def make_env(count, **kwargs):
+    """Пакетная среда на count копий игры (gamekit/shooter_env.py) с балансом из констант этого файла"""
+    if ShooterEnv is None:
+        raise RuntimeError("Для пакетной среды нужен NumPy")
+    balance = dict(width=SCREEN_WIDTH, height=SCREEN_HEIGHT, start_shapes=START_SHAPES, spawn_delay=SPAWN_DELAY,
+                   max_shapes=MAX_SHAPES, cooldown=LASER_COOLDOWN, level_score=LEVEL_SCORE)
+    balance.update(kwargs)
+    return ShooterEnv(count, **balance)
+
+def main():
+    # С --record ФАЙЛ сессия записывается для tools/replay.py,
+    # с --profile [ФАЙЛ] включается профилировщик кадра, --max-fps N меняет предел кадров, 0 — без него
+    recorder = Recorder.from_argv("shooter", RECORDED_KEYS, fps=TICK_RATE)
+    game = Game(profiler=FrameProfiler.from_argv())
+    game.run(recorder, FixedStepLoop.from_argv(TICK_RATE, MAX_FPS))
 
-# Запуск игры
 if __name__ == "__main__":
-    game = Game()
-    game.run()
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""Общие помощники для бенчмарков: фиктивный видеодрайвер, загрузка игр, замер времени"""
+import os
+import sys
+import time
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Бенчмарки запускаются без окна: SDL рисует в память
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+if PYTHON_DIR not in sys.path:
+    sys.path.insert(0, PYTHON_DIR)
+
+from gamekit import games
+
+
+def load_game(relative_path, name=None):
+    """Импортирует файл игры по пути относительно папки Python (31_1.py нельзя импортировать по имени)"""
+    name = name or os.path.splitext(os.path.basename(relative_path))[0]
+    return games.load_path(relative_path, name)
+
+
+def time_frames(frame, frames):
+    """Вызывает frame(i) заданное число раз и возвращает среднее время кадра в мс"""
+    start = time.perf_counter()
+    for i in range(frames):
+        frame(i)
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def report(title, rows):
+    """Печатает таблицу результатов: rows — список кортежей (название, значение)"""
+    print(title)
+    width = max(len(str(name)) for name, _ in rows)
+    for name, value in rows:
+        print(f"  {str(name):<{width}}  {value}")
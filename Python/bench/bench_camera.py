@@ -0,0 +1,106 @@
+"""Камера и отсечение невидимого (gamekit/camera.py) в больших мирах.
+
+Платформер на длинном сгенерированном уровне (загружен целиком) и игра
+с сокровищами в мире в 25 раз больше окна с 500 сокровищами. Каждая игра
+проигрывается дважды с одним seed и одинаковым вводом: с отсечением через
+индексы и с камерой, которая отдаёт на отрисовку все объекты. Меряется
+только отрисовка; картинка в конце должна совпасть до пикселя.
+
+Запуск: python bench/bench_camera.py [кадров]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+import _common
+
+import pygame
+
+sys.path.insert(0, os.path.join(_common.PYTHON_DIR, "tools"))
+
+import make_level
+from gamekit.camera import Camera
+from gamekit.headless import KeyState
+from gamekit.levels import save_level
+
+platformer = _common.load_game("main.py", "platformer")
+treasure = _common.load_game(os.path.join("наборы", "1.py"), "treasure")
+
+RIGHT_DOWN = KeyState([pygame.K_RIGHT, pygame.K_DOWN])
+
+
+class SeeAllCamera(Camera):
+    """Камера без отсечения: «видит» весь мир и отдаёт на отрисовку все объекты индексов"""
+
+    @property
+    def rect(self):
+        return pygame.Rect(0, 0, self.world_width, self.world_height)
+
+    def nearby(self, index, margin=0):
+        return list(index)
+
+    def visible_platforms(self, index):
+        return list(index)
+
+
+def without_culling(camera):
+    camera.__class__ = SeeAllCamera
+
+
+def play(make_game, draw, screen, frames, cull, seed=3):
+    """Прогон с зажатыми «вправо» и «вниз»; возвращает мс на отрисовку кадра, игру и картинку"""
+    random.seed(seed)
+    game = make_game()
+    if not cull:
+        without_culling(game.camera)
+    draw_seconds = 0
+    for i in range(frames):
+        if i % 45 == 0 and hasattr(game.player, "jump"):
+            game.player.jump()
+        game.update(RIGHT_DOWN)
+        start = time.perf_counter()
+        draw(game)
+        draw_seconds += time.perf_counter() - start
+    return draw_seconds * 1000 / frames, game, pygame.image.tostring(screen, "RGB")
+
+
+def play_platformer(frames, cull):
+    return play(lambda: platformer.Platformer(3), platformer.Platformer.draw, platformer.create_window(), frames, cull)
+
+
+def play_treasure(frames, cull):
+    return play(treasure.TreasureGame, lambda game: game.draw(treasure.screen), treasure.create_window(), frames, cull)
+
+
+def compare(title, play_game, frames):
+    play_game(5, True)  # Прогрев: шрифты и кэши
+    culled_ms, game, culled_pixels = play_game(frames, True)
+    full_ms, _, full_pixels = play_game(frames, False)
+    _common.report(title, [
+        ("отрисовка без отсечения, мс/кадр", f"{full_ms:.3f}"),
+        ("отрисовка с отсечением, мс/кадр", f"{culled_ms:.3f} (x{full_ms / culled_ms:.1f})"),
+        ("нарисовано", game.camera.summary().split(": ", 1)[1]),
+        ("картинка совпадает", "да" if culled_pixels == full_pixels else "НЕТ"),
+    ])
+
+
+def run(frames):
+    platformer.LOG_PICKUPS = False
+    with tempfile.TemporaryDirectory() as folder:
+        level = make_level.generate(300000, 600, 5)
+        save_level(os.path.join(folder, "level3.gklv"), level, (300000, 600))
+        platformer.LEVEL_DIR = folder
+        platformer.STREAM_RADIUS = 10 ** 9  # Весь уровень в памяти: отсекает только камера
+        compare(f"Платформер: мир 300000x600, {len(level['platforms'])} платформ, "
+                f"{len(level['items'])} предметов, {frames} кадров", play_platformer, frames)
+
+    treasure.WORLD_WIDTH, treasure.WORLD_HEIGHT = treasure.WIDTH * 5, treasure.HEIGHT * 5
+    treasure.NUM_SQUARES = 500
+    compare(f"Сокровища: мир {treasure.WORLD_WIDTH}x{treasure.WORLD_HEIGHT}, "
+            f"{treasure.NUM_SQUARES} сокровищ, {frames} кадров", play_treasure, frames)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
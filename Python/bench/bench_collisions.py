@@ -0,0 +1,141 @@
+"""Лучи против фигур в 31_1.py: полный перебор против сетки при разном числе объектов.
+
+Сетка меряется в двух видах: каждый луч опрашивает соседние клетки сам
+(first_hit, так игра работает без NumPy и при малом числе пар) и все лучи
+проверяются против всех фигур одним расчётом (collide_circles). Все версии
+стартуют из одного и того же состояния (одинаковый seed), после прогона
+сравниваются счёт, жизни, игрок и координаты всех фигур и лучей; при
+расхождении скрипт падает.
+
+Запуск: python bench/bench_collisions.py [тиков]
+"""
+import math
+import random
+import sys
+import time
+
+import _common
+
+from gamekit.headless import NO_KEYS
+from gamekit.pool import ActiveList
+
+shooter = _common.load_game("31_1.py", "shooter")
+
+COUNTS = [15, 100, 500, 1000, 2000, 5000]
+# Много фигур и поток выстрелов: столько лучей в полёте держит быстрая стрельба
+STREAM = [(1000, 50), (2000, 50), (5000, 50), (2000, 500)]
+FRAME_MS = 1000 / 60
+
+
+def reference_hit(laser, shape):
+    # Старая проверка с корнем
+    if not laser.active:
+        return False
+    distance = math.sqrt((laser.x - shape.x)**2 + (laser.y - shape.y)**2)
+    if shape.shape_type == 'circle':
+        return distance < (laser.radius + shape.size)
+    return distance < (laser.radius + shape.size * 1.2)
+
+
+def reference_update(game):
+    """Game.update в нынешнем порядке, но каждый луч проверяется с каждой фигурой"""
+    game.player.move(NO_KEYS)
+    for shape in game.shapes:
+        shape.move()
+    # Игрок сталкивается с фигурами после движения всех фигур, в порядке списка
+    for shape in [s for s in game.shapes if game.player.check_collision(s)]:
+        game.player.lives -= 1
+        game.shapes.remove(shape)
+        game.shapes.append(shooter.GeometricShape())
+        if game.player.lives <= 0:
+            game.game_over = True
+    for laser in list(game.lasers):
+        laser.move()
+        for shape in list(game.shapes):
+            if reference_hit(laser, shape):
+                game.shapes.remove(shape)
+                game.player.score += 100
+                laser.active = False
+                game.shapes.append(shooter.GeometricShape())
+                break
+        if not laser.active:
+            game.lasers.remove(laser)
+    game.player.score += 0.1
+
+
+def random_laser():
+    angle = random.uniform(0, 2 * math.pi)
+    return shooter.Laser(random.uniform(0, shooter.SCREEN_WIDTH), random.uniform(0, shooter.SCREEN_HEIGHT),
+                         math.cos(angle), math.sin(angle))
+
+
+def simulate(game, shapes, lasers, ticks, update):
+    random.seed(shapes * 10007 + lasers)
+    game.restart_game()
+    game.player.lives = 10**9  # Игрок не должен умирать во время замера
+    game.max_shapes = shapes
+    game.shapes = ActiveList(shooter.GeometricShape() for _ in range(shapes))
+    game.lasers = ActiveList(random_laser() for _ in range(lasers))
+
+    elapsed = 0.0
+    for _ in range(ticks):
+        while len(game.lasers) < lasers:  # Держим постоянный поток выстрелов
+            game.lasers.append(random_laser())
+        start = time.perf_counter()
+        update(game)
+        elapsed += time.perf_counter() - start
+
+    state = (game.player.score, game.player.lives, game.game_over, game.player.x, game.player.y,
+             [(s.x, s.y, s.size) for s in game.shapes],
+             [(l.x, l.y) for l in game.lasers])
+    return elapsed * 1000 / ticks, state
+
+
+def compare(game, shapes, lasers, ticks):
+    """Время тика перебором, сеткой с запросом на луч и пакетом; совпадают ли итоги"""
+    batch_from = shooter.BATCH_COLLISION_PAIRS
+    old_ms, old_state = simulate(game, shapes, lasers, ticks, reference_update)
+    shooter.BATCH_COLLISION_PAIRS = 10**9
+    grid_ms, grid_state = simulate(game, shapes, lasers, ticks, _update_without_progression)
+    shooter.BATCH_COLLISION_PAIRS = 0
+    batch_ms, batch_state = simulate(game, shapes, lasers, ticks, _update_without_progression)
+    shooter.BATCH_COLLISION_PAIRS = batch_from
+    return old_ms, grid_ms, batch_ms, old_state == grid_state == batch_state
+
+
+def run(ticks):
+    game = shooter.Game()
+    mismatches = []
+    rows = []
+    for count in COUNTS:
+        old_ms, grid_ms, batch_ms, same = compare(game, count, count, ticks)
+        if not same:
+            mismatches.append((count, count))
+        rows.append((f"{count} фигур + {count} лучей",
+                     f"перебор {old_ms:8.2f} мс/тик   сетка {grid_ms:7.2f} мс/тик   пакетом {batch_ms:6.2f} мс/тик   "
+                     f"x{old_ms / batch_ms:5.1f}   совпадает: {'да' if same else 'НЕТ'}"))
+    _common.report(f"Столкновения лучей, {ticks} тиков на размер, клетка {game.shape_grid.cell_size} пикс.", rows)
+
+    # Почти каждый луч попадает, поэтому за тик появляется столько же новых фигур, сколько лучей
+    rows = []
+    for shapes, lasers in STREAM:
+        old_ms, grid_ms, batch_ms, same = compare(game, shapes, lasers, ticks)
+        if not same:
+            mismatches.append((shapes, lasers))
+        rows.append((f"{shapes} фигур, {lasers} лучей",
+                     f"перебор {old_ms:8.2f} мс/тик   сетка {grid_ms:7.2f} мс/тик   пакетом {batch_ms:6.2f} мс/тик   "
+                     f"{'укладывается' if batch_ms < FRAME_MS else 'не укладывается'} в кадр {FRAME_MS:.1f} мс   "
+                     f"совпадает: {'да' if same else 'НЕТ'}"))
+    _common.report("Поток выстрелов по множеству фигур", rows)
+    assert not mismatches, f"сетка разошлась с перебором при (фигур, лучей) = {mismatches}"
+
+
+def _update_without_progression(game):
+    # Уровни и спавн по таймеру не относятся к столкновениям, поэтому не даём им сработать
+    game.level = 10**9
+    game.spawn_timer = -10**9
+    shooter.Game.update(game, NO_KEYS)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
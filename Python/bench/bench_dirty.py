@@ -0,0 +1,50 @@
+"""Вывод кадра в 31_1.py: полный flip против грязных прямоугольников.
+
+Обе версии проигрывают одинаковую игру (один seed, стрельба по кругу);
+в конце сравнивается содержимое экрана — оно должно совпасть до пикселя.
+
+Запуск: python bench/bench_dirty.py [кадров]
+"""
+import random
+import sys
+
+import _common
+
+import pygame
+
+shooter = _common.load_game("31_1.py", "shooter")
+
+
+def play(frames, dirty_rects, seed=6):
+    random.seed(seed)
+    game = shooter.Game()
+    game.renderer.enabled = dirty_rects
+
+    def frame(i):
+        if i % 15 == 0:
+            target = (i * 37 % shooter.SCREEN_WIDTH, i * 53 % shooter.SCREEN_HEIGHT)
+            game.player.shoot(game.lasers, target)
+        game.update()
+        game.draw()
+
+    ms = _common.time_frames(frame, frames)
+    pixels = pygame.image.tostring(game.screen, "RGB")
+    return ms, game.renderer, pixels
+
+
+def run(frames):
+    full_ms, full, full_pixels = play(frames, False)
+    dirty_ms, dirty, dirty_pixels = play(frames, True)
+    screen_pixels = shooter.SCREEN_WIDTH * shooter.SCREEN_HEIGHT
+    _common.report(f"31_1.py, {frames} кадров", [
+        ("полный flip, мс/кадр", f"{full_ms:.3f}"),
+        ("грязные прямоугольники, мс/кадр", f"{dirty_ms:.3f}"),
+        ("пикселей на кадр", f"{full.average_pixels():.0f} -> {dirty.average_pixels():.0f} "
+                             f"({dirty.average_pixels() / screen_pixels:.1%} экрана)"),
+        ("кадров выведено целиком", f"{dirty.full_frames} из {dirty.frames}"),
+        ("картинка совпадает", "да" if full_pixels == dirty_pixels else "НЕТ"),
+    ])
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 600)
@@ -0,0 +1,149 @@
+"""Пакетная среда gamekit/shooter_env.py против настоящих Game из 31_1.py.
+
+Сначала проверка совпадения: N копий среды и N объектов Game получают
+одни и те же случайные действия (ход, выстрел, прицел в целых координатах,
+как у мыши), а новые фигуры эталонной игры берутся из того же счётчика,
+что и в среде (spawn_values), а не из random. После каждого кадра
+состояние каждой копии сравнивается с Game.state_signature, а награда —
+с приростом счёта; при любом расхождении скрипт падает. Потом
+меряется, сколько шагов копий в секунду даёт цикл по объектам Game и
+пакетный step.
+
+Запуск: python bench/bench_env.py [кадров проверки] [копий проверки]
+"""
+import sys
+import time
+
+import _common
+
+import numpy as np
+import pygame
+
+from gamekit.headless import KeyState
+from gamekit.shooter_env import SHAPE_TYPES, spawn_values
+
+shooter = _common.load_game("31_1.py", "shooter")
+
+COUNTS = [10, 1000, 10000]
+KEYS = {(-1, 0): pygame.K_LEFT, (1, 0): pygame.K_RIGHT, (0, -1): pygame.K_UP, (0, 1): pygame.K_DOWN}
+
+
+class ReferenceGame(shooter.Game):
+    """Обычная игра, но параметры новых фигур — из счётчика среды"""
+
+    def __init__(self, seed, **kwargs):
+        self.seed = seed
+        self.spawned = 0
+        super().__init__(headless=True, **kwargs)
+
+    def new_shape(self):
+        values = {name: float(value[0]) for name, value in
+                  spawn_values([self.seed], [self.spawned], shooter.SCREEN_WIDTH, shooter.SCREEN_HEIGHT).items()}
+        self.spawned += 1
+        shape = shooter.GeometricShape.__new__(shooter.GeometricShape)
+        shape.size = int(values["size"])
+        shape.x, shape.y = int(values["x"]), int(values["y"])
+        shape.prev_x, shape.prev_y = shape.x, shape.y
+        shape.color = shooter.ENEMY_COLORS[int(values["color"])]
+        shape.speed_x, shape.speed_y = values["speed_x"], values["speed_y"]
+        shape.shape_type = SHAPE_TYPES[int(values["kind"])]
+        shape.rotation = shape.rotation_speed = 0
+        shape.health = 1
+        return shape
+
+
+def random_actions(rng, count):
+    """Ход, выстрел и прицел; прицела нет у четверти выстрелов (выстрел вверх, как пробелом)"""
+    actions = np.zeros((count, 5))
+    actions[:, 0] = rng.integers(-1, 2, count)
+    actions[:, 1] = rng.integers(-1, 2, count)
+    actions[:, 2] = rng.random(count) < 0.5
+    actions[:, 3] = rng.integers(0, shooter.SCREEN_WIDTH, count)
+    actions[:, 4] = rng.integers(0, shooter.SCREEN_HEIGHT, count)
+    actions[rng.random(count) < 0.25, 3:] = np.nan
+    return actions
+
+
+def play_reference(game, action):
+    """Действие среды как ввод игрока: событие выстрела, потом update с зажатыми клавишами"""
+    move_x, move_y, fire, target_x, target_y = action
+    if fire and not game.game_over:
+        target = None if np.isnan(target_x) else (int(target_x), int(target_y))
+        game.player.shoot(game.lasers, target)
+    keys = [KEYS[(int(move_x), 0)]] if move_x else []
+    if move_y:
+        keys.append(KEYS[(0, int(move_y))])
+    game.update(KeyState(keys))
+
+
+def check_parity(frames, count, **balance):
+    rng = np.random.default_rng(22)
+    seeds = np.arange(count) * 7 + 1
+    env = shooter.make_env(count, **balance)
+    env.reset(seeds)
+    games = [ReferenceGame(int(seed)) for seed in seeds]
+    for game in games:
+        game.max_shapes = env.max_shapes
+        game.spawn_delay = env.spawn_delay
+        game.player.max_cooldown = env.max_cooldown
+    mismatches = 0
+    for frame in range(frames):
+        actions = random_actions(rng, count)
+        _, rewards, _ = env.step(actions)
+        for i, game in enumerate(games):
+            score = game.player.score
+            play_reference(game, actions[i])
+            if env.signature(i) != game.state_signature() or rewards[i] != game.player.score - score:
+                mismatches += 1
+                if mismatches == 1:
+                    print(f"расхождение: кадр {frame}, копия {i}\n  среда {env.signature(i)}\n  игра  {game.state_signature()}")
+    over = sum(game.game_over for game in games)
+    levels = max(game.level for game in games)
+    return mismatches, over, levels
+
+
+def throughput(count, frames):
+    """Шагов копий в секунду: цикл по Game и пакетный step"""
+    rng = np.random.default_rng(count)
+    actions = [random_actions(rng, count) for _ in range(frames)]
+    rows = []
+    if count <= 1000:
+        games = [ReferenceGame(seed) for seed in range(count)]
+        start = time.perf_counter()
+        for frame_actions in actions:
+            for game, action in zip(games, frame_actions):
+                play_reference(game, action)
+        rows.append(count * frames / (time.perf_counter() - start))
+    else:
+        rows.append(None)
+    env = shooter.make_env(count)
+    env.reset(np.arange(count))
+    start = time.perf_counter()
+    for frame_actions in actions:
+        _, _, done = env.step(frame_actions)
+        if done.any():
+            env.reset(np.flatnonzero(done) + count * 1000, done)
+    rows.append(count * frames / (time.perf_counter() - start))
+    return rows
+
+
+def run(frames, count):
+    mismatches, over, levels = check_parity(frames, count)
+    fast_mismatches, _, fast_levels = check_parity(frames, count, cooldown=1)
+    rows = [
+        ("совпадение с Game", f"{'да' if not mismatches else f'НЕТ ({mismatches})'}: {count} копий x {frames} кадров, "
+                              f"закончилось игр {over}, наибольший уровень {levels}"),
+        ("то же с перезарядкой 1 кадр", f"{'да' if not fast_mismatches else f'НЕТ ({fast_mismatches})'}, "
+                                        f"наибольший уровень {fast_levels}"),
+    ]
+    for size in COUNTS:
+        reference, batched = throughput(size, 200)
+        reference = f"{reference:,.0f}" if reference else "—"
+        rows.append((f"{size} копий, шагов копий/с", f"Game {reference}   пакетно {batched:,.0f}"))
+    _common.report("Пакетная среда 31_1.py", rows)
+    assert not mismatches and not fast_mismatches, \
+        f"среда разошлась с Game: {mismatches} расхождений, с перезарядкой 1 кадр {fast_mismatches}"
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 600, int(sys.argv[2]) if len(sys.argv) > 2 else 50)
@@ -0,0 +1,109 @@
+"""Интерфейс 31_1.py и экран окончания игры: рендер каждый кадр против готовых поверхностей.
+
+Раньше Game.draw на каждом кадре рендерил пять строк счёта и четыре строки
+подсказок, а draw_game_over ещё и создавал SysFont(None, 72), полноэкранную
+поверхность SRCALPHA и пять надписей. Теперь строки счёта рендерятся при
+смене значений, подсказки — при запуске, а экран окончания собирается
+один раз и держится до перезапуска.
+
+Игра идёт с одним seed: первая половина кадров — обычная игра, во второй
+игра окончена. На каждом кадре интерфейс рисуется обоими способами поверх
+одинакового фона (последнего кадра сцены), меряется только интерфейс,
+картинки сверяются по пикселям.
+
+Запуск: python bench/bench_game_over.py [кадров]
+"""
+import random
+import sys
+import time
+
+import _common
+
+import pygame
+
+from gamekit.headless import RandomInput
+
+shooter = _common.load_game("31_1.py", "shooter")
+
+KEYS = [pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN]
+
+
+def reference_hud(game, screen):
+    """Прежний интерфейс из Game.draw и Game.draw_game_over"""
+    screen.blit(game.font.render(f"Счет: {int(game.player.score)}", True, (255, 255, 255)), (10, 10))
+    screen.blit(game.font.render(f"Жизни: {game.player.lives}", True, (255, 255, 255)), (10, 50))
+    screen.blit(game.font.render(f"Уровень: {game.level}", True, (255, 255, 255)), (10, 90))
+    screen.blit(game.small_font.render(f"Фигур: {len(game.shapes)}", True, (200, 200, 200)), (10, 130))
+    screen.blit(game.small_font.render(f"Лучей: {len(game.lasers)}", True, (200, 200, 200)), (10, 160))
+    for i, text in enumerate(shooter.CONTROLS_TEXT):
+        screen.blit(game.small_font.render(text, True, (180, 180, 220)), (shooter.SCREEN_WIDTH - 350, 10 + i * 25))
+    if not game.game_over:
+        return
+    overlay = pygame.Surface((shooter.SCREEN_WIDTH, shooter.SCREEN_HEIGHT), pygame.SRCALPHA)
+    overlay.fill((0, 0, 0, 180))
+    screen.blit(overlay, (0, 0))
+    center_x, center_y = shooter.SCREEN_WIDTH // 2, shooter.SCREEN_HEIGHT // 2
+    lines = [
+        (pygame.font.SysFont(None, 72), "ИГРА ОКОНЧЕНА", (255, 50, 50), -100),
+        (game.font, f"Финальный счет: {int(game.player.score)}", (255, 255, 255), -20),
+        (game.font, f"Достигнутый уровень: {game.level}", (255, 255, 255), 20),
+        (game.font, f"Уничтожено фигур: {int(game.player.score / 100)}", (255, 255, 255), 60),
+        (game.font, "Нажмите R для перезапуска игры", (100, 255, 100), 120),
+    ]
+    for font, text, color, offset in lines:
+        surface = font.render(text, True, color)
+        screen.blit(surface, (center_x - surface.get_width() // 2, center_y + offset))
+
+
+def cached_hud(game, screen):
+    """Нынешний Game.draw_hud, нарисованный на screen"""
+    game.screen = screen
+    game.draw_hud(lambda rect: None)
+
+
+def run(frames):
+    random.seed(5)
+    game = shooter.Game()
+    window = game.screen
+    script = RandomInput(5, KEYS, [pygame.K_SPACE])
+    old = pygame.Surface(window.get_size())
+    new = pygame.Surface(window.get_size())
+    seconds = {False: [0, 0, 0], True: [0, 0, 0]}  # Игра окончена -> [старый, новый, кадров]
+    same = 0
+    for frame in range(frames):
+        if frame == frames // 2:
+            game.game_over = True
+        for event in script.events(frame):
+            game.handle_event(event)
+        game.update(script.keys(frame))
+        game.screen = window
+        game.draw()
+        backdrop = window.copy()
+        timing = seconds[game.game_over]
+
+        old.blit(backdrop, (0, 0))
+        start = time.perf_counter()
+        reference_hud(game, old)
+        timing[0] += time.perf_counter() - start
+
+        new.blit(backdrop, (0, 0))
+        start = time.perf_counter()
+        cached_hud(game, new)
+        timing[1] += time.perf_counter() - start
+        timing[2] += 1
+        same += pygame.image.tostring(old, "RGB") == pygame.image.tostring(new, "RGB")
+    game.screen = window
+
+    rows = []
+    for over, title in ((False, "игра идёт"), (True, "игра окончена")):
+        old_s, new_s, count = seconds[over]
+        rows.append((f"{title}, мс/кадр", f"{old_s * 1000 / count:.3f} -> {new_s * 1000 / count:.3f} "
+                                         f"(x{old_s / new_s:.1f})"))
+    renders = sum(label.renders for label in game.hud.values())
+    rows.append(("рендеров строк счёта", f"{renders} (раньше {frames * 5})"))
+    rows.append(("кадров совпало по пикселям", f"{same} из {frames}"))
+    _common.report(f"Интерфейс 31_1.py, {frames} кадров", rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 600)
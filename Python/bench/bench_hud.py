@@ -0,0 +1,136 @@
+"""Интерфейс наборы/1.py: рисование каждый кадр против виджетов gamekit/hud.py.
+
+Раньше на каждом кадре заново создавались подложки панелей, рендерились все
+надписи и градиент прогресс-бара рисовался отрезком на каждый столбец (до 400
+вызовов pygame.draw.line). Игра проигрывается с одним seed и зажатыми
+клавишами; на каждом кадре интерфейс рисуется обоими способами поверх
+одинакового фона, меряется только интерфейс, картинки сверяются по пикселям.
+Ещё проверяется, что прямоугольники, которые вернули виджеты, накрывают всё
+нарисованное: иначе в режиме грязных прямоугольников часть картинки не
+попала бы на экран. При любом расхождении скрипт падает.
+
+Запуск: python bench/bench_hud.py [кадров]
+"""
+import random
+import sys
+import time
+
+import _common
+
+import pygame
+
+from gamekit.headless import KeyState
+
+treasure = _common.load_game("наборы/1.py", "treasure")
+
+KEYS = KeyState([pygame.K_RIGHT, pygame.K_DOWN])
+
+
+def reference_hud(game, screen):
+    """Прежний интерфейс из TreasureGame.draw"""
+    t = treasure
+    game_time = game.game_time
+    panel_rect = pygame.Rect(20, 20, 300, 160)
+    panel_surf = pygame.Surface((panel_rect.width, panel_rect.height), pygame.SRCALPHA)
+    pygame.draw.rect(panel_surf, (30, 35, 60, 200), panel_surf.get_rect(), border_radius=15)
+    pygame.draw.rect(panel_surf, (100, 110, 170, 100), panel_surf.get_rect(), width=2, border_radius=15)
+    screen.blit(panel_surf, panel_rect)
+
+    screen.blit(t.font_medium.render(f"💰 {game.score}", True, t.SCORE_COLOR), (40, 40))
+    screen.blit(t.font_small.render(f"Собрано: {game.collected_count}/{t.NUM_SQUARES}", True, t.TEXT_COLOR), (40, 85))
+    if game.combo > 1:
+        combo_color = (255, 255, 100) if game.combo_timer > 30 else (255, 200, 100)
+        screen.blit(t.font_small.render(f"Комбо: x{game.combo}", True, combo_color), (40, 120))
+    minutes = game_time // 3600
+    seconds = (game_time // 60) % 60
+    screen.blit(t.font_tiny.render(f"Время: {minutes:02d}:{seconds:02d}", True, (200, 200, 220)), (40, 155))
+
+    if game.current_message:
+        message_alpha = min(255, game.message_timer * 4)
+        message_surface = t.font_small.render(game.current_message, True, t.HIGHLIGHT_COLOR)
+        message_rect = message_surface.get_rect(center=(t.WIDTH // 2, 50))
+        bg_rect = message_rect.inflate(40, 20)
+        bg_surf = pygame.Surface((bg_rect.width, bg_rect.height), pygame.SRCALPHA)
+        pygame.draw.rect(bg_surf, (0, 0, 0, message_alpha // 2), bg_surf.get_rect(), border_radius=10)
+        pygame.draw.rect(bg_surf, (255, 255, 100, message_alpha // 3), bg_surf.get_rect(), width=2, border_radius=10)
+        screen.blit(bg_surf, bg_rect)
+        screen.blit(message_surface, message_rect)
+
+    controls = ["Управление: WASD или Стрелки", "Перезапуск: R", "Выход: ESC", "Цель: Собрать все сокровища!"]
+    control_panel = pygame.Rect(t.WIDTH - 320, 20, 300, 120)
+    control_surf = pygame.Surface((control_panel.width, control_panel.height), pygame.SRCALPHA)
+    pygame.draw.rect(control_surf, (30, 35, 60, 200), control_surf.get_rect(), border_radius=15)
+    screen.blit(control_surf, control_panel)
+    for i, text in enumerate(controls):
+        screen.blit(t.font_tiny.render(text, True, (200, 200, 220)), (t.WIDTH - 300, 40 + i * 25))
+
+    progress = game.collected_count / t.NUM_SQUARES
+    bar_width = 400
+    bar_rect = pygame.Rect(t.WIDTH // 2 - bar_width // 2, t.HEIGHT - 40, bar_width, 20)
+    pygame.draw.rect(screen, (50, 55, 80), bar_rect, border_radius=10)
+    fill_width = max(10, int(bar_width * progress))
+    for i in range(fill_width):
+        color_ratio = i / bar_width
+        color = (int(50 + color_ratio * 200), int(150 + color_ratio * 100), 255)
+        pygame.draw.line(screen, color, (bar_rect.x + i, bar_rect.y), (bar_rect.x + i, bar_rect.y + bar_rect.height))
+    pygame.draw.rect(screen, (200, 220, 255), bar_rect, width=2, border_radius=10)
+    progress_text = t.font_tiny.render(f"{game.collected_count}/{t.NUM_SQUARES}", True, t.TEXT_COLOR)
+    screen.blit(progress_text, (bar_rect.centerx - 20, bar_rect.y - 25))
+
+    if game_time % 120 < 60:
+        title_color = (255, 255, 200) if game_time % 60 < 30 else (200, 230, 255)
+        title = t.font_large.render("СОКРОВИЩА", True, title_color)
+        title_shadow = t.font_large.render("СОКРОВИЩА", True, (0, 0, 0, 100))
+        screen.blit(title_shadow, (t.WIDTH // 2 - title.get_width() // 2 + 3, 103))
+        screen.blit(title, (t.WIDTH // 2 - title.get_width() // 2, 100))
+
+
+def run(frames):
+    random.seed(11)
+    game = treasure.TreasureGame()
+    backdrop = pygame.Surface((treasure.WIDTH, treasure.HEIGHT))
+    backdrop.fill(treasure.BG_COLOR)
+    old = pygame.Surface((treasure.WIDTH, treasure.HEIGHT))
+    new = pygame.Surface((treasure.WIDTH, treasure.HEIGHT))
+    backdrop_pixels = pygame.image.tostring(backdrop, "RGB")
+    old_seconds = new_seconds = 0
+    same = covered = 0
+    for frame in range(frames):
+        if frame % 200 == 100:
+            # Игрок телепортируется к сокровищу, чтобы появились сообщения, комбо и прогресс
+            target = next((item for item in game.treasures if not item.collected), None)
+            if target is not None:
+                game.player.rect.center = target.rect.center
+        game.update(KEYS)
+        old.blit(backdrop, (0, 0))
+        new.blit(backdrop, (0, 0))
+        start = time.perf_counter()
+        reference_hud(game, old)
+        middle = time.perf_counter()
+        rects = []
+        game.draw_hud(new, rects.append)
+        new_seconds += time.perf_counter() - middle
+        old_seconds += middle - start
+        same += pygame.image.tostring(old, "RGB") == pygame.image.tostring(new, "RGB")
+        # Вне возвращённых прямоугольников должен остаться нетронутый фон
+        outside = new.copy()
+        for rect in filter(None, rects):
+            outside.blit(backdrop, rect, rect)
+        covered += pygame.image.tostring(outside, "RGB") == backdrop_pixels
+
+    old_ms = old_seconds * 1000 / frames
+    new_ms = new_seconds * 1000 / frames
+    renders = sum(widget.renders for widget in game.hud.values() if hasattr(widget, "renders"))
+    _common.report(f"Интерфейс наборы/1.py, {frames} кадров", [
+        ("интерфейс, мс/кадр", f"{old_ms:.3f} -> {new_ms:.3f} (x{old_ms / new_ms:.1f})"),
+        ("рендеров надписей", f"{renders} (раньше {frames * 7}+ за прогон)"),
+        ("собрано сокровищ", game.collected_count),
+        ("кадров совпало по пикселям", f"{same} из {frames}"),
+        ("прямоугольники накрыли всё нарисованное", f"{covered} из {frames} кадров"),
+    ])
+    assert same == frames, "интерфейс разошёлся с прежним по пикселям"
+    assert covered == frames, "виджет нарисовал пиксели вне прямоугольника, который вернул"
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 600)
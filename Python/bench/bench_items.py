@@ -0,0 +1,121 @@
+"""Сбор предметов в main.py: перебор списка против ItemStore (gamekit/items.py).
+
+Уровень, плотно засыпанный монетами, загружен целиком. Игрок прыгает по
+случайным точкам уровня, и на каждом кадре проверяется, какие предметы он
+задел: старым способом (два Rect на каждый предмет, копия списка и
+list.remove) и через сетку ItemStore. Порядок собранных предметов и счёт
+должны совпасть. Отдельно меряется рестарт уровня (клавиша R): раньше куски
+перечитывались и все Item создавались заново, теперь раскладка берётся из шаблона.
+
+Запуск: python bench/bench_items.py [кадров]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+import _common
+
+import pygame
+
+from gamekit.levels import save_level
+from gamekit.spatial import SpatialHash
+
+platformer = _common.load_game("main.py", "platformer")
+
+COUNTS = [100, 1000, 5000]
+WORLD = (8000, 600)
+
+
+def make_level(count, seed=6):
+    rng = random.Random(seed)
+    items = [{"type": rng.choice(["coin", "coin", "gem", "bonus", "key"]),
+              "x": rng.randrange(0, WORLD[0] - 30), "y": rng.randrange(0, WORLD[1] - 30)}
+             for _ in range(count)]
+    return {"platforms": [(0, WORLD[1] - 20, WORLD[0], 20)], "items": items, "start_pos": (0, 0)}
+
+
+def reference_pickup(player, items):
+    """Старая проверка из Platformer.update; items — список Item в порядке номеров"""
+    picked = []
+    for item in items[:]:
+        if player.get_rect().colliderect(pygame.Rect(item.x, item.y, item.width, item.height)):
+            platformer.handle_item_collection(item.type, player)
+            items.remove(item)
+            picked.append(item.number)
+    return picked
+
+
+def store_pickup(game):
+    picked = []
+    for item in game.items.colliding(game.player.get_rect()):
+        platformer.handle_item_collection(item.type, game.player)
+        game.items.remove(item)
+        picked.append(item.number)
+    return picked
+
+
+def reference_restart(game):
+    """Старый рестарт: куски перечитываются, Item и сетка создаются заново"""
+    game.streamer.reset()
+    game.streamer.update(*game.level.start_pos)
+    items = [platformer.Item(x, y, item_type, number) for number, x, y, item_type in game.streamer.items()]
+    grid = SpatialHash(platformer.ITEM_CELL)
+    for item in items:
+        grid.insert(item, item.x + item.width / 2, item.y + item.height / 2, item.width)
+    return items
+
+
+def timed(action):
+    start = time.perf_counter()
+    result = action()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def walk(player, pickup, frames, seed=2):
+    """Игрок на случайных точках уровня; возвращает мс на проверку сбора и номера собранных"""
+    rng = random.Random(seed)
+    picked = []
+    seconds = 0
+    for _ in range(frames):
+        player.x = rng.randrange(0, WORLD[0] - player.width)
+        player.y = rng.randrange(0, WORLD[1] - player.height)
+        start = time.perf_counter()
+        picked += pickup()
+        seconds += time.perf_counter() - start
+    return seconds * 1000 / frames, picked
+
+
+def run(frames):
+    platformer.LOG_PICKUPS = False
+    platformer.STREAM_RADIUS = 10 ** 9  # Весь уровень в памяти
+    rows = []
+    with tempfile.TemporaryDirectory() as folder:
+        platformer.LEVEL_DIR = folder
+        for count in COUNTS:
+            save_level(os.path.join(folder, "level3.gklv"), make_level(count), WORLD)
+            game = platformer.Platformer(3, headless=True)
+            items = [platformer.Item(x, y, item_type, number)
+                     for number, x, y, item_type in game.streamer.items()]
+            old_player = platformer.Player(0, 0)
+            old_ms, old_picked = walk(old_player, lambda: reference_pickup(old_player, items), frames)
+            new_ms, new_picked = walk(game.player, lambda: store_pickup(game), frames)
+            same = old_picked == new_picked and old_player.score == game.player.score
+
+            new_restart_ms, _ = timed(game.restart)
+            restored = [item.number for item in sorted(game.items, key=lambda item: item.number)]
+            old_restart_ms, items = timed(lambda: reference_restart(game))
+            same_restart = restored == [item.number for item in items]
+
+            rows.append((f"{count} предметов, мс/кадр",
+                         f"{old_ms:.4f} -> {new_ms:.4f} (x{old_ms / new_ms:.0f}), "
+                         f"собрано {len(new_picked)}, совпадает: {'да' if same else 'НЕТ'}"))
+            rows.append((f"{count} предметов, рестарт (R), мс",
+                         f"{old_restart_ms:.2f} -> {new_restart_ms:.2f} (x{old_restart_ms / new_restart_ms:.1f}), "
+                         f"все предметы на месте: {'да' if same_restart else 'НЕТ'}"))
+    _common.report(f"Проверка сбора предметов, мир {WORLD[0]}x{WORLD[1]}, {frames} кадров", rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,75 @@
+"""Лучи 31_1.py: семь вызовов pygame.draw.circle на луч против пакета спрайтов draw_lasers.
+
+Старый Laser.draw рисовал голову, свечение и пять кругов хвоста; теперь луч —
+один готовый кадр из кэша по направлению (LASER_DIRECTIONS штук), а все лучи
+выводятся одним Surface.blits. Лучи летят из случайных точек в случайные
+стороны, погасшие сразу заменяются новыми, так что на экране всегда N лучей
+(как при бонусе с уменьшенным max_cooldown). Хвост в кадре смещён на целые
+пиксели, а направление округлено до шага кэша, поэтому картинка совпадает
+не полностью: печатается доля отличающихся пикселей.
+
+Запуск: python bench/bench_lasers.py [кадров]
+"""
+import math
+import random
+import sys
+import time
+
+import _common
+
+import numpy as np
+import pygame
+
+shooter = _common.load_game("31_1.py", "shooter")
+
+COUNTS = [50, 300, 2000]
+
+
+def random_laser():
+    angle = random.uniform(0, 2 * math.pi)
+    return shooter.Laser(random.uniform(0, shooter.SCREEN_WIDTH), random.uniform(0, shooter.SCREEN_HEIGHT),
+                         math.cos(angle), math.sin(angle))
+
+
+def reference_draw(screen, lasers):
+    return [laser.draw(screen) for laser in lasers]
+
+
+def play(count, frames, draw, screen):
+    """Время отрисовки N лучей (мс/кадр); screen после прогона содержит последний кадр"""
+    random.seed(count)
+    lasers = [random_laser() for _ in range(count)]
+    elapsed = 0
+    for _ in range(frames):
+        for index, laser in enumerate(lasers):
+            laser.move()
+            if not laser.active:
+                lasers[index] = random_laser()
+        screen.fill((0, 0, 0))
+        start = time.perf_counter()
+        draw(screen, lasers)
+        elapsed += time.perf_counter() - start
+    return elapsed * 1000 / frames
+
+
+def run(frames):
+    screen = pygame.display.set_mode((shooter.SCREEN_WIDTH, shooter.SCREEN_HEIGHT))
+    new_screen = screen.copy()
+    shooter.laser_sprites.clear()
+    rows = []
+    for count in COUNTS:
+        old_ms = play(count, frames, reference_draw, screen)
+        new_ms = play(count, frames, shooter.draw_lasers, new_screen)
+        old = pygame.surfarray.array3d(screen)
+        new = pygame.surfarray.array3d(new_screen)
+        lit = np.any(old != 0, axis=2) | np.any(new != 0, axis=2)
+        differ = np.any(old != new, axis=2)
+        rows.append((f"{count} лучей, мс/кадр", f"{old_ms:.3f} -> {new_ms:.3f} (x{old_ms / new_ms:.1f}), "
+                                              f"отличаются {differ.sum() / max(1, lit.sum()):.1%} закрашенных пикселей"))
+    stats = shooter.laser_sprites.stats()
+    rows.append(("кэш спрайтов", f"{stats['frames']} кадров, {stats['memory_kb']} КБ"))
+    _common.report(f"Отрисовка лучей, {frames} кадров, {shooter.LASER_DIRECTIONS} направлений", rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
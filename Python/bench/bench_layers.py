@@ -0,0 +1,50 @@
+"""Статичный фон: перерисовка каждый кадр против запечённого слоя (LayeredRenderer).
+
+Запуск: python bench/bench_layers.py [кадров]
+"""
+import sys
+
+import _common
+
+import pygame
+
+from gamekit.layers import LayeredRenderer
+
+shooter = _common.load_game("31_1.py", "shooter")
+
+
+def paint_gradient(surface):
+    # Градиент из наборы/1.py: по одной линии на строку экрана
+    width, height = surface.get_size()
+    for y in range(height):
+        r = int(20 + (y / height) * 10)
+        g = int(25 + (y / height) * 5)
+        b = int(45 + (y / height) * 20)
+        pygame.draw.line(surface, (r, g, b), (0, y), (width, y))
+
+
+def compare(name, screen, paint, frames):
+    layers = LayeredRenderer([paint])
+    direct_ms = _common.time_frames(lambda i: paint(screen), frames)
+    cached_ms = _common.time_frames(lambda i: layers.draw(screen), frames)
+    return (name, f"каждый кадр {direct_ms:6.3f} мс   слой {cached_ms:6.3f} мс   "
+                  f"x{direct_ms / cached_ms:5.1f}   пересборок {layers.rebuilds}")
+
+
+def run(frames):
+    game = shooter.Game()
+    rows = [compare("сетка 31_1.py (800x600)", game.screen, shooter.paint_background, frames)]
+    treasure_screen = pygame.display.set_mode((1000, 700))
+    rows.append(compare("градиент наборы/1.py (1000x700)", treasure_screen, paint_gradient, frames))
+
+    # Смена размера окна пересобирает слой один раз
+    layers = LayeredRenderer([paint_gradient])
+    layers.draw(treasure_screen)
+    layers.draw(pygame.display.set_mode((1280, 720)))
+    layers.draw(pygame.display.get_surface())
+    rows.append(("пересборок после смены размера окна", layers.rebuilds))
+    _common.report(f"Статичные слои фона, {frames} кадров", rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
@@ -0,0 +1,98 @@
+"""Уровни из файлов с кусками (gamekit/levels.py) для main.py.
+
+1. Уровни 1 и 2 после упаковки в файл и чтения всех кусков совпадают со словарём LEVELS.
+2. Большой мир (tools/make_level.py --generate): время открытия файла и
+   первой подгрузки против чтения всех кусков сразу, затем проход по
+   всему миру — сколько кусков в памяти и сколько стоит подгрузка на кадр.
+3. Платформер на большом уровне без окна с зажатой клавишей «вправо».
+
+Запуск: python bench/bench_levels.py [ширина мира]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import _common
+
+import pygame
+
+sys.path.insert(0, os.path.join(_common.PYTHON_DIR, "tools"))
+
+import make_level
+from gamekit.headless import InputScript, run_headless
+from gamekit.levels import ChunkStreamer, LevelFile, pack_level, save_level
+
+platformer = _common.load_game("main.py", "platformer")
+
+
+def read_all(level):
+    platforms, items = [], []
+    for key in level.index:
+        chunk_platforms, chunk_items = level.chunk(key)
+        platforms += chunk_platforms
+        items += chunk_items
+    return platforms, sorted(items)
+
+
+def check_parity():
+    for number, data in platformer.LEVELS.items():
+        level = LevelFile(pack_level(data, (platformer.WIDTH, platformer.HEIGHT)))
+        platforms, items = read_all(level)
+        expected_items = [(i, item["x"], item["y"], item["type"]) for i, item in enumerate(data["items"])]
+        same = (sorted(platforms) == sorted(data["platforms"]) and items == expected_items
+                and level.start_pos == data["start_pos"])
+        yield (f"уровень {number} совпадает со словарём", "да" if same else "НЕТ")
+
+
+def run(width):
+    rows = list(check_parity())
+    _common.report("Упаковка LEVELS", rows)
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = save_level(os.path.join(folder, "level3.gklv"), make_level.generate(width, 600, 5), (width, 600))
+
+        start = time.perf_counter()
+        level = LevelFile.open(path)
+        streamer = ChunkStreamer(level, platformer.STREAM_RADIUS)
+        streamer.update(*level.start_pos)
+        lazy_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        platforms, items = read_all(LevelFile.open(path))
+        full_ms = (time.perf_counter() - start) * 1000
+
+        peak = 0
+        start = time.perf_counter()
+        steps = 0
+        for x in range(0, width, 7):
+            streamer.update(x, 300)
+            peak = max(peak, len(streamer.chunks))
+            steps += 1
+        sweep_us = (time.perf_counter() - start) * 1e6 / steps
+
+        _common.report(f"Мир {width}x600: {len(platforms)} платформ, {len(items)} предметов, "
+                       f"{len(level.index)} кусков, {os.path.getsize(path)} байт", [
+            ("открытие и первые куски, мс", f"{lazy_ms:.2f} (весь уровень: {full_ms:.2f})"),
+            ("кусков в памяти при проходе", f"не больше {peak} из {len(level.index)}"),
+            ("подгрузок / выгрузок", f"{streamer.loads} / {streamer.evictions}"),
+            ("подгрузка на кадр (7 px), мкс", f"{sweep_us:.1f}"),
+        ])
+
+        platformer.LEVEL_DIR = folder
+        platformer.LOG_PICKUPS = False
+        frames = 20000
+        script = InputScript().hold(pygame.K_RIGHT, 0, frames)
+        for frame in range(0, frames, 45):
+            script.press(pygame.K_SPACE, frame)
+        result = run_headless(lambda: platformer.Platformer(3, headless=True), frames, script)
+        game = result.game
+        _common.report("Платформер на уровне 3", [
+            ("прогон", str(result)),
+            ("игрок дошёл до x", f"{game.player.x:.0f}, собрано {len(game.collected)} из {game.level.item_count}"),
+            ("кусков в памяти", len(game.streamer.chunks)),
+        ])
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000000)
@@ -0,0 +1,190 @@
+"""Цикл с постоянным шагом (gamekit/loop.py) против «один update на кадр».
+
+Первая часть идёт на модельных часах: отрисовка и шаг игры «занимают»
+заданное время, а sleep просто двигает часы. Для каждого сценария
+печатается скорость игры (игровые секунды за реальную) у старого цикла,
+где шаг делается раз в кадр и clock.tick ждёт до 1/60 с, и у
+FixedStepLoop: частота кадров, пропущенные кадры отрисовки, выброшенные
+тики, пропущенные сроки и джиттер.
+
+Вторая часть — на настоящих часах: ровность кадров при pygame clock.tick(60)
+и при ожидании до сетки сроков в FixedStepLoop (почти без работы в кадре).
+
+Третья — совпадение: 31_1.py без окна проходит одно и то же число шагов
+обычным циклом run_headless и внутри FixedStepLoop с рывками отрисовки;
+состояние в конце должно совпасть, сколько бы тиков ни пришлось на кадр.
+И экран окончания игры не должен дрожать: update объекты больше не двигает,
+поэтому кадры с любой долей шага alpha обязаны совпасть. При расхождении
+скрипт падает.
+
+Запуск: python bench/bench_loop.py [секунд модельного времени]
+"""
+import hashlib
+import random
+import sys
+import time
+
+import _common
+
+import pygame
+
+from gamekit.headless import NO_KEYS, RandomInput, run_headless
+from gamekit.loop import FixedStepLoop
+
+shooter = _common.load_game("31_1.py", "shooter")
+
+TICK_RATE = 60
+UPDATE_MS = 1.5
+# Сценарии: название, предел кадров, время отрисовки кадра (мс) по номеру кадра
+SCENARIOS = [
+    ("быстрая машина", 60, lambda frame: 4),
+    ("экран 144 Гц", 144, lambda frame: 4),
+    ("без предела кадров", None, lambda frame: 2),
+    ("медленная отрисовка 30 мс", 60, lambda frame: 30),
+    ("рывок 120 мс каждый 50-й кадр", 60, lambda frame: 120 if frame % 50 == 49 else 4),
+    ("перегрузка: отрисовка 150 мс", 60, lambda frame: 150),
+]
+
+
+class ModelClock:
+    """Часы, которые идут только когда их двигают: работа кадра и sleep"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def coupled_speed(fps, render_ms, seconds):
+    """Старый цикл: update и отрисовка раз в кадр, clock.tick(fps) ждёт до конца кадра"""
+    now, frame = 0.0, 0
+    while now < seconds:
+        now += max(1 / fps, (UPDATE_MS + render_ms(frame)) / 1000)
+        frame += 1
+    return frame / TICK_RATE / now
+
+
+def fixed_step(max_fps, render_ms, seconds):
+    clock = ModelClock()
+    loop = FixedStepLoop(TICK_RATE, max_fps, clock=clock, sleep=clock.sleep)
+    frame = 0
+    while clock.now < seconds:
+        for _ in range(loop.ticks()):
+            clock.now += UPDATE_MS / 1000
+        clock.now += render_ms(frame) / 1000
+        frame += 1
+        loop.wait()
+    stats = loop.stats()
+    stats["speed"] = stats["ticks"] / TICK_RATE / clock.now
+    return stats
+
+
+def real_pacing(frames):
+    """Джиттер и худший интервал на настоящих часах: clock.tick(60) и FixedStepLoop(60, 60)"""
+    clock = pygame.time.Clock()
+    last = time.perf_counter()
+    intervals = []
+    for _ in range(frames):
+        clock.tick(TICK_RATE)
+        now = time.perf_counter()
+        intervals.append(now - last)
+        last = now
+    mean = sum(intervals) / len(intervals)
+    jitter = (sum((value - mean) ** 2 for value in intervals) / len(intervals)) ** 0.5
+    tick = (mean * 1000, jitter * 1000, max(intervals) * 1000)
+
+    loop = FixedStepLoop(TICK_RATE, TICK_RATE)
+    for _ in range(frames + 1):
+        loop.ticks()
+        loop.wait()
+    stats = loop.stats()
+    return tick, (stats["interval_ms"], stats["jitter_ms"], stats["worst_ms"])
+
+
+def signature(game):
+    return hashlib.md5(repr(game.state_signature()).encode()).hexdigest()
+
+
+def check_parity(ticks, seed=23):
+    """Одно и то же число шагов обычным циклом и внутри FixedStepLoop с рывками отрисовки"""
+    keys = [pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN]
+    make_game = lambda: shooter.Game(headless=True)
+    reference = run_headless(make_game, ticks, RandomInput(seed, keys, [pygame.K_SPACE]), seed)
+
+    random.seed(seed)
+    game = make_game()
+    script = RandomInput(seed, keys, [pygame.K_SPACE])
+    clock = ModelClock()
+    loop = FixedStepLoop(TICK_RATE, TICK_RATE, clock=clock, sleep=clock.sleep)
+    tick = frame = 0
+    while tick < ticks:
+        for _ in range(loop.ticks()):
+            if tick < ticks:
+                for event in script.events(tick):
+                    game.handle_event(event)
+                game.update(script.keys(tick))
+                tick += 1
+        clock.now += (0.09 if frame % 7 == 3 else 0.003)
+        frame += 1
+        loop.wait()
+    return signature(reference.game) == signature(game), loop.stats()
+
+
+def game_over_frames(alphas=(0.0, 0.25, 0.5, 0.75, 1.0)):
+    """Сколько разных картинок даёт экран окончания игры при разных alpha (должна быть одна)"""
+    random.seed(5)
+    game = shooter.Game()
+    player = game.player
+    for shot in range(8):  # Веер лучей в полёте
+        player.laser_cooldown = 0
+        player.shoot(game.lasers, (player.x + 100 * (shot - 4), player.y - 100))
+        game.update(NO_KEYS)
+    # Фигура прямо на игроке: на следующем шаге кончаются жизни
+    player.lives = 1
+    shape = next(iter(game.shapes))
+    shape.x, shape.y = player.x, player.y
+    game.update(NO_KEYS)
+    assert game.game_over and game.lasers
+    frames = set()
+    for alpha in alphas:
+        game.draw(alpha)
+        frames.add(pygame.image.tobytes(game.screen, "RGB"))
+    return len(frames)
+
+
+def run(seconds):
+    rows = []
+    for name, max_fps, render_ms in SCENARIOS:
+        old = coupled_speed(max_fps or 1000, render_ms, seconds)
+        new = fixed_step(max_fps, render_ms, seconds)
+        rows.append((name, f"скорость игры {old:.2f} -> {new['speed']:.2f}, кадров/с {new['fps']:.0f}, "
+                           f"пропущено кадров {new['skipped_frames']}, выброшено тиков {new['dropped_ticks']}, "
+                           f"сроков {new['missed']}, джиттер {new['jitter_ms']:.1f} мс"))
+    _common.report(f"Модельные часы, {seconds} с, шаг игры {UPDATE_MS} мс", rows)
+
+    tick, loop = real_pacing(120)
+    _common.report("Настоящие часы, 120 кадров по 1/60 с (интервал / джиттер / худший, мс)", [
+        ("pygame clock.tick", "%.2f / %.2f / %.1f" % tick),
+        ("FixedStepLoop.wait", "%.2f / %.2f / %.1f" % loop),
+    ])
+
+    same, stats = check_parity(TICK_RATE * 20)
+    _common.report("Совпадение шагов 31_1.py", [
+        ("обычный цикл и FixedStepLoop", f"{'да' if same else 'НЕТ'}: {stats['ticks']} шагов за {stats['frames']} кадров, "
+                                         f"пропущено кадров отрисовки {stats['skipped_frames']}"),
+    ])
+    assert same, "FixedStepLoop разошёлся с обычным циклом"
+
+    pictures = game_over_frames()
+    _common.report("Экран окончания игры 31_1.py", [
+        ("разных картинок при alpha 0..1", f"{pictures} {'(стоит на месте)' if pictures == 1 else '(дрожит)'}"),
+    ])
+    assert pictures == 1, "после окончания игры картинка зависит от alpha"
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 60)
@@ -0,0 +1,102 @@
+"""Частицы наборы/1.py: объекты Particle со своей поверхностью против пула на массивах.
+
+Каждый кадр досоздаётся столько частиц, чтобы живых было около заданного числа;
+меряется обновление + отрисовка.
+
+Запуск: python bench/bench_particles.py [кадров]
+"""
+import random
+import sys
+
+import _common
+
+import pygame
+
+from gamekit import particles as particles_module
+from gamekit.particles import ParticlePool
+
+COUNTS = [1000, 10000, 20000]
+COLORS = [(255, 215, 0), (192, 192, 192), (255, 50, 50), (64, 224, 208)]
+
+
+class Particle:
+    # Прежний класс из наборы/1.py: своя SRCALPHA-поверхность на каждый кадр
+    def __init__(self, x, y, color):
+        self.x = x
+        self.y = y
+        self.color = color
+        self.size = random.randint(3, 8)
+        self.speed_x = random.uniform(-3, 3)
+        self.speed_y = random.uniform(-3, 3)
+        self.life = random.randint(20, 40)
+        self.gravity = 0.1
+
+    def update(self):
+        self.x += self.speed_x
+        self.y += self.speed_y
+        self.speed_y += self.gravity
+        self.life -= 1
+        self.size = max(0, self.size - 0.1)
+
+    def draw(self, surface):
+        if self.life > 0:
+            alpha = min(255, self.life * 6)
+            particle_surf = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
+            pygame.draw.circle(particle_surf, (*self.color, alpha), (self.size, self.size), self.size)
+            surface.blit(particle_surf, (self.x - self.size, self.y - self.size))
+
+
+def burst_point(i):
+    return random.randint(100, 900), random.randint(100, 600), COLORS[i % len(COLORS)]
+
+
+def run_objects(screen, count, frames):
+    random.seed(count)
+    particles = []
+
+    def frame(i):
+        while len(particles) < count:
+            x, y, color = burst_point(len(particles))
+            particles.extend(Particle(x, y, color) for _ in range(15))
+        for particle in particles[:]:
+            particle.update()
+            if particle.life <= 0:
+                particles.remove(particle)
+        for particle in particles:
+            particle.draw(screen)
+
+    return _common.time_frames(frame, frames)
+
+
+def run_pool(screen, count, frames):
+    random.seed(count)
+    pool = ParticlePool(count + 15)
+
+    def frame(i):
+        while len(pool) < count:
+            x, y, color = burst_point(len(pool))
+            pool.emit(x, y, color, 15)
+        pool.update()
+        pool.draw(screen)
+
+    return _common.time_frames(frame, frames), pool.sprite_count()
+
+
+def run(frames):
+    screen = pygame.display.set_mode((1000, 700))
+    rows = []
+    numpy_module = particles_module.np
+    for count in COUNTS:
+        old_ms = run_objects(screen, count, frames)
+        particles_module.np = None
+        plain_ms, _ = run_pool(screen, count, frames)
+        particles_module.np = numpy_module
+        pool_ms, sprites = run_pool(screen, count, frames)
+        rows.append((f"{count} частиц",
+                     f"объекты {old_ms:7.2f} мс   пул на списках {plain_ms:7.2f} мс   "
+                     f"пул NumPy {pool_ms:6.2f} мс (x{old_ms / pool_ms:.1f})   спрайтов {sprites}"))
+    _common.report(f"Частицы: обновление + отрисовка, {frames} кадров", rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 120)
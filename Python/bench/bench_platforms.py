@@ -0,0 +1,119 @@
+"""Приземление на платформы в main.py: полный перебор против индекса с проверкой пути.
+
+1. Пролёт насквозь: игрок падает на каждую платформу уровней 1 и 2 с
+   верха экрана и с большой начальной скоростью; считается, сколько раз
+   он пролетел платформу. Со старой проверкой полосы в 20 px это
+   случается, с новой — нет.
+2. Цена кадра на уровнях из тысяч платформ, в том числе с одной платформой
+   во весь уровень: она не должна делать каждый запрос к индексу полным
+   перебором. Ответы индекса сверяются с перебором; при расхождении скрипт
+   падает.
+
+Запуск: python bench/bench_platforms.py [кадров]
+"""
+import random
+import sys
+
+import _common
+
+platformer = _common.load_game("main.py", "platformer")
+
+from gamekit.spatial import PlatformIndex
+
+COUNTS = [10, 1000, 10000, 100000]
+
+
+def reference_update(player, platforms):
+    """Старый Player.update: полоса в 20 px под верхом каждой платформы, полный перебор"""
+    player.vel_y += 0.8
+    player.y += player.vel_y
+    player.on_ground = False
+    for platform in platforms:
+        if (player.x + player.width > platform[0] and
+                player.x < platform[0] + platform[2] and
+                player.y + player.height > platform[1] and
+                player.y + player.height < platform[1] + 20):
+            player.y = platform[1] - player.height
+            player.vel_y = 0
+            player.on_ground = True
+
+
+def tunnels(step, platforms, start_speed):
+    """Сколько раз игрок, падая на платформу, оказался ниже неё"""
+    count = 0
+    for target in platforms:
+        player = platformer.Player(target[0] + target[2] // 2 - 20, -60)
+        player.vel_y = start_speed
+        for _ in range(120):
+            step(player)
+            if player.on_ground:
+                break
+        if player.y + player.height > target[1]:
+            count += 1
+    return count
+
+
+def make_level(count, seed=4):
+    rng = random.Random(seed)
+    return [(rng.randrange(0, count * 40), rng.randrange(100, platformer.HEIGHT - 20),
+             rng.randrange(40, 300), 20) for _ in range(count)]
+
+
+def same_answers(index, platforms, world_width, queries=2000, seed=2):
+    """Совпадает ли overlapping с перебором (и по порядку) на случайных полосах"""
+    ordered = sorted(platforms, key=lambda rect: rect[0])
+    rng = random.Random(seed)
+    for _ in range(queries):
+        left = rng.randrange(-100, world_width)
+        right = left + rng.randrange(1, 400)
+        if index.overlapping(left, right) != [rect for rect in ordered
+                                              if rect[0] < right and rect[0] + rect[2] > left]:
+            return False
+    return True
+
+
+def frame_cost(step, frames, world_width):
+    player = platformer.Player(0, 0)
+    rng = random.Random(1)
+
+    def frame(i):
+        player.x = rng.randrange(0, world_width)
+        if player.on_ground and i % 30 == 0:
+            player.jump()
+        step(player)
+
+    return _common.time_frames(frame, frames)
+
+
+def run(frames):
+    rows = []
+    for speed in (0, 15, 30):
+        old = new = 0
+        for number, level in platformer.LEVELS.items():
+            platforms = level["platforms"]
+            index = PlatformIndex(platforms)
+            old += tunnels(lambda player: reference_update(player, platforms), platforms, speed)
+            new += tunnels(lambda player: player.update(index), platforms, speed)
+        rows.append((f"пролётов насквозь, старт {speed} px/кадр", f"{old} -> {new}"))
+    _common.report("Падение на каждую платформу уровней 1 и 2", rows)
+
+    rows = []
+    mismatches = []
+    for count in COUNTS:
+        width = count * 40
+        for wide in (False, True):
+            platforms = make_level(count)
+            if wide:
+                platforms.append((0, platformer.HEIGHT - 40, width, 20))  # Пол во весь уровень
+            index = PlatformIndex(platforms)
+            if not same_answers(index, platforms, width):
+                mismatches.append((count, wide))
+            old_ms = frame_cost(lambda player: reference_update(player, platforms), frames, width)
+            new_ms = frame_cost(lambda player: player.update(index), frames, width)
+            name = f"{count} платформ{' + пол во весь уровень' if wide else ''}, мс/кадр"
+            rows.append((name, f"{old_ms:.4f} -> {new_ms:.4f} (x{old_ms / new_ms:.1f})"))
+    _common.report(f"Player.update, {frames} кадров", rows)
+    assert not mismatches, f"PlatformIndex.overlapping разошёлся с перебором: (платформ, пол) = {mismatches}"
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,135 @@
+"""Пулы лучей и фигур 31_1.py и gc.freeze(): паузы сборщика мусора в сессии «bullet hell».
+
+Игра идёт без окна 10 минут игрового времени (36000 кадров при 60 FPS):
+перезарядки нет, игрок каждый кадр выпускает веер лучей и ходит по
+квадрату, а игрок не умирает. Два сценария: ровная нагрузка (150 фигур,
+уровень не растёт) и рост уровня, когда фигур становится всё больше.
+
+Ровная нагрузка проигрывается без пулов (limit=0: объекты не возвращаются
+и каждый раз создаются заново) и с пулами: здесь видна разница в числе новых
+объектов. Сборок в ней не бывает ни в каком режиме — порог поколения 0
+считает разность созданий и удалений, а постоянный обмен объектов её не
+растит, — поэтому gc.freeze() меряется только при росте уровня: там он
+проигрывается без пулов и с пулами, без gc.freeze() и с ним после запуска,
+как в Game.run (объекты запуска — модули, шрифты, кэши — больше не
+обходятся при полных сборках). Рост уровня идёт дважды: с пакетной проверкой
+лучей, которая почти не создаёт объектов, и с сеткой, которая
+пересобирается каждый тик, как без NumPy. Состояние в конце должно
+совпасть, иначе скрипт падает. Паузы сборщика меряются через gc.callbacks.
+
+Запуск: python bench/bench_pool.py [кадров]
+"""
+import gc
+import hashlib
+import math
+import random
+import sys
+import time
+
+import _common
+
+import pygame
+
+from gamekit.headless import KeyState
+from gamekit.pool import FreeList
+
+shooter = _common.load_game("31_1.py", "shooter")
+
+SHOTS_PER_FRAME = 4
+WALK = [KeyState([key]) for key in (pygame.K_RIGHT, pygame.K_DOWN, pygame.K_LEFT, pygame.K_UP)]
+
+
+class GcPauses:
+    """Длительности сборок мусора по поколениям"""
+
+    def __init__(self):
+        self.pauses = {0: [], 1: [], 2: []}
+        self._start = None
+
+    def __call__(self, phase, info):
+        if phase == "start":
+            self._start = time.perf_counter()
+        elif self._start is not None:
+            self.pauses[info["generation"]].append(time.perf_counter() - self._start)
+            self._start = None
+
+    def __enter__(self):
+        gc.callbacks.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        gc.callbacks.remove(self)
+
+
+def session(frames, limit, freeze, steady, seed=19):
+    """Сессия с пулами ёмкости limit (freeze — убрать объекты запуска из сборок);
+    steady — ровная нагрузка без роста уровня. Возвращает паузы, созданные объекты, время кадров и состояние
+    """
+    shooter.laser_pool = FreeList(shooter.Laser, limit)
+    shooter.shape_pool = FreeList(shooter.GeometricShape, limit)
+    random.seed(seed)
+    game = shooter.Game(headless=True)
+    game.max_shapes = 150
+    game.spawn_delay = 2
+    game.player.lives = 10**9
+    if steady:
+        game.level = 10**9  # Без повышения уровня число фигур не растёт
+        while len(game.shapes) < game.max_shapes:
+            game.shapes.append(game.new_shape())  # Сбитая фигура сразу заменяется новой, так что поле остаётся полным
+    player = game.player
+    gc.collect()
+    if freeze:
+        gc.freeze()  # Как в Game.run
+    frame_times = []
+    with GcPauses() as pauses:
+        for frame in range(frames):
+            start = time.perf_counter()
+            for shot in range(SHOTS_PER_FRAME):
+                angle = frame * 0.05 + shot * 2 * math.pi / SHOTS_PER_FRAME
+                player.laser_cooldown = 0
+                player.shoot(game.lasers, (player.x + math.cos(angle) * 100, player.y + math.sin(angle) * 100))
+            game.update(WALK[frame // 60 % 4])
+            frame_times.append(time.perf_counter() - start)
+    gc.unfreeze()
+    created = shooter.laser_pool.created + shooter.shape_pool.created
+    state = hashlib.md5(repr(game.state_signature()).encode()).hexdigest()
+    return pauses.pauses, created, frame_times, state
+
+
+def describe(pauses, created, frame_times):
+    everything = [pause for generation in pauses.values() for pause in generation]
+    frame_times = sorted(frame_times)
+    minutes = len(frame_times) / shooter.TICK_RATE / 60
+    return (f"сборок 0/1/2: {'/'.join(str(len(pauses[generation])) for generation in (0, 1, 2))}, "
+            f"паузы {sum(everything) * 1000:.1f} мс (самая долгая {max(everything, default=0) * 1000:.2f}), "
+            f"новых объектов {created / minutes:.0f}/мин, "
+            f"кадр {sum(frame_times) * 1000 / len(frame_times):.2f} / "
+            f"{frame_times[int(len(frame_times) * 0.99)] * 1000:.2f} / {frame_times[-1] * 1000:.2f} мс")
+
+
+def run(frames):
+    pools = [("без пулов", 0, False), ("с пулами", shooter.POOL_LIMIT, False)]
+    frozen = [("без пулов, gc.freeze()", 0, True), ("с пулами, gc.freeze()", shooter.POOL_LIMIT, True)]
+    batch_from = shooter.BATCH_COLLISION_PAIRS
+    # Рост уровня делает каждый кадр дороже, поэтому этот сценарий короче
+    for title, steady, scenario_frames, configs, batch_pairs in (
+            ("ровная нагрузка, 150 фигур", True, frames, pools, batch_from),
+            ("рост уровня (фигур всё больше)", False, max(1, frames // 20), pools + frozen, batch_from),
+            ("рост уровня, сетка на каждый луч (как без NumPy)", False, max(1, frames // 20), pools + frozen, math.inf)):
+        rows = []
+        states = set()
+        shooter.BATCH_COLLISION_PAIRS = batch_pairs
+        for name, limit, freeze in configs:
+            pauses, created, frame_times, state = session(scenario_frames, limit, freeze, steady)
+            states.add(state)
+            rows.append((name, describe(pauses, created, frame_times)))
+        shooter.BATCH_COLLISION_PAIRS = batch_from
+        rows.append(("состояние в конце совпадает", "да" if len(states) == 1 else "НЕТ"))
+        minutes = scenario_frames / shooter.TICK_RATE / 60
+        _common.report(f"{title}: {scenario_frames} кадров ({minutes:.1f} мин игры), {SHOTS_PER_FRAME} луча за кадр; "
+                       f"кадр — среднее / 99% / худший", rows)
+        assert len(states) == 1, f"{title}: состояние в конце зависит от пулов или gc.freeze()"
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 36000)
@@ -0,0 +1,68 @@
+"""Цена профилировщика кадра (gamekit/profiler.py) в 31_1.py.
+
+Одна и та же игра (один seed, стрельба по кругу) проигрывается с
+выключенным и включённым профилировщиком; отдельно меряется цена одной
+отсечки в выключенном состоянии. В конце печатается профиль по фазам
+и проверяется, что CSV и JSON сохраняются.
+
+Запуск: python bench/bench_profiler.py [кадров]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import timeit
+
+import _common
+
+from gamekit.profiler import FrameProfiler
+
+shooter = _common.load_game("31_1.py", "shooter")
+
+
+def play(frames, profiler, seed=6):
+    random.seed(seed)
+    game = shooter.Game(profiler=profiler)
+
+    def frame(i):
+        profiler.begin_frame()
+        if i % 15 == 0:
+            target = (i * 37 % shooter.SCREEN_WIDTH, i * 53 % shooter.SCREEN_HEIGHT)
+            game.player.shoot(game.lasers, target)
+        profiler.lap("events")
+        game.update()
+        game.draw()
+        profiler.end_frame()
+
+    return _common.time_frames(frame, frames)
+
+
+def run(frames):
+    play(frames, FrameProfiler())  # Прогрев: кэши спрайтов и шрифтов
+    off_ms = play(frames, FrameProfiler())
+    profiler = FrameProfiler(enabled=True)
+    on_ms = play(frames, profiler)
+    disabled = FrameProfiler()
+    lap_ns = timeit.timeit(lambda: disabled.lap("update"), number=200000) / 200000 * 1e9
+    empty_ns = timeit.timeit(lambda: None, number=200000) / 200000 * 1e9
+
+    with tempfile.TemporaryDirectory() as folder:
+        csv_path = profiler.dump(os.path.join(folder, "profile.csv"))
+        with open(csv_path, encoding="utf-8") as file:
+            csv_rows = sum(1 for _ in file) - 1
+        with open(profiler.dump(os.path.join(folder, "profile.json")), encoding="utf-8") as file:
+            phases = json.load(file)["phases"]
+
+    _common.report(f"31_1.py, {frames} кадров", [
+        ("выключен, мс/кадр", f"{off_ms:.3f}"),
+        ("включён, мс/кадр", f"{on_ms:.3f}"),
+        ("вызов выключенного, нс", f"{max(0.0, lap_ns - empty_ns):.0f} (10 вызовов на кадр)"),
+        ("строк в CSV", csv_rows),
+        ("фаз в JSON", len(phases)),
+    ])
+    print(profiler.summary())
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 600)
@@ -0,0 +1,77 @@
+"""Запись и воспроизведение сессий (gamekit/replay.py) для платформера и 31_1.py.
+
+Сессия «играется» ботом с отрисовкой каждого кадра, как настоящая, и
+записывается в файл; затем запись проигрывается без окна. Контрольная
+сумма итогового состояния должна совпасть с записанной. Бот жмёт и
+стрелки с F3: их коды в pygame 2 больше 2^30 и тоже должны пережить запись.
+
+Запуск: python bench/bench_replay.py [кадров]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import _common
+
+import pygame
+
+from gamekit.games import game_class, create_headless, load_game
+from gamekit.headless import RandomInput
+from gamekit.replay import Recorder, Replay, play
+
+SESSIONS = {
+    "platformer": ([pygame.K_LEFT, pygame.K_RIGHT], [pygame.K_SPACE, pygame.K_r, pygame.K_RIGHT, pygame.K_F3]),
+    "shooter": ([pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN],
+                [pygame.K_SPACE, pygame.K_LEFT, pygame.K_UP, pygame.K_F3]),
+}
+
+
+def record(name, frames, path, seed=11):
+    """Сессия с отрисовкой, записанная в path; возвращает время в секундах и нажатые клавиши"""
+    module = load_game(name)
+    recorder = Recorder.from_argv(name, module.RECORDED_KEYS, ["--record", path, "--seed", str(seed)])
+    game = game_class(name)()
+    hold_keys, press_keys = SESSIONS[name]
+    bot = RandomInput(seed, hold_keys, press_keys, press_chance=0.1)
+    pressed = []
+    start = time.perf_counter()
+    for frame in range(frames):
+        events = bot.events(frame)
+        pressed.extend(event.key for event in events)
+        keys = bot.keys(frame)
+        recorder.record(keys, events)
+        for event in events:
+            game.handle_event(event)
+        game.update(keys)
+        game.draw()
+    seconds = time.perf_counter() - start
+    recorder.save(game)
+    return seconds, pressed
+
+
+def run(frames):
+    load_game("platformer").LOG_PICKUPS = False
+    for name in SESSIONS:
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, f"{name}.rpl")
+            live, pressed = record(name, frames, path)
+            size = os.path.getsize(path)
+            replay = Replay.load(path)
+            result = play(replay, lambda: create_headless(name))
+        replayed = [event.key for frame in range(replay.frames) for event in replay.events(frame)]
+        _common.report(f"{name}, {frames} кадров", [
+            ("размер записи", f"{size} байт ({size / frames:.2f} байт/кадр)"),
+            ("сессия с отрисовкой, с", f"{live:.2f} (в реальном времени {frames / replay.fps:.0f})"),
+            ("воспроизведение без окна, с", f"{result.headless.seconds:.3f}"),
+            ("быстрее реального времени", f"x{frames / replay.fps / result.headless.seconds:.0f}"),
+            ("нажатия совпадают", f"{'да' if replayed == pressed else 'НЕТ'} ({len(pressed)} нажатий, "
+                                  f"из них стрелок и F3 {sum(key > 0xFFFF for key in pressed)})"),
+            ("контрольная сумма совпадает", "да" if result.matches else "НЕТ"),
+        ])
+        assert replayed == pressed, f"{name}: нажатия клавиш не пережили запись"
+        assert result.matches, f"{name}: контрольная сумма воспроизведения не совпала с записанной"
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 3600)
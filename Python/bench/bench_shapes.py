@@ -0,0 +1,81 @@
+"""Движение фигур 31_1.py: объекты по одному против массивов NumPy (ShapeStore).
+
+Сначала проверяется совпадение: обе версии стартуют с одного seed и после
+нескольких сотен тиков Game.update должны дать одинаковые фигуры, счёт и жизни;
+при расхождении скрипт падает.
+Затем замеряется пропускная способность шага move + отскок + столкновение с игроком.
+
+Запуск: python bench/bench_shapes.py [тиков]
+"""
+import random
+import sys
+import time
+
+import _common
+
+shooter = _common.load_game("31_1.py", "shooter")
+
+COUNTS = [1000, 10000, 50000]
+
+
+def snapshot(game):
+    return (game.player.score, game.player.lives, game.level,
+            [(s.x, s.y, s.size, s.speed_x, s.speed_y, s.rotation, s.color, s.shape_type)
+             for s in game.shapes])
+
+
+def check_parity(ticks, seed=31):
+    """Полный Game.update в обоих режимах с одинаковым seed"""
+    states = []
+    for vectorized in (False, True):
+        random.seed(seed)
+        game = shooter.Game(vectorized=vectorized)
+        game.max_shapes = 200
+        game.spawn_delay = 5
+        game.player.lives = 10**6
+        for tick in range(ticks):
+            # Стреляем по кругу, чтобы проверить и попадания лучей
+            target = (tick * 37 % shooter.SCREEN_WIDTH, tick * 53 % shooter.SCREEN_HEIGHT)
+            game.player.shoot(game.lasers, target)
+            game.update()
+        states.append(snapshot(game))
+        hits = 10**6 - game.player.lives
+    return states[0] == states[1], hits
+
+
+def throughput(count, ticks, vectorized):
+    random.seed(count)
+    game = shooter.Game(vectorized=vectorized)
+    game.shapes = [game.new_shape() for _ in range(count)]
+    player = game.player
+
+    # Найденные столкновения не нужны: меряется сама проверка
+    start = time.perf_counter()
+    for _ in range(ticks):
+        if vectorized:
+            game.shape_store.step()
+            game.shape_store.collide(player.x, player.y, player.radius)
+        else:
+            for shape in game.shapes:
+                shape.move()
+            [shape for shape in game.shapes if player.check_collision(shape)]
+    elapsed = time.perf_counter() - start
+    return elapsed * 1000 / ticks, count * ticks / elapsed
+
+
+def run(ticks):
+    same, hits = check_parity(ticks)
+    assert same, "фигуры в массивах NumPy разошлись с обычными объектами"
+    rows = [("совпадение с обычными объектами", f"{'да' if same else 'НЕТ'} (столкновений с игроком: {hits})")]
+    for count in COUNTS:
+        scalar_ms, scalar_rate = throughput(count, ticks, False)
+        vector_ms, vector_rate = throughput(count, ticks, True)
+        rows.append((f"{count} фигур",
+                     f"объекты {scalar_ms:8.2f} мс/тик ({scalar_rate / 1e6:5.2f} млн/с)   "
+                     f"массивы {vector_ms:6.2f} мс/тик ({vector_rate / 1e6:6.1f} млн/с)   "
+                     f"x{scalar_ms / vector_ms:.0f}"))
+    _common.report(f"Фигуры: move + отскок + столкновение с игроком, {ticks} тиков", rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
@@ -0,0 +1,51 @@
+"""Отрисовка фигур 31_1.py: многоугольники с синусами каждый кадр против кэша повернутых спрайтов.
+
+По умолчанию бюджет кэша вмещает все кадры фигур. С бюджетом меньше рабочего
+набора (например, 32 МБ при 200 фигурах) кэш начинает вытеснять кадры и
+переключается на точную отрисовку тех, которых в нём нет: «без кэша» —
+сколько кадров так нарисовано.
+
+Запуск: python bench/bench_sprites.py [кадров] [бюджет кэша, МБ]
+"""
+import random
+import sys
+
+import _common
+
+shooter = _common.load_game("31_1.py", "shooter")
+
+
+def run(frames, counts):
+    game = shooter.Game()
+    rows = []
+    for count in counts:
+        random.seed(4)
+        shapes = [shooter.GeometricShape() for _ in range(count)]
+        for shape in shapes:
+            shape.shape_type = random.choice(list(shooter.SHAPE_CORNERS))
+
+        def frame(i):
+            # Фон не заливаем: меряем только отрисовку фигур
+            for shape in shapes:
+                shape.move()
+                shape.draw(game.screen)
+
+        shooter.shape_sprites.clear()
+        shooter.EXACT_SHAPE_DRAWING = True
+        exact_ms = _common.time_frames(frame, frames)
+        shooter.EXACT_SHAPE_DRAWING = False
+        cold_ms = _common.time_frames(frame, frames)  # Кэш заполняется по ходу
+        warm_ms = _common.time_frames(frame, frames)
+        stats = shooter.shape_sprites.stats()
+        rows.append((f"{count} фигур",
+                     f"точно {exact_ms:5.2f} мс   кэш: первый проход {cold_ms:5.2f} мс, "
+                     f"дальше {warm_ms:5.2f} мс (x{exact_ms / warm_ms:.1f})   "
+                     f"кадров {stats['frames']}, {stats['memory_kb']} КБ из {stats['budget_kb']} КБ, "
+                     f"вытеснений {stats['evictions']}, без кэша {stats['bypassed']}"))
+    _common.report(f"Квадраты и треугольники, {frames} кадров, шаг {shooter.SPRITE_ROTATION_STEP}°", rows)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        shooter.shape_sprites.budget_bytes = int(sys.argv[2]) * 1024 * 1024
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 600, [15, 50, 200])
@@ -0,0 +1,98 @@
+"""Звёздное небо и туманности наборы/1.py: списки и draw.circle против gamekit/starfield.py.
+
+Старый фон хранил каждую звезду списком, считал мерцание через math.sin и
+рисовал звезду вызовом pygame.draw.circle; туманности каждый кадр рисовались
+на новой поверхности SRCALPHA. Меряется мерцание + отрисовка N звёзд и
+отрисовка трёх туманностей. Звёзды строятся из одного seed и должны совпасть
+по пикселям; у туманностей радиус округляется до шага, поэтому для них
+печатается только время.
+
+Запуск: python bench/bench_starfield.py [кадров]
+"""
+import math
+import random
+import sys
+
+import _common
+
+import pygame
+
+from gamekit.starfield import NebulaSprites, StarField
+
+treasure = _common.load_game("наборы/1.py", "treasure")
+
+COUNTS = [200, 5000, 50000]
+
+
+def create_stars(count):
+    """Прежний create_stars из наборы/1.py"""
+    stars = []
+    for _ in range(count):
+        x = random.randint(0, treasure.WIDTH)
+        y = random.randint(0, treasure.HEIGHT)
+        size = random.uniform(0.5, 2)
+        brightness = random.randint(150, 255)
+        twinkle_speed = random.uniform(0.01, 0.05)
+        stars.append([x, y, size, brightness, twinkle_speed, 0])
+    return stars
+
+
+def reference_stars(stars, screen):
+    for star in stars:
+        star[5] += star[4]
+        star[3] = 150 + int(math.sin(star[5]) * 50)
+    for x, y, size, brightness, _, _ in stars:
+        pygame.draw.circle(screen, (brightness, brightness, brightness), (x, y), size)
+
+
+def field_stars(field, screen):
+    field.update()
+    field.draw(screen)
+
+
+def nebula_frame(game_time, screen, sprites):
+    """Три туманности как в TreasureGame.draw; sprites=None — старый способ"""
+    for i in range(3):
+        x = treasure.WIDTH // 4 * i + (game_time % 100) * 0.5
+        y = treasure.HEIGHT // 3 + math.sin(game_time * 0.01 + i) * 100
+        radius = 100 + math.sin(game_time * 0.02 + i) * 50
+        color = (50 + i * 30, 30, 80 + i * 20)
+        if sprites is None:
+            fog_surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(fog_surf, (*color, 30), (radius, radius), radius)
+        else:
+            fog_surf, radius = sprites.get(radius, color)
+        screen.blit(fog_surf, (x - radius, y - radius))
+
+
+def run(frames):
+    screen = treasure.create_window()
+    rows = []
+    for count in COUNTS:
+        random.seed(8)
+        stars = create_stars(count)
+        random.seed(8)
+        field = StarField(count, treasure.WIDTH, treasure.HEIGHT)
+        field_stars(field, screen)  # Прогрев: пиксели звёзд считаются при первой отрисовке
+
+        screen.fill((0, 0, 0))
+        old_ms = _common.time_frames(lambda i: reference_stars(stars, screen), frames)
+        old_pixels = pygame.image.tostring(screen, "RGB")
+        random.seed(8)
+        field = StarField(count, treasure.WIDTH, treasure.HEIGHT)
+        screen.fill((0, 0, 0))
+        new_ms = _common.time_frames(lambda i: field_stars(field, screen), frames)
+        same = pygame.image.tostring(screen, "RGB") == old_pixels
+        rows.append((f"{count} звёзд, мс/кадр", f"{old_ms:.3f} -> {new_ms:.3f} (x{old_ms / new_ms:.1f}), "
+                                                f"картинка совпадает: {'да' if same else 'НЕТ'}"))
+
+    sprites = NebulaSprites(treasure.NEBULA_RADIUS_STEP)
+    old_ms = _common.time_frames(lambda i: nebula_frame(i, screen, None), frames)
+    new_ms = _common.time_frames(lambda i: nebula_frame(i, screen, sprites), frames)
+    rows.append(("3 туманности, мс/кадр", f"{old_ms:.3f} -> {new_ms:.3f} (x{old_ms / new_ms:.1f}), "
+                                          f"{len(sprites)} готовых кругов, {sprites.memory_bytes() // 1024} КБ"))
+    _common.report(f"Фон наборы/1.py, {frames} кадров", rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
@@ -0,0 +1,133 @@
+"""Запуск игр: импорт без побочных эффектов и время до первого кадра.
+
+Каждый замер идёт в отдельном процессе, чтобы кэши модулей и шрифтов
+не переходили из прогона в прогон:
+
+* импорт файла игры под python -X importtime: сколько занимает сам pygame,
+  сколько — модули gamekit, и не открылось ли при импорте окно и не
+  поднялся ли звук;
+* время от запуска процесса до первого вывода кадра на экран (первый
+  pygame.display.flip/update) при запуске игры как скрипта; берётся
+  медиана из нескольких запусков;
+* цена инициализации: pygame.init() против только видео и шрифтов,
+  pygame.font.SysFont(None) против pygame.font.Font(None) в новом процессе.
+
+Запуск: python bench/bench_startup.py [запусков на замер]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import _common
+
+from gamekit.games import GAMES
+
+# Импорт игры: время, окно и звук после импорта (печатается JSON)
+IMPORT_CODE = """
+import json, sys, time
+sys.path.insert(0, {python_dir!r})
+start = time.perf_counter()
+from gamekit.games import load_game
+load_game({name!r})
+seconds = time.perf_counter() - start
+import pygame
+print(json.dumps({{"seconds": seconds, "window": pygame.display.get_surface() is not None,
+                  "display": bool(pygame.display.get_init()), "mixer": bool(pygame.mixer.get_init())}}))
+"""
+
+# Запуск игры как скрипта; процесс завершается на первом выводе кадра
+FIRST_FRAME_CODE = """
+import os, runpy, sys
+sys.path.insert(0, {python_dir!r})
+import pygame
+
+def first_frame(*args):
+    os._exit(0)
+
+pygame.display.flip = pygame.display.update = first_frame
+sys.argv = [{path!r}]
+runpy.run_path({path!r}, run_name="__main__")
+"""
+
+INIT_CODE = """
+import json, time
+import pygame
+start = time.perf_counter()
+{init}
+print(json.dumps(time.perf_counter() - start))
+"""
+
+INITS = {
+    "pygame.init() (все модули)": "pygame.init()",
+    "display.init() + font.init()": "pygame.display.init(); pygame.font.init()",
+    "pygame.font.SysFont(None, 36)": "pygame.font.init(); pygame.font.SysFont(None, 36)",
+    "pygame.font.Font(None, 36)": "pygame.font.init(); pygame.font.Font(None, 36)",
+}
+
+
+def python(code, *flags):
+    return subprocess.run([sys.executable, *flags, "-c", code], capture_output=True, text=True, env=os.environ)
+
+
+def import_times(name):
+    """Время импорта игры, pygame и модулей gamekit (мс) и побочные эффекты импорта"""
+    result = python(IMPORT_CODE.format(python_dir=_common.PYTHON_DIR, name=name), "-X", "importtime")
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    pygame_us = gamekit_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line.split("|")
+        if module.strip() == "pygame":
+            pygame_us = int(cumulative)
+        elif module.startswith(" gamekit.") or module.strip() == "gamekit":
+            # Только модули, импортированные самой игрой (первый уровень вложенности)
+            gamekit_us += int(cumulative)
+    report["pygame_ms"] = pygame_us / 1000
+    report["gamekit_ms"] = gamekit_us / 1000
+    return report
+
+
+def first_frame(path, runs):
+    """Медиана времени от запуска процесса до первого кадра (мс)"""
+    code = FIRST_FRAME_CODE.format(python_dir=_common.PYTHON_DIR, path=os.path.join(_common.PYTHON_DIR, path))
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = python(code)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def empty_process(runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        python("pass")
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def run(runs):
+    rows = []
+    for name, (path, _, _) in GAMES.items():
+        report = import_times(name)
+        effects = [effect for effect in ("window", "display", "mixer") if report[effect]]
+        rows.append((f"{name}: импорт, мс", f"{report['seconds'] * 1000:.1f} (pygame {report['pygame_ms']:.1f}, "
+                                            f"gamekit {report['gamekit_ms']:.1f}); при импорте поднято: "
+                                            f"{', '.join(effects) or 'ничего'}"))
+        rows.append((f"{name}: до первого кадра, мс", f"{first_frame(path, runs):.0f}"))
+    rows.append(("пустой процесс python, мс", f"{empty_process(runs):.0f}"))
+    for title, init in INITS.items():
+        seconds = statistics.median(json.loads(python(INIT_CODE.format(init=init)).stdout) for _ in range(runs))
+        rows.append((title + ", мс", f"{seconds * 1000:.2f}"))
+    _common.report(f"Запуск игр (медиана из {runs}, видеодрайвер {os.environ['SDL_VIDEODRIVER']})", rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
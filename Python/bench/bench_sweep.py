@@ -0,0 +1,42 @@
+"""Масштабирование tools/sweep.py по числу процессов.
+
+Один и тот же небольшой перебор (4 сочетания x seeds прогонов) запускается
+на 1, 2, 4, ... процессах вплоть до числа ядер. Печатается время, ускорение
+относительно одного процесса и эффективность (ускорение / процессы);
+итоги прогонов при любом числе процессов должны совпасть.
+
+Запуск: python bench/bench_sweep.py [seeds] [кадров на прогон]
+"""
+import os
+import sys
+import time
+
+import _common
+
+sys.path.insert(0, os.path.join(_common.PYTHON_DIR, "tools"))
+
+import sweep
+
+GRID = {"spawn_delay": [30, 60], "max_shapes": [15, 30]}
+
+
+def run(seeds, frames):
+    cores = os.cpu_count() or 1
+    counts = sorted({1, cores} | {2 ** power for power in range(1, cores.bit_length()) if 2 ** power <= cores})
+    rows = []
+    baseline = None
+    results = set()
+    for workers in counts:
+        start = time.perf_counter()
+        runs = sweep.sweep(GRID, seeds, frames, workers=workers)
+        seconds = time.perf_counter() - start
+        results.add(repr(runs))
+        baseline = baseline or seconds
+        speedup = baseline / seconds
+        rows.append((f"{workers} процессов", f"{seconds:.2f} с, x{speedup:.2f}, эффективность {speedup / workers:.0%}"))
+    rows.append(("итоги совпадают", "да" if len(results) == 1 else "НЕТ"))
+    _common.report(f"Перебор баланса: {len(runs)} прогонов до {frames} кадров, ядер {cores}", rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 8, int(sys.argv[2]) if len(sys.argv) > 2 else 3600)
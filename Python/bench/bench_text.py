@@ -0,0 +1,55 @@
+"""Время кадра HUD платформера: SysFont на каждый вызов против кэша надписей.
+
+Запуск: python bench/bench_text.py [кадров]
+"""
+import sys
+
+import _common
+
+import pygame
+
+main = _common.load_game("main.py")
+
+
+def draw_text_uncached(text, size, color, x, y):
+    # Так draw_text работал раньше: поиск шрифта на каждый вызов
+    font = pygame.font.SysFont(None, size)
+    main.screen.blit(font.render(text, True, color), (x, y))
+
+
+def run(frames):
+    main.create_window()
+    hud = main.create_hud()
+
+    def old_frame(i):
+        score = i // 30 * 10  # Счет меняется раз в полсекунды
+        main.screen.fill((30, 30, 50))
+        draw_text_uncached("Уровень: 1", 36, main.WHITE, 20, 20)
+        draw_text_uncached(f"Счет: {score}", 36, main.WHITE, 20, 60)
+        draw_text_uncached(f"Собрано предметов: {i // 300}", 36, main.WHITE, 20, 100)
+        draw_text_uncached("Управление: стрелки/A-D, Пробел - прыжок", 24, main.WHITE, 20, main.HEIGHT - 80)
+        draw_text_uncached("R - рестарт уровня, N - следующий уровень", 24, main.WHITE, 20, main.HEIGHT - 50)
+
+    def new_frame(i):
+        score = i // 30 * 10
+        main.screen.fill((30, 30, 50))
+        hud["level"].draw(main.screen, 1)
+        hud["score"].draw(main.screen, score)
+        hud["collected"].draw(main.screen, i // 300)
+        main.draw_text("Управление: стрелки/A-D, Пробел - прыжок", 24, main.WHITE, 20, main.HEIGHT - 80)
+        main.draw_text("R - рестарт уровня, N - следующий уровень", 24, main.WHITE, 20, main.HEIGHT - 50)
+
+    old_ms = _common.time_frames(old_frame, frames)
+    new_ms = _common.time_frames(new_frame, frames)
+    renders = sum(label.renders for label in hud.values())
+    _common.report(f"HUD платформера, {frames} кадров ({pygame.display.get_driver()})", [
+        ("SysFont каждый кадр, мс/кадр", f"{old_ms:.3f}"),
+        ("кэш надписей, мс/кадр", f"{new_ms:.3f}"),
+        ("ускорение", f"x{old_ms / new_ms:.1f}"),
+        ("перерисовок строк HUD", renders),
+        ("попаданий / промахов LRU", f"{main.text_cache.hits} / {main.text_cache.misses}"),
+    ])
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 600)
@@ -0,0 +1,191 @@
+"""Кадры сокровищ и игрока игры наборы/1.py: рисование каждый кадр против готовых спрайтов.
+
+Старый Treasure.draw на каждом кадре создавал поверхность SRCALPHA, рисовал
+блеск, форму и блик, а вращающиеся сокровища ещё и поворачивал. Теперь
+кадры берутся из кэша treasure_sprites. Меряется отрисовка N сокровищ,
+время полного заполнения кэша и его память. Картинка сверяется по
+пикселям на кадрах, где угол поворота попадает точно в шаг кэша
+(на остальных вращающиеся сокровища отличаются не больше чем на полшага);
+из-за RLE полупрозрачные пиксели могут отличаться на единицу.
+
+Игрок раньше тоже рисовался заново: поверхность 120x120 с поворотом и
+по поверхности на каждый круг следа. Теперь все 360 углов поворота и круги
+следа нарисованы заранее; картинка сверяется на полном обороте.
+Отдельно сверяется движущийся игрок между тиками (alpha 0, 0.5 и 1):
+он должен рисоваться там же, где его нарисовала бы старая отрисовка
+в промежуточной позиции. При любом отличии скрипт падает.
+
+Запуск: python bench/bench_treasure_sprites.py [кадров]
+"""
+import math
+import random
+import sys
+import time
+
+import _common
+
+import numpy as np
+import pygame
+
+from gamekit.headless import KeyState
+from gamekit.loop import lerp
+
+treasure = _common.load_game("наборы/1.py", "treasure")
+
+COUNTS = [15, 200, 1000]
+
+
+def reference_draw(item, surface, camera):
+    """Старый Treasure.draw: поверхность рисуется заново на каждом кадре"""
+    S = treasure.SQUARE_SIZE
+    rect = camera.apply(item.rect)
+    if item.animation_type == "pulse":
+        size_mod = math.sin(item.animation_progress * 2) * 5
+        draw_rect = rect.inflate(size_mod, size_mod)
+    elif item.animation_type == "float":
+        draw_rect = rect.move(0, math.sin(item.animation_progress + item.float_offset) * 10)
+    else:
+        draw_rect = rect
+    glow_size = int(abs(math.sin(item.animation_progress)) * 15) if item.animation_type == "pulse" else None
+    treasure_surf = treasure.paint_treasure(item.color, item.points, glow_size)
+    if item.animation_type == "rotate":
+        rotated = pygame.transform.rotate(treasure_surf, item.animation_progress * 30)
+        return surface.blit(rotated, (draw_rect.x - S, draw_rect.y - S))
+    return surface.blit(treasure_surf, (draw_rect.x - S // 2, draw_rect.y - S // 2))
+
+
+def reference_player_draw(player, surface, camera, alpha=1.0):
+    """Старый Player.draw: след и игрок рисуются заново на каждом кадре (игрок — в позиции между тиками)"""
+    S = treasure.PLAYER_SIZE
+    for i, pos in enumerate(player.trail):
+        pos = camera.to_screen(*pos)
+        trail_alpha = int(50 * (i / len(player.trail)))
+        size = int(S * (i / len(player.trail)))
+        trail_surf = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+        pygame.draw.circle(trail_surf, (*player.color, trail_alpha), (size, size), size)
+        if size > 0:
+            surface.blit(trail_surf, (pos[0] - size, pos[1] - size))
+    rotated = pygame.transform.rotate(treasure.paint_player(player.color), player.angle)
+    x, y = camera.to_screen(lerp(player.prev_x, player.rect.x, alpha), lerp(player.prev_y, player.rect.y, alpha))
+    return surface.blit(rotated, (x - S // 2, y - S // 2))
+
+
+def compare_player(draw_frames):
+    """Полный оборот игрока, идущего по кругу: мс на кадр старой и новой отрисовки и отличие картинки"""
+    camera = treasure.Camera((treasure.WIDTH, treasure.HEIGHT), (treasure.WIDTH, treasure.HEIGHT))
+    keys = [KeyState([pygame.K_RIGHT]), KeyState([pygame.K_DOWN]),
+            KeyState([pygame.K_LEFT]), KeyState([pygame.K_UP])]
+    old = pygame.Surface((treasure.WIDTH, treasure.HEIGHT))
+    new = pygame.Surface((treasure.WIDTH, treasure.HEIGHT))
+    player = treasure.Player()
+    old_seconds = new_seconds = 0
+    worst = 0
+    for i in range(draw_frames):
+        player.move(keys[i // 20 % 4])
+        old.fill((0, 0, 0))
+        new.fill((0, 0, 0))
+        start = time.perf_counter()
+        reference_player_draw(player, old, camera)
+        middle = time.perf_counter()
+        player.draw(new, camera)
+        new_seconds += time.perf_counter() - middle
+        old_seconds += middle - start
+        if i % 10 == 0:
+            worst = max(worst, np.abs(pygame.surfarray.array3d(old).astype(int) - pygame.surfarray.array3d(new)).max())
+    return old_seconds * 1000 / draw_frames, new_seconds * 1000 / draw_frames, worst
+
+
+def check_moving_player(frames):
+    """Наибольшее отличие канала для игрока, идущего по диагонали, при отрисовке между тиками"""
+    camera = treasure.Camera((treasure.WIDTH, treasure.HEIGHT), (treasure.WIDTH, treasure.HEIGHT))
+    keys = KeyState([pygame.K_RIGHT, pygame.K_DOWN])
+    old = pygame.Surface((treasure.WIDTH, treasure.HEIGHT))
+    new = pygame.Surface((treasure.WIDTH, treasure.HEIGHT))
+    player = treasure.Player()
+    worst = 0
+    for _ in range(frames):
+        player.move(keys)
+        for alpha in (0.0, 0.5, 1.0):
+            old.fill((0, 0, 0))
+            new.fill((0, 0, 0))
+            reference_player_draw(player, old, camera, alpha)
+            player.draw(new, camera, alpha)
+            worst = max(worst, np.abs(pygame.surfarray.array3d(old).astype(int) - pygame.surfarray.array3d(new)).max())
+    return worst
+
+
+def make_treasures(count, seed=5):
+    random.seed(seed)
+    return [treasure.Treasure(random.randint(50, treasure.WIDTH - 100), random.randint(50, treasure.HEIGHT - 100),
+                              random.choice(treasure.SQUARES_INFO)) for _ in range(count)]
+
+
+def draw_cost(items, draw, frames):
+    camera = treasure.Camera((treasure.WIDTH, treasure.HEIGHT), (treasure.WIDTH, treasure.HEIGHT))
+    screen = treasure.create_window()
+
+    def frame(i):
+        for item in items:
+            item.update()
+            draw(item, screen, camera)
+
+    return _common.time_frames(frame, frames)
+
+
+def check_pixels(frames):
+    """Сколько кадров сокровищ совпало по пикселям со старой отрисовкой и наибольшее отличие канала"""
+    camera = treasure.Camera((200, 200), (200, 200))
+    old = pygame.Surface((200, 200))
+    new = pygame.Surface((200, 200))
+    same = total = worst = 0
+    for info in treasure.SQUARES_INFO:
+        item = treasure.Treasure(70, 70, info)
+        for i in range(frames):
+            item.update()
+            if info[3] == "rotate" and i % 2 == 0:
+                continue  # Угол между шагами кэша
+            old.fill((0, 0, 0))
+            new.fill((0, 0, 0))
+            reference_draw(item, old, camera)
+            item.draw(new, camera)
+            total += 1
+            difference = np.abs(pygame.surfarray.array3d(old).astype(int) - pygame.surfarray.array3d(new)).max()
+            same += difference == 0
+            worst = max(worst, difference)
+    return same, total, worst
+
+
+def run(frames):
+    treasure.player_sprites.bake((treasure.PLAYER_COLOR, angle) for angle in range(360))
+    old_ms, new_ms, worst = compare_player(360)
+    moving_worst = check_moving_player(60)
+    _common.report("Игрок со следом, 360 кадров (полный оборот)", [
+        ("отрисовка, мс/кадр", f"{old_ms:.3f} -> {new_ms:.3f} (x{old_ms / new_ms:.1f})"),
+        ("кэш кадров игрока", f"{len(treasure.player_sprites)} кадров, "
+                              f"{treasure.player_sprites.stats()['memory_kb']} КБ; кругов следа {len(treasure.trail_circles)}"),
+        ("наибольшее отличие канала", worst),
+        ("движущийся игрок между тиками", f"наибольшее отличие канала {moving_worst}"),
+    ])
+    assert worst == 0, f"кадры игрока отличаются от старой отрисовки (отличие канала {worst})"
+    assert moving_worst == 0, f"движущийся игрок рисуется не там (отличие канала {moving_worst})"
+
+    treasure.treasure_sprites.clear()
+    start = time.perf_counter()
+    baked = treasure.treasure_sprites.bake(treasure.treasure_frames())
+    bake_ms = (time.perf_counter() - start) * 1000
+    stats = treasure.treasure_sprites.stats()
+    same, total, worst = check_pixels(240)
+
+    rows = []
+    for count in COUNTS:
+        old_ms = draw_cost(make_treasures(count), reference_draw, frames)
+        new_ms = draw_cost(make_treasures(count), treasure.Treasure.draw, frames)
+        rows.append((f"{count} сокровищ, мс/кадр", f"{old_ms:.3f} -> {new_ms:.3f} (x{old_ms / new_ms:.1f})"))
+    rows.append(("все кадры кэша", f"{baked} кадров за {bake_ms:.0f} мс, {stats['memory_kb']} КБ "
+                                   f"(при запуске игры — {treasure.SPRITE_BAKE_SECONDS * 1000:.0f} мс, остальное по запросу)"))
+    rows.append(("совпало по пикселям", f"{same} из {total} кадров, наибольшее отличие канала {worst}"))
+    _common.report(f"Отрисовка сокровищ, {frames} кадров, шаг поворота {treasure.TREASURE_ROTATION_STEP}°", rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1 @@
+"""Вспомогательные подсистемы для игр из папки Python: кэши, индексы, циклы"""
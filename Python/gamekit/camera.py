@@ -0,0 +1,68 @@
+"""Камера: видимая часть мира, который может быть больше окна.
+
+Объекты живут в мировых координатах, а рисуются со сдвигом камеры.
+Для отсечения невидимого камера спрашивает у пространственного индекса
+(SpatialHash или PlatformIndex) только объекты рядом с окном и считает,
+сколько из них попало в кадр, — это печатается в отладочной сводке.
+"""
+import math
+
+import pygame
+
+
+class Camera:
+    def __init__(self, view_size, world_size):
+        self.width, self.height = view_size
+        self.world_width, self.world_height = world_size
+        self.x = 0
+        self.y = 0
+        self.moved = True  # Сдвинулась ли камера в последнем follow
+        self._counts = {}  # название -> [нарисовано, всего, замеров]
+
+    @property
+    def rect(self):
+        """Видимая область в мировых координатах"""
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+
+    def follow(self, x, y):
+        """Центрирует камеру на точке, не выходя за края мира; True, если камера сдвинулась"""
+        new_x = max(0, min(self.world_width - self.width, int(x) - self.width // 2))
+        new_y = max(0, min(self.world_height - self.height, int(y) - self.height // 2))
+        self.moved = (new_x, new_y) != (self.x, self.y)
+        self.x, self.y = new_x, new_y
+        return self.moved
+
+    def to_screen(self, x, y):
+        return x - self.x, y - self.y
+
+    def to_world(self, x, y):
+        return x + self.x, y + self.y
+
+    def apply(self, rect):
+        """Прямоугольник мира -> прямоугольник на экране"""
+        return rect.move(-self.x, -self.y)
+
+    def nearby(self, index, margin=0):
+        """Кандидаты из SpatialHash рядом с окном (точную проверку делает вызывающий)"""
+        half_width = self.width / 2 + margin
+        half_height = self.height / 2 + margin
+        return index.query(self.x + self.width / 2, self.y + self.height / 2,
+                           math.hypot(half_width, half_height))
+
+    def visible_platforms(self, index):
+        """Прямоугольники (x, y, w, h) из PlatformIndex, пересекающие окно"""
+        top, bottom = self.y, self.y + self.height
+        return [rect for rect in index.overlapping(self.x, self.x + self.width)
+                if rect[1] < bottom and rect[1] + rect[3] > top]
+
+    def count(self, name, drawn, total):
+        """Запоминает, сколько объектов нарисовано из скольких (для сводки)"""
+        counts = self._counts.setdefault(name, [0, 0, 0])
+        counts[0] += drawn
+        counts[1] += total
+        counts[2] += 1
+
+    def summary(self):
+        parts = [f"{name} {drawn / samples:.1f} из {total / samples:.1f}"
+                 for name, (drawn, total, samples) in self._counts.items()]
+        return "Отсечение камерой (в среднем за кадр нарисовано): " + (", ".join(parts) or "нет данных")
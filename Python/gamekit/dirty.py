@@ -0,0 +1,80 @@
+"""Отрисовка "грязными прямоугольниками".
+
+Вместо заливки всего экрана и pygame.display.flip() восстанавливается фон
+только под прямоугольниками, где объекты были в прошлом кадре, и на экран
+отправляются только прямоугольники прошлого и текущего кадра. Если
+грязной оказывается слишком большая часть экрана, кадр выводится целиком.
+"""
+import pygame
+
+
+class DirtyRenderer:
+    """Вывод кадра: грязные прямоугольники (enabled=True) или обычный flip"""
+
+    def __init__(self, background, enabled=True, max_fraction=0.5):
+        self.background = background  # LayeredRenderer или объект с draw(target, area=None)
+        self.enabled = enabled
+        self.max_fraction = max_fraction
+        self.frames = 0
+        self.full_frames = 0
+        self.pixels_pushed = 0  # Пикселей отправлено в последнем кадре
+        self.total_pixels = 0
+        self._previous = []
+        self._current = []
+        self._size = None
+        self._full = True
+
+    def invalidate(self):
+        """Следующий кадр будет нарисован и выведен целиком (например, после смены уровня)"""
+        self._full = True
+
+    def begin(self, screen):
+        """Стирает прошлый кадр: весь фон или только под старыми прямоугольниками"""
+        self._screen = screen
+        self._current = []
+        if screen.get_size() != self._size:
+            self._size = screen.get_size()
+            self._full = True
+        if not self.enabled or self._full:
+            self.background.draw(screen)
+        else:
+            for rect in self._previous:
+                self.background.draw(screen, rect)
+
+    def add(self, rect):
+        """Запоминает прямоугольник, который нарисовали в этом кадре; возвращает его же"""
+        if rect is not None and self.enabled:
+            rect = rect.clip(self._screen.get_rect())
+            if rect.width and rect.height:
+                self._current.append(rect)
+        return rect
+
+    def add_all(self, rects):
+        """То же, что add, для списка прямоугольников (например, из Surface.blits)"""
+        for rect in rects:
+            self.add(rect)
+
+    def present(self):
+        """Выводит кадр на экран и запоминает прямоугольники для следующего"""
+        screen_area = self._size[0] * self._size[1]
+        rects = self._previous + self._current
+        area = sum(rect.width * rect.height for rect in rects)
+        if not self.enabled or self._full or area > screen_area * self.max_fraction:
+            pygame.display.flip()
+            self.full_frames += 1
+            self.pixels_pushed = screen_area
+        else:
+            pygame.display.update(rects)
+            self.pixels_pushed = area
+        self._previous = self._current
+        self._full = False
+        self.frames += 1
+        self.total_pixels += self.pixels_pushed
+
+    def average_pixels(self):
+        return self.total_pixels / self.frames if self.frames else 0
+
+    def summary(self):
+        mode = "грязные прямоугольники" if self.enabled else "полный flip"
+        return (f"Вывод кадров ({mode}): {self.frames} кадров, в среднем "
+                f"{self.average_pixels():.0f} пикселей на кадр, целиком {self.full_frames} кадров")
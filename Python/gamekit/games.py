@@ -0,0 +1,47 @@
+"""Загрузка игр из папки Python по короткому имени.
+
+Файлы 31_1.py и наборы/1.py нельзя импортировать обычным import,
+поэтому они загружаются по пути.
+"""
+import importlib.util
+import os
+import sys
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Имя игры -> (файл относительно папки Python, класс с handle_event/update/draw,
+#              аргументы конструктора для запуска без окна)
+GAMES = {
+    "platformer": ("main.py", "Platformer", {"headless": True}),
+    "shooter": ("31_1.py", "Game", {"headless": True}),
+    "treasure": (os.path.join("наборы", "1.py"), "TreasureGame", {"headless": True}),
+}
+
+
+def load_path(relative_path, module_name):
+    """Импортирует файл по пути относительно папки Python (один раз за процесс)"""
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    if PYTHON_DIR not in sys.path:
+        sys.path.insert(0, PYTHON_DIR)
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(PYTHON_DIR, relative_path))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_game(name):
+    """Модуль игры по имени из GAMES"""
+    path, _, _ = GAMES[name]
+    return load_path(path, name)
+
+
+def game_class(name):
+    return getattr(load_game(name), GAMES[name][1])
+
+
+def create_headless(name, **kwargs):
+    """Экземпляр игры без окна и отрисовки"""
+    _, _, headless_kwargs = GAMES[name]
+    return game_class(name)(**headless_kwargs, **kwargs)
@@ -0,0 +1,134 @@
+"""Безоконный детерминированный прогон игр.
+
+Игра шагает с фиксированным шагом времени без окна, отрисовки и
+clock.tick: random засевается заданным seed, а клавиши и события берутся
+из сценария. Так можно прогнать миллионы кадров для проверки баланса
+и регрессий, в том числе на машине, где есть только SDL dummy.
+
+Игра должна уметь handle_event(event), update(keys) и иметь флаг running.
+Окно при этом не нужно: use_dummy_video() вызывается до загрузки игры.
+"""
+import os
+import random
+import time
+
+import pygame
+
+
+def use_dummy_video():
+    """SDL рисует в память, без окна. Действует, если вызвать до первого init_modules()
+    или open_window() из gamekit.window: модули игр включают видео и шрифты только там
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+class KeyState:
+    """Состояние клавиш как у pygame.key.get_pressed(), но заданное вручную"""
+
+    def __init__(self, pressed=()):
+        self.pressed = frozenset(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+    def __eq__(self, other):
+        return isinstance(other, KeyState) and self.pressed == other.pressed
+
+    def __hash__(self):
+        return hash(self.pressed)
+
+
+NO_KEYS = KeyState()
+
+
+class InputScript:
+    """Сценарий ввода: удерживаемые клавиши и события по номерам кадров"""
+
+    def __init__(self):
+        self._holds = []   # (первый кадр, последний кадр, клавиша)
+        self._events = {}  # кадр -> список событий
+
+    def hold(self, key, start, end):
+        """Клавиша нажата с кадра start по кадр end включительно"""
+        self._holds.append((start, end, key))
+        return self
+
+    def press(self, key, frame):
+        """Одиночное нажатие клавиши (событие KEYDOWN) на кадре frame"""
+        return self.event(frame, pygame.KEYDOWN, key=key)
+
+    def click(self, pos, frame, button=1):
+        return self.event(frame, pygame.MOUSEBUTTONDOWN, pos=pos, button=button)
+
+    def event(self, frame, event_type, **attributes):
+        self._events.setdefault(frame, []).append(pygame.event.Event(event_type, **attributes))
+        return self
+
+    def keys(self, frame):
+        return KeyState(key for start, end, key in self._holds if start <= frame <= end)
+
+    def events(self, frame):
+        return self._events.get(frame, ())
+
+
+class RandomInput:
+    """Бот для проверок баланса: случайно зажимает клавиши из списка и иногда жмёт кнопки.
+
+    Использует собственный генератор, чтобы не сбивать random игры.
+    """
+
+    def __init__(self, seed, hold_keys, press_keys=(), hold_frames=20, press_chance=0.05):
+        self.rng = random.Random(seed)
+        self.hold_keys = list(hold_keys)
+        self.press_keys = list(press_keys)
+        self.hold_frames = hold_frames
+        self.press_chance = press_chance
+        self._current = NO_KEYS
+
+    def keys(self, frame):
+        if frame % self.hold_frames == 0:
+            count = self.rng.randint(0, min(2, len(self.hold_keys)))
+            self._current = KeyState(self.rng.sample(self.hold_keys, count))
+        return self._current
+
+    def events(self, frame):
+        if self.press_keys and self.rng.random() < self.press_chance:
+            return [pygame.event.Event(pygame.KEYDOWN, key=self.rng.choice(self.press_keys))]
+        return ()
+
+
+class HeadlessResult:
+    def __init__(self, game, frames, seconds, dt):
+        self.game = game
+        self.frames = frames
+        self.seconds = seconds  # Реальное время прогона
+        self.sim_seconds = frames * dt  # Игровое время
+
+    @property
+    def fps(self):
+        return self.frames / self.seconds if self.seconds else float("inf")
+
+    def __str__(self):
+        return (f"{self.frames} кадров ({self.sim_seconds:.0f} с игрового времени) за {self.seconds:.2f} с: "
+                f"{self.fps:,.0f} кадров/с, {self.fps * 60 / 1e6:.2f} млн кадров/мин")
+
+
+def run_headless(make_game, frames, script=None, seed=0, fps=60, stop=None):
+    """Создаёт игру после random.seed(seed) и прогоняет frames шагов по сценарию.
+
+    stop(game) — необязательное условие досрочной остановки (например, конец игры).
+    """
+    random.seed(seed)
+    game = make_game()
+    script = script or InputScript()
+    start = time.perf_counter()
+    frame = 0
+    while frame < frames and game.running:
+        for event in script.events(frame):
+            game.handle_event(event)
+        game.update(script.keys(frame))
+        frame += 1
+        if stop is not None and stop(game):
+            break
+    return HeadlessResult(game, frame, time.perf_counter() - start, 1 / fps)
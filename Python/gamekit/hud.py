@@ -0,0 +1,54 @@
+"""Интерфейс из виджетов, которые помнят свою картинку (retained mode).
+
+Виджет рисует себя в поверхность один раз и дальше только копирует её на
+экран. Панель рисуется один раз; у полосы прогресса градиент нарисован
+заранее во всю ширину, а на экран копируется только заполненная часть.
+Надписи, привязанные к значениям (счёт, время, комбо), — это
+gamekit.text.TextLabel: она рендерится заново, лишь когда значения изменились.
+"""
+import pygame
+
+
+class Panel:
+    """Неизменная подложка: paint(surface) рисует её один раз на прозрачной поверхности size"""
+
+    def __init__(self, size, paint):
+        self.size = size
+        self.paint = paint
+        self._surface = None
+
+    def get_surface(self):
+        if self._surface is None:
+            self._surface = pygame.Surface(self.size, pygame.SRCALPHA)
+            self.paint(self._surface)
+        return self._surface
+
+    def draw(self, surface, pos):
+        return surface.blit(self.get_surface(), pos)
+
+
+class GradientBar:
+    """Полоса прогресса: фон и рамка со скруглением, заполнение — готовый градиент.
+
+    color_at(i, width) — цвет столбца i заполнения шириной width.
+    """
+
+    def __init__(self, rect, color_at, background, border, radius=10, min_fill=10):
+        self.rect = pygame.Rect(rect)
+        self.background = background
+        self.border = border
+        self.radius = radius
+        self.min_fill = min_fill
+        # Столбцы градиента — отрезки высотой height + 1, как у pygame.draw.line с концом включительно
+        self.strip = pygame.Surface((self.rect.width, self.rect.height + 1))
+        for i in range(self.rect.width):
+            pygame.draw.line(self.strip, color_at(i, self.rect.width), (i, 0), (i, self.rect.height))
+
+    def draw(self, surface, fraction):
+        """Рисует полосу, заполненную на fraction (0..1); возвращает прямоугольник всего нарисованного"""
+        rect = self.rect
+        pygame.draw.rect(surface, self.background, rect, border_radius=self.radius)
+        fill_width = max(self.min_fill, int(rect.width * fraction))
+        filled = surface.blit(self.strip, rect, (0, 0, fill_width, rect.height + 1))
+        # Нижняя строка градиента выступает на пиксель ниже рамки: она тоже должна попасть на экран
+        return pygame.draw.rect(surface, self.border, rect, width=2, border_radius=self.radius).union(filled)
@@ -0,0 +1,71 @@
+"""Хранилище предметов для частой проверки «что задел игрок».
+
+Предметы лежат в плотном списке, у каждого есть готовый прямоугольник
+rect. Удаление ставит на место предмета последний из списка (O(1) вместо
+list.remove), а пересечения ищутся через сетку SpatialHash, а не перебором
+всех предметов уровня. Разложенные предметы можно запомнить как шаблон
+(snapshot) и потом вернуть (restore) без создания объектов и вставки в сетку.
+"""
+import math
+
+from gamekit.spatial import SpatialHash
+
+
+class ItemStore:
+    """Предметы с атрибутом rect (pygame.Rect); запросы отдают их в порядке добавления"""
+
+    def __init__(self, cell_size=128):
+        self.items = []
+        self.grid = SpatialHash(cell_size)
+        self._slots = {}  # предмет -> место в items
+
+    def add(self, item):
+        rect = item.rect
+        self._slots[item] = len(self.items)
+        self.items.append(item)
+        self.grid.insert(item, rect.centerx, rect.centery, math.hypot(rect.width, rect.height) / 2)
+
+    def remove(self, item):
+        """Удаляет предмет за O(1): на его место переезжает последний"""
+        slot = self._slots.pop(item)
+        last = self.items.pop()
+        if last is not item:
+            self.items[slot] = last
+            self._slots[last] = slot
+        self.grid.remove(item)
+
+    def reset(self, items):
+        """Раскладывает заново готовые предметы"""
+        self.items = []
+        self._slots = {}
+        self.grid.clear()
+        for item in items:
+            self.add(item)
+
+    def snapshot(self):
+        """Шаблон текущей раскладки для restore"""
+        return list(self.items), dict(self._slots), self.grid.snapshot()
+
+    def restore(self, snapshot):
+        items, slots, grid = snapshot
+        self.items = list(items)
+        self._slots = dict(slots)
+        self.grid.restore(grid)
+
+    def query(self, x, y, radius=0):
+        """Кандидаты рядом с точкой, как у SpatialHash (подходит для Camera.nearby)"""
+        return self.grid.query(x, y, radius)
+
+    def colliding(self, rect):
+        """Предметы, пересекающие rect, в порядке добавления"""
+        candidates = self.grid.query(rect.centerx, rect.centery, math.hypot(rect.width, rect.height) / 2)
+        return [item for item in candidates if rect.colliderect(item.rect)]
+
+    def __contains__(self, item):
+        return item in self._slots
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
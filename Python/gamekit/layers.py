@@ -0,0 +1,54 @@
+"""Статичные слои фона.
+
+Слой — функция paint(surface), которая рисует что-то неподвижное (сетку,
+градиент). Все слои один раз запекаются в общую поверхность, а каждый кадр
+она просто копируется на экран. Пересборка происходит только при смене
+размера окна или после явного invalidate().
+"""
+import pygame
+
+
+class LayeredRenderer:
+    """Стопка статичных слоёв, закэшированных в одной поверхности"""
+
+    def __init__(self, layers=()):
+        self.layers = list(layers)
+        self.rebuilds = 0
+        self._cache = None
+        self._valid = False
+
+    def add(self, paint):
+        self.layers.append(paint)
+        self.invalidate()
+        return paint
+
+    def invalidate(self):
+        """Сбрасывает кэш: слои перерисуются при следующем draw.
+
+        Поверхность не пересоздаётся: слои рисуются поверх старой (первый слой
+        должен закрашивать её целиком), так пересборка при частых invalidate
+        не тратит время на выделение и convert.
+        """
+        self._valid = False
+
+    def get_surface(self, size):
+        if self._cache is None or self._cache.get_size() != size:
+            cache = pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                cache = cache.convert()
+            self._cache = cache
+            self._valid = False
+        if not self._valid:
+            for paint in self.layers:
+                paint(self._cache)
+            self._valid = True
+            self.rebuilds += 1
+        return self._cache
+
+    def draw(self, target, area=None):
+        """Копирует запечённый фон на target (целиком или только прямоугольник area)"""
+        cache = self.get_surface(target.get_size())
+        if area is None:
+            target.blit(cache, (0, 0))
+        else:
+            target.blit(cache, area, area)
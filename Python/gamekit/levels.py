@@ -0,0 +1,181 @@
+"""Файлы уровней платформера, разбитые на куски (чанки).
+
+Мир делится на квадраты со стороной chunk_size. Платформа или предмет
+лежит в том куске, где находится его левый верхний угол. В начале файла —
+заголовок и оглавление кусков (где лежит кусок и сколько в нём объектов),
+поэтому открытие файла читает только оглавление, а сами куски читаются
+из отображённого в память файла, когда игрок подходит к ним близко.
+
+Формат (little-endian):
+    заголовок   MAGIC, версия B, chunk_size H, ширина и высота мира I I,
+                старт игрока i i, наибольшие ширина и высота платформы I I,
+                всего предметов I, типы предметов (число B, имена: длина B + utf-8)
+    оглавление  число кусков I, записи (cx i, cy i, смещение I, платформ I, предметов I)
+    куски       платформы (x, y, w, h: i * 4), предметы (номер I, x i, y i, тип B)
+"""
+import mmap
+import struct
+
+MAGIC = b"GKLV"
+VERSION = 1
+
+_HEADER = struct.Struct("<HIIiiIII")
+_ENTRY = struct.Struct("<iiIII")
+_PLATFORM = struct.Struct("<iiii")
+_ITEM = struct.Struct("<IiiB")
+_COUNT = struct.Struct("<I")
+
+CHUNK_SIZE = 512
+
+
+def pack_level(level, world_size, chunk_size=CHUNK_SIZE):
+    """Уровень в виде словаря (как в LEVELS из main.py) -> байты файла уровня"""
+    types = sorted({item["type"] for item in level["items"]})
+    type_codes = {name: code for code, name in enumerate(types)}
+
+    chunks = {}
+    for platform in level["platforms"]:
+        key = (platform[0] // chunk_size, platform[1] // chunk_size)
+        chunks.setdefault(key, ([], []))[0].append(_PLATFORM.pack(*platform))
+    for number, item in enumerate(level["items"]):
+        key = (item["x"] // chunk_size, item["y"] // chunk_size)
+        chunks.setdefault(key, ([], []))[1].append(
+            _ITEM.pack(number, item["x"], item["y"], type_codes[item["type"]]))
+
+    names = b"".join(bytes((len(name.encode("utf-8")),)) + name.encode("utf-8") for name in types)
+    head = b"".join([
+        MAGIC, bytes((VERSION,)),
+        _HEADER.pack(chunk_size, world_size[0], world_size[1], *level["start_pos"],
+                     max((p[2] for p in level["platforms"]), default=0),
+                     max((p[3] for p in level["platforms"]), default=0),
+                     len(level["items"])),
+        bytes((len(types),)), names,
+        _COUNT.pack(len(chunks)),
+    ])
+
+    # Куски идут сразу после оглавления в порядке ключей
+    offset = len(head) + _ENTRY.size * len(chunks)
+    entries, bodies = [], []
+    for (cx, cy), (platforms, items) in sorted(chunks.items()):
+        body = b"".join(platforms + items)
+        entries.append(_ENTRY.pack(cx, cy, offset, len(platforms), len(items)))
+        bodies.append(body)
+        offset += len(body)
+    return head + b"".join(entries) + b"".join(bodies)
+
+
+def save_level(path, level, world_size, chunk_size=CHUNK_SIZE):
+    with open(path, "wb") as file:
+        file.write(pack_level(level, world_size, chunk_size))
+    return path
+
+
+class LevelFile:
+    """Открытый файл уровня: заголовок и оглавление в памяти, куски читаются по запросу"""
+
+    def __init__(self, data):
+        self._data = data
+        if data[:4] != MAGIC:
+            raise ValueError("это не файл уровня")
+        if data[4] != VERSION:
+            raise ValueError(f"неизвестная версия файла уровня {data[4]}")
+        (self.chunk_size, width, height, start_x, start_y,
+         self.max_width, self.max_height, self.item_count) = _HEADER.unpack_from(data, 5)
+        self.size = (width, height)
+        self.start_pos = (start_x, start_y)
+        offset = 5 + _HEADER.size
+        self.item_types = []
+        for _ in range(data[offset]):
+            length = data[offset + 1]
+            self.item_types.append(bytes(data[offset + 2:offset + 2 + length]).decode("utf-8"))
+            offset += 1 + length
+        offset += 1
+        (chunk_count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        self.index = {}  # (cx, cy) -> (смещение, платформ, предметов)
+        for cx, cy, chunk_offset, platforms, items in _ENTRY.iter_unpack(
+                data[offset:offset + chunk_count * _ENTRY.size]):
+            self.index[(cx, cy)] = (chunk_offset, platforms, items)
+
+    @classmethod
+    def open(cls, path):
+        """Файл отображается в память: читаются только нужные куски"""
+        with open(path, "rb") as file:
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def chunk(self, key):
+        """Платформы [(x, y, w, h)] и предметы [(номер, x, y, тип)] куска"""
+        offset, platform_count, item_count = self.index[key]
+        end = offset + platform_count * _PLATFORM.size
+        platforms = list(_PLATFORM.iter_unpack(self._data[offset:end]))
+        types = self.item_types
+        items = [(number, x, y, types[code]) for number, x, y, code in
+                 _ITEM.iter_unpack(self._data[end:end + item_count * _ITEM.size])]
+        return platforms, items
+
+
+class ChunkStreamer:
+    """Держит в памяти куски уровня рядом с точкой (обычно игроком).
+
+    update(x, y) догружает куски в квадрате radius вокруг точки и выгружает
+    те, что дальше radius + chunk_size (запас, чтобы не грузить один кусок
+    туда-обратно на границе).
+    """
+
+    def __init__(self, level, radius):
+        self.level = level
+        self.radius = radius
+        self.chunks = {}  # (cx, cy) -> (платформы, предметы)
+        self.loads = 0
+        self.evictions = 0
+        self.version = 0  # Меняется при каждом изменении набора кусков
+        self._last_range = None
+
+    def _range(self, x, y, margin):
+        size = self.level.chunk_size
+        # Платформа из куска левее/выше может дотянуться до точки своей шириной/высотой
+        return (int((x - margin - self.level.max_width) // size), int((x + margin) // size),
+                int((y - margin - self.level.max_height) // size), int((y + margin) // size))
+
+    def update(self, x, y):
+        """Догружает и выгружает куски; True, если набор кусков изменился"""
+        needed = self._range(x, y, self.radius)
+        if needed == self._last_range:
+            return False  # Точка не вышла за пределы тех же кусков
+        self._last_range = needed
+
+        changed = False
+        keep_x0, keep_x1, keep_y0, keep_y1 = self._range(x, y, self.radius + self.level.chunk_size)
+        for key in list(self.chunks):
+            if not (keep_x0 <= key[0] <= keep_x1 and keep_y0 <= key[1] <= keep_y1):
+                del self.chunks[key]
+                self.evictions += 1
+                changed = True
+
+        x0, x1, y0, y1 = needed
+        index = self.level.index
+        if (x1 - x0 + 1) * (y1 - y0 + 1) <= len(index):
+            keys = [(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)]
+        else:
+            # Радиус больше уровня: быстрее пройти по оглавлению
+            keys = [key for key in index if x0 <= key[0] <= x1 and y0 <= key[1] <= y1]
+        for key in keys:
+            if key in index and key not in self.chunks:
+                self.chunks[key] = self.level.chunk(key)
+                self.loads += 1
+                changed = True
+        if changed:
+            self.version += 1
+        return changed
+
+    def reset(self):
+        self.chunks.clear()
+        self._last_range = None
+        self.version += 1
+
+    def platforms(self):
+        return [platform for platforms, _ in self.chunks.values() for platform in platforms]
+
+    def items(self):
+        """Предметы загруженных кусков в порядке номеров (как в исходном уровне)"""
+        return sorted(item for _, items in self.chunks.values() for item in items)
@@ -0,0 +1,142 @@
+"""Игровой цикл с постоянным шагом симуляции и отдельной частотой отрисовки.
+
+Игра считается тиками одной длины (1 / tick_rate секунды), а рисуется так
+часто, как позволяет max_fps (None — без ограничения). Реальное время
+копится в аккумуляторе и расходуется целыми тиками:
+
+    loop = FixedStepLoop(TICK_RATE, MAX_FPS)
+    while game.running:
+        for _ in range(loop.ticks()):
+            ...события и update...
+        game.draw(loop.alpha)
+        loop.wait()
+
+На медленной машине за кадр выполняется несколько тиков (лишние кадры
+отрисовки пропускаются), поэтому игра не идёт в замедленном темпе. На
+быстром экране кадры рисуются и между тиками: alpha — доля тика,
+прошедшая после последнего update, по ней позиции интерполируются (lerp).
+Если отставание больше max_ticks тиков (отладчик, перетаскивание окна),
+лишнее время выбрасывается, иначе догонять пришлось бы всё дольше.
+
+Статистика темпа: джиттер (разброс интервалов между кадрами) и пропущенные
+сроки — кадры, закончившиеся позже запланированного.
+"""
+import argparse
+import math
+import sys
+import time
+
+TICK_SNAP = 0.0005        # (с) Тик, до которого осталось меньше, выполняется уже в этом кадре
+MISS_TOLERANCE = 0.001    # (с) Опоздание меньше этого не считается пропущенным сроком
+
+
+def lerp(previous, current, alpha):
+    """Значение между прошлым и текущим тиком; при alpha = 1 ровно current"""
+    return current - (current - previous) * (1 - alpha)
+
+
+class FixedStepLoop:
+    def __init__(self, tick_rate=60, max_fps=60, max_ticks=5, clock=time.perf_counter, sleep=time.sleep):
+        self.tick_rate = tick_rate
+        self.dt = 1 / tick_rate
+        self.max_fps = max_fps
+        self.period = 1 / max_fps if max_fps else 0  # 0 — кадры рисуются без ожидания
+        self.max_ticks = max_ticks
+        self.clock = clock
+        self.sleep = sleep
+        self.alpha = 1.0         # Доля тика после последнего update (для интерполяции)
+        self.frames = 0          # Нарисованных кадров
+        self.total_ticks = 0     # Выполненных тиков
+        self.skipped_frames = 0  # Кадров отрисовки, пропущенных ради догоняющих тиков
+        self.dropped_ticks = 0   # Тиков, выброшенных при отставании больше max_ticks
+        self.missed = 0          # Кадров, закончившихся позже срока
+        self._accumulator = 0.0
+        self._start = None       # Начало первого кадра
+        self._frame_start = None
+        self._deadline = None
+        # Интервалы между началами кадров: сумма, сумма квадратов, худший
+        self._intervals = 0
+        self._interval_sum = 0.0
+        self._interval_squares = 0.0
+        self._worst = 0.0
+
+    @classmethod
+    def from_argv(cls, tick_rate, max_fps, argv=None):
+        """Цикл с частотой кадров из ключа --max-fps N (0 — без ограничения), иначе max_fps"""
+        parser = argparse.ArgumentParser(add_help=False)
+        parser.add_argument("--max-fps", type=int, metavar="N")
+        args, _ = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+        if args.max_fps is not None:
+            max_fps = args.max_fps or None
+        return cls(tick_rate, max_fps)
+
+    def ticks(self):
+        """Начало кадра: сколько тиков симуляции выполнить перед отрисовкой"""
+        now = self.clock()
+        if self._start is None:
+            # Первый кадр сразу делает один тик
+            self._start = self._deadline = now
+            self._accumulator = self.dt
+        else:
+            interval = now - self._frame_start
+            self._intervals += 1
+            self._interval_sum += interval
+            self._interval_squares += interval * interval
+            self._worst = max(self._worst, interval)
+            self._accumulator += interval
+        self._frame_start = now
+
+        due = int((self._accumulator + TICK_SNAP) / self.dt)
+        self._accumulator -= due * self.dt
+        if due > self.max_ticks:
+            self.dropped_ticks += due - self.max_ticks
+            due = self.max_ticks
+        if due > 1:
+            self.skipped_frames += due - 1
+        self.total_ticks += due
+        self.alpha = min(1.0, max(0.0, self._accumulator / self.dt))
+        return due
+
+    def wait(self):
+        """Конец кадра: проверка срока и ожидание следующего кадра (если частота ограничена)"""
+        self.frames += 1
+        now = self.clock()
+        if self.period:
+            # Сроки идут ровной сеткой, поэтому ошибки sleep не накапливаются
+            self._deadline += self.period
+        else:
+            # Без ограничения кадр должен уложиться в один тик
+            self._deadline = self._frame_start + self.dt
+        if now > self._deadline + MISS_TOLERANCE:
+            self.missed += 1
+            self._deadline = now  # Пропущенные кадры не догоняются
+        elif self.period and now < self._deadline:
+            self.sleep(self._deadline - now)
+
+    def stats(self):
+        """Итоги темпа: частоты, джиттер (стандартное отклонение интервала) и пропуски"""
+        elapsed = (self._frame_start - self._start) if self._intervals else 0
+        mean = self._interval_sum / self._intervals if self._intervals else 0
+        variance = self._interval_squares / self._intervals - mean * mean if self._intervals else 0
+        return {
+            "frames": self.frames,
+            "ticks": self.total_ticks,
+            "fps": self._intervals / elapsed if elapsed else 0,
+            "tick_rate": self.total_ticks / (elapsed + self.dt) if elapsed else 0,
+            "interval_ms": mean * 1000,
+            "jitter_ms": math.sqrt(max(0.0, variance)) * 1000,
+            "worst_ms": self._worst * 1000,
+            "missed": self.missed,
+            "skipped_frames": self.skipped_frames,
+            "dropped_ticks": self.dropped_ticks,
+        }
+
+    def summary(self):
+        stats = self.stats()
+        limit = f"не больше {self.max_fps} к/с" if self.max_fps else "без ограничения"
+        missed_share = stats["missed"] / stats["frames"] if stats["frames"] else 0
+        return (f"Темп кадров ({limit}, {self.tick_rate} тиков/с): {stats['frames']} кадров ({stats['fps']:.1f}/с), "
+                f"{stats['ticks']} тиков ({stats['tick_rate']:.1f}/с); интервал {stats['interval_ms']:.2f} мс, "
+                f"джиттер {stats['jitter_ms']:.2f} мс, худший {stats['worst_ms']:.1f} мс; "
+                f"пропущено сроков {stats['missed']} ({missed_share:.1%}), "
+                f"кадров отрисовки {stats['skipped_frames']}, выброшено тиков {stats['dropped_ticks']}")
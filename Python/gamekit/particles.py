@@ -0,0 +1,165 @@
+"""Пул частиц с хранением в массивах.
+
+Все частицы лежат в заранее выделенных массивах (координаты, скорости,
+жизнь, размер, цвет), обновляются одной векторной операцией и рисуются
+одним вызовом Surface.blits из кэша готовых полупрозрачных кружков по ключу
+(радиус, цвет, уровень прозрачности). Без NumPy тот же пул работает на
+обычных списках, только медленнее.
+"""
+import random
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAX_RADIUS = 8  # Частицы рождаются размером 3..8 и только уменьшаются
+
+
+class ParticlePool:
+    """Частицы фиксированной ёмкости; лишние при переполнении не создаются"""
+
+    FIELDS = ("x", "y", "speed_x", "speed_y", "life", "size", "color")
+
+    def __init__(self, capacity=20000, gravity=0.1, alpha_levels=16):
+        self.capacity = capacity
+        self.gravity = gravity
+        self.alpha_levels = alpha_levels
+        self.count = 0
+        self.dropped = 0
+        self.colors = []  # Номер цвета -> (r, g, b)
+        self._color_index = {}
+        self._sprites = []  # Готовые кружки по номеру (цвет, радиус, прозрачность)
+        if np is not None:
+            self.arrays = {name: np.zeros(capacity) for name in self.FIELDS}
+        else:
+            self.arrays = {name: [0.0] * capacity for name in self.FIELDS}
+
+    def _color(self, color):
+        index = self._color_index.get(color)
+        if index is None:
+            index = len(self.colors)
+            self.colors.append(color)
+            self._color_index[color] = index
+        return index
+
+    def emit(self, x, y, color, count):
+        """Создаёт count частиц в точке (x, y) — случайные параметры как у прежнего класса Particle"""
+        a = self.arrays
+        color_index = self._color(tuple(color))
+        for _ in range(count):
+            size = random.randint(3, 8)
+            speed_x = random.uniform(-3, 3)
+            speed_y = random.uniform(-3, 3)
+            life = random.randint(20, 40)
+            if self.count == self.capacity:
+                self.dropped += 1
+                continue
+            i = self.count
+            a["x"][i] = x
+            a["y"][i] = y
+            a["speed_x"][i] = speed_x
+            a["speed_y"][i] = speed_y
+            a["life"][i] = life
+            a["size"][i] = size
+            a["color"][i] = color_index
+            self.count += 1
+
+    def update(self):
+        """Движение, гравитация, старение и удаление умерших частиц за один шаг"""
+        n = self.count
+        if n == 0:
+            return
+        a = self.arrays
+        if np is not None:
+            a["x"][:n] += a["speed_x"][:n]
+            a["y"][:n] += a["speed_y"][:n]
+            a["speed_y"][:n] += self.gravity
+            a["life"][:n] -= 1
+            np.maximum(a["size"][:n] - 0.1, 0, out=a["size"][:n])
+
+            # Живые частицы сдвигаются в начало массивов
+            alive = a["life"][:n] > 0
+            alive_count = int(alive.sum())
+            if alive_count < n:
+                for array in a.values():
+                    array[:alive_count] = array[:n][alive]
+            self.count = alive_count
+            return
+
+        alive_count = 0
+        for i in range(n):
+            a["x"][i] += a["speed_x"][i]
+            a["y"][i] += a["speed_y"][i]
+            a["speed_y"][i] += self.gravity
+            a["life"][i] -= 1
+            a["size"][i] = max(0, a["size"][i] - 0.1)
+            if a["life"][i] > 0:
+                if alive_count != i:
+                    for array in a.values():
+                        array[alive_count] = array[i]
+                alive_count += 1
+        self.count = alive_count
+
+    def _sprite_key(self, radius, color_index, level):
+        return (color_index * (MAX_RADIUS + 1) + radius) * self.alpha_levels + level
+
+    def _build_sprite(self, key):
+        rest, level = divmod(key, self.alpha_levels)
+        color_index, radius = divmod(rest, MAX_RADIUS + 1)
+        alpha = min(255, (level + 1) * 256 // self.alpha_levels)
+        sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, (*self.colors[color_index], alpha), (radius, radius), radius)
+        self._sprites[key] = sprite
+        return sprite
+
+    def draw(self, surface, offset=(0, 0)):
+        """Рисует все частицы одним вызовом blits; возвращает список нарисованных прямоугольников.
+
+        offset — сдвиг камеры: частицы живут в мировых координатах.
+        """
+        offset_x, offset_y = offset
+        n = self.count
+        if n == 0:
+            return []
+        a = self.arrays
+        # Размер таблицы спрайтов растёт вместе с числом цветов
+        table_size = len(self.colors) * (MAX_RADIUS + 1) * self.alpha_levels
+        if len(self._sprites) < table_size:
+            self._sprites.extend([None] * (table_size - len(self._sprites)))
+
+        if np is not None:
+            radius = np.minimum(a["size"][:n].astype(int), MAX_RADIUS)
+            visible = radius > 0
+            radius = radius[visible]
+            alpha = np.minimum(255, a["life"][:n][visible] * 6)
+            level = (alpha * self.alpha_levels // 256).astype(int)
+            keys = self._sprite_key(radius, a["color"][:n][visible].astype(int), level)
+            for key in np.unique(keys).tolist():
+                if self._sprites[key] is None:
+                    self._build_sprite(key)
+            left = (a["x"][:n][visible] - radius - offset_x).astype(int).tolist()
+            top = (a["y"][:n][visible] - radius - offset_y).astype(int).tolist()
+            sprites = map(self._sprites.__getitem__, keys.tolist())
+            return surface.blits(zip(sprites, zip(left, top)))
+
+        blits = []
+        for i in range(n):
+            radius = min(int(a["size"][i]), MAX_RADIUS)
+            if radius > 0:
+                level = int(min(255, a["life"][i] * 6) * self.alpha_levels // 256)
+                key = self._sprite_key(radius, int(a["color"][i]), level)
+                sprite = self._sprites[key] or self._build_sprite(key)
+                blits.append((sprite, (int(a["x"][i] - radius - offset_x), int(a["y"][i] - radius - offset_y))))
+        return surface.blits(blits)
+
+    def clear(self):
+        self.count = 0
+
+    def sprite_count(self):
+        return sum(sprite is not None for sprite in self._sprites)
+
+    def __len__(self):
+        return self.count
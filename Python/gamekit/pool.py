@@ -0,0 +1,78 @@
+"""Повторное использование объектов и список живых объектов с быстрым удалением.
+
+FreeList хранит освободившиеся объекты (лучи, фигуры) и отдаёт их снова
+вместо создания новых: объект заново заполняется методом reset с теми же
+аргументами, что и конструктор. Так в долгой игре почти не появляется
+новых объектов, и сборщику мусора нечего разбирать.
+
+ActiveList — замена списку живых объектов: добавление в конец, удаление
+любого объекта за O(1) вместо list.remove, обход в порядке добавления
+(как у списка, поэтому игра с тем же seed идёт так же).
+"""
+
+
+class FreeList:
+    """Пул объектов класса cls; у cls должен быть reset(*args), который делает то же, что __init__"""
+
+    def __init__(self, cls, limit=4096):
+        self.cls = cls
+        self.limit = limit  # Сколько свободных объектов держать (0 — пул выключен)
+        self.free = []
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, *args):
+        """Свободный объект, заполненный заново, или новый, если свободных нет"""
+        if self.free:
+            item = self.free.pop()
+            item.reset(*args)
+            self.reused += 1
+            return item
+        self.created += 1
+        return self.cls(*args)
+
+    def release(self, item):
+        """Возвращает объект в пул; после этого им нельзя пользоваться"""
+        if len(self.free) < self.limit:
+            self.free.append(item)
+
+    def stats(self):
+        return {"created": self.created, "reused": self.reused, "free": len(self.free)}
+
+
+class ActiveList:
+    """Упорядоченный набор объектов: append, remove за O(1), обход в порядке добавления"""
+
+    __slots__ = ("_items",)
+
+    def __init__(self, items=()):
+        self._items = dict.fromkeys(items)
+
+    def append(self, item):
+        self._items[item] = None
+
+    def extend(self, items):
+        for item in items:
+            self._items[item] = None
+
+    def remove(self, item):
+        """Удаляет объект; как и у списка, отсутствующий объект — ошибка ValueError"""
+        try:
+            del self._items[item]
+        except KeyError:
+            raise ValueError(f"{item!r} нет в списке") from None
+
+    def clear(self):
+        self._items.clear()
+
+    def __contains__(self, item):
+        return item in self._items
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __repr__(self):
+        return f"ActiveList({list(self._items)!r})"
@@ -0,0 +1,176 @@
+"""Профилировщик кадра: куда уходит время по фазам.
+
+Цикл игры размечает кадр отсечками:
+
+    profiler.begin_frame()
+    ...события...      profiler.lap("events")
+    ...обновление...   profiler.lap("update")
+    ...
+    profiler.end_frame()
+
+lap(phase) добавляет фазе время с предыдущей отсечки, так что одна фаза
+может встречаться в кадре несколько раз. Время каждой фазы за кадр
+хранится в кольцевом буфере последних history кадров; по нему считаются
+перцентили p50/p95/p99 и гистограммы. Выключенный профилировщик подменяет
+свои методы пустой функцией, и отсечки почти ничего не стоят.
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from array import array
+
+import pygame
+
+# Фазы кадра в порядке их выполнения
+PHASES = ("events", "update", "collision", "draw-background", "draw-entities", "hud", "flip")
+
+OVERLAY_KEY = pygame.K_F3  # Показать/скрыть таблицу поверх игры
+OVERLAY_REFRESH = 30       # Кадров между обновлениями таблицы
+
+
+def _skip(*args):
+    pass
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+class FrameProfiler:
+    def __init__(self, enabled=False, history=600, phases=PHASES):
+        self.enabled = enabled
+        self.history = history
+        self.phases = tuple(phases)
+        self.samples = {phase: array("q", bytes(8 * history)) for phase in self.phases}  # нс
+        self.frames = 0          # Завершённых кадров
+        self.overlay = enabled   # Показывать таблицу на экране
+        self.path = None         # Куда сохранить результаты при выходе
+        self._current = dict.fromkeys(self.phases, 0)
+        self._last = 0
+        self._overlay_surface = None
+        self._font = None
+        if not enabled:
+            # Пустые методы вместо настоящих: почти нулевая цена в игровом цикле
+            self.begin_frame = self.lap = self.end_frame = self.handle_event = _skip
+
+    @classmethod
+    def from_argv(cls, argv=None):
+        """Профилировщик по ключу --profile [ФАЙЛ.csv|ФАЙЛ.json]; без ключа — выключенный"""
+        parser = argparse.ArgumentParser(add_help=False)
+        parser.add_argument("--profile", nargs="?", const="", metavar="ФАЙЛ")
+        args, _ = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+        profiler = cls(enabled=args.profile is not None)
+        profiler.path = args.profile or None
+        return profiler
+
+    def begin_frame(self):
+        self._last = time.perf_counter_ns()
+
+    def lap(self, phase):
+        """Время с предыдущей отсечки идёт в фазу phase"""
+        now = time.perf_counter_ns()
+        self._current[phase] += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        index = self.frames % self.history
+        current = self._current
+        for phase, column in self.samples.items():
+            column[index] = current[phase]
+            current[phase] = 0
+        self.frames += 1
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == OVERLAY_KEY:
+            self.overlay = not self.overlay
+
+    def column(self, phase):
+        """Времена фазы (нс) за сохранённые кадры, от старых к новым"""
+        values = self.samples[phase]
+        if self.frames <= self.history:
+            return values[:self.frames]
+        start = self.frames % self.history
+        return values[start:] + values[:start]
+
+    def stats(self):
+        """Фаза -> (среднее, p50, p95, p99) в миллисекундах; 'frame' — весь кадр"""
+        columns = {phase: self.column(phase) for phase in self.phases}
+        columns["frame"] = array("q", map(sum, zip(*columns.values())))
+        result = {}
+        for phase, values in columns.items():
+            ordered = sorted(values)
+            mean = sum(ordered) / len(ordered) if ordered else 0
+            result[phase] = tuple(value / 1e6 for value in (
+                mean, _percentile(ordered, 0.5), _percentile(ordered, 0.95), _percentile(ordered, 0.99)))
+        return result
+
+    def histogram(self, phase):
+        """Число кадров по корзинам времени фазы: верхняя граница в мкс (степени двойки) -> кадров"""
+        counts = {}
+        for value in self.column(phase):
+            bound = 1 << max(0, value // 1000).bit_length()
+            counts[bound] = counts.get(bound, 0) + 1
+        return dict(sorted(counts.items()))
+
+    def dump(self, path=None):
+        """Сохраняет кадры в CSV или сводку с перцентилями и гистограммами в JSON"""
+        path = path or self.path
+        if path.endswith(".json"):
+            data = {
+                "frames": self.frames,
+                "history": min(self.frames, self.history),
+                "phases": {phase: dict(zip(("mean_ms", "p50_ms", "p95_ms", "p99_ms"), values))
+                           for phase, values in self.stats().items()},
+                "histograms_us": {phase: self.histogram(phase) for phase in self.phases},
+            }
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(data, file, indent=2)
+        else:
+            columns = [self.column(phase) for phase in self.phases]
+            first = self.frames - len(columns[0])
+            with open(path, "w", newline="", encoding="utf-8") as file:
+                writer = csv.writer(file)
+                writer.writerow(("frame",) + tuple(f"{phase}_ns" for phase in self.phases))
+                for offset, row in enumerate(zip(*columns)):
+                    writer.writerow((first + offset,) + row)
+        return path
+
+    def summary(self):
+        lines = [f"Профиль кадра ({min(self.frames, self.history)} последних кадров), мс:",
+                 f"  {'фаза':<16}{'сред':>8}{'p50':>8}{'p95':>8}{'p99':>8}"]
+        for phase, values in self.stats().items():
+            lines.append(f"  {phase:<16}" + "".join(f"{value:8.3f}" for value in values))
+        return "\n".join(lines)
+
+    def finish(self):
+        """Вызывается при выходе из игры: печатает сводку и сохраняет файл, если он задан"""
+        if not self.enabled:
+            return
+        print(self.summary())
+        if self.path:
+            print(f"Профиль сохранён в {self.dump()}")
+
+    def draw(self, surface, pos=(10, 10)):
+        """Таблица p50/p95/p99 поверх игры; возвращает прямоугольник для грязного вывода"""
+        if not (self.enabled and self.overlay):
+            return None
+        # Таблица перерисовывается раз в OVERLAY_REFRESH кадров, а не каждый кадр
+        if self._overlay_surface is None or self.frames % OVERLAY_REFRESH == 0:
+            if self._font is None:
+                self._font = pygame.font.SysFont("monospace", 14)
+            rows = [f"{'мс':<16}{'p50':>7}{'p95':>7}{'p99':>7}"]
+            rows += [f"{phase:<16}" + "".join(f"{value:7.2f}" for value in values[1:])
+                     for phase, values in self.stats().items()]
+            lines = [self._font.render(row, True, (220, 255, 220)) for row in rows]
+            height = self._font.get_linesize()
+            surface_size = (max(line.get_width() for line in lines) + 12, height * len(lines) + 8)
+            overlay = pygame.Surface(surface_size, pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, 170))
+            for i, line in enumerate(lines):
+                overlay.blit(line, (6, 4 + i * height))
+            self._overlay_surface = overlay
+        return surface.blit(self._overlay_surface, pos)
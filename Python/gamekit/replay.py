@@ -0,0 +1,248 @@
+"""Запись сессии игры и её воспроизведение.
+
+Запись хранит seed генератора random, состояние нужных клавиш на каждом
+кадре и события (нажатия, клики, выход) в компактном двоичном файле, а
+в конце — контрольную сумму итогового состояния игры. Воспроизведение
+идёт без окна и отрисовки, поэтому быстрее реального времени, и в конце
+сверяет контрольную сумму: так реальную сессию можно повторить кадр в кадр.
+
+Игра должна уметь handle_event(event), update(keys), иметь флаг running
+и метод state_signature() — кортеж значений, по которым считается сумма.
+
+Формат файла (little-endian):
+    заголовок   MAGIC, версия B, длина имени B, имя (utf-8), seed Q, fps H,
+                число кадров I, число клавиш B, коды клавиш I * n
+    клавиши     число серий I, серии (битовая маска I, длина серии H)
+    события     число событий I, события (кадр I, тип B, код клавиши или x i, y h, кнопка h)
+    итог        контрольная сумма состояния I
+
+В версии 1 первое число события было h, и коды стрелок и F-клавиш pygame 2
+(K_RIGHT = 1073741903) в него не помещались. Такие файлы всё ещё читаются.
+"""
+import argparse
+import random
+import struct
+import sys
+import time
+import zlib
+
+import pygame
+
+from gamekit.headless import HeadlessResult, KeyState, run_headless
+
+MAGIC = b"GKRP"
+VERSION = 2
+
+_HEADER = struct.Struct("<QHI")
+_RUN = struct.Struct("<IH")
+_EVENT = struct.Struct("<IBihh")
+_EVENT_V1 = struct.Struct("<IBhhh")
+_COUNT = struct.Struct("<I")
+
+MAX_RUN = 0xFFFF
+
+# Типы событий в файле и их поля
+_QUIT, _KEYDOWN, _CLICK = range(3)
+
+
+def state_checksum(game):
+    """CRC32 итогового состояния игры (repr чисел с плавающей точкой точен)"""
+    return zlib.crc32(repr(game.state_signature()).encode("utf-8"))
+
+
+def _encode_event(event):
+    """Событие pygame -> (тип, a, b, c) или None, если игре оно не нужно"""
+    if event.type == pygame.QUIT:
+        return _QUIT, 0, 0, 0
+    if event.type == pygame.KEYDOWN:
+        return _KEYDOWN, event.key, 0, 0
+    if event.type == pygame.MOUSEBUTTONDOWN:
+        return _CLICK, event.pos[0], event.pos[1], event.button
+    return None
+
+
+def _decode_event(kind, a, b, c):
+    if kind == _QUIT:
+        return pygame.event.Event(pygame.QUIT)
+    if kind == _KEYDOWN:
+        return pygame.event.Event(pygame.KEYDOWN, key=a)
+    return pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(a, b), button=c)
+
+
+class Recorder:
+    """Пишет ввод игрока по кадрам; keys — коды клавиш, которые читает игра"""
+
+    def __init__(self, name, keys, seed=None, fps=60):
+        if len(keys) > 32:
+            raise ValueError("в маске помещается не больше 32 клавиш")
+        self.name = name
+        self.keys = tuple(keys)
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.fps = fps
+        self.masks = []
+        self.events = []  # (кадр, тип, a, b, c)
+        self.path = None
+
+    @classmethod
+    def from_argv(cls, name, keys, argv=None, fps=60):
+        """Recorder, если игра запущена с --record ФАЙЛ, иначе None.
+
+        Засевает random, поэтому вызывается до создания игры.
+        """
+        parser = argparse.ArgumentParser(add_help=False)
+        parser.add_argument("--record", metavar="ФАЙЛ")
+        parser.add_argument("--seed", type=int)
+        args, _ = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+        if not args.record:
+            return None
+        recorder = cls(name, keys, args.seed, fps)
+        recorder.path = args.record
+        random.seed(recorder.seed)
+        return recorder
+
+    def record(self, pressed, events):
+        """Один кадр: pressed — результат pygame.key.get_pressed(), events — события кадра"""
+        frame = len(self.masks)
+        mask = 0
+        for bit, key in enumerate(self.keys):
+            if pressed[key]:
+                mask |= 1 << bit
+        self.masks.append(mask)
+        for event in events:
+            encoded = _encode_event(event)
+            if encoded is not None:
+                self.events.append((frame,) + encoded)
+
+    def save(self, game, path=None):
+        """Пишет файл записи с контрольной суммой текущего состояния игры"""
+        path = path or self.path
+        name = self.name.encode("utf-8")
+        parts = [MAGIC, bytes((VERSION, len(name))), name,
+                 _HEADER.pack(self.seed, self.fps, len(self.masks)),
+                 bytes((len(self.keys),)), struct.pack(f"<{len(self.keys)}I", *self.keys)]
+
+        # Клавиши меняются редко, поэтому маски сжимаются сериями
+        runs = []
+        for mask in self.masks:
+            if runs and runs[-1][0] == mask and runs[-1][1] < MAX_RUN:
+                runs[-1][1] += 1
+            else:
+                runs.append([mask, 1])
+        parts.append(_COUNT.pack(len(runs)))
+        parts.extend(_RUN.pack(mask, length) for mask, length in runs)
+
+        parts.append(_COUNT.pack(len(self.events)))
+        parts.extend(_EVENT.pack(*event) for event in self.events)
+        parts.append(_COUNT.pack(state_checksum(game)))
+
+        with open(path, "wb") as file:
+            file.write(b"".join(parts))
+        return path
+
+
+class Replay:
+    """Загруженная запись; подходит как сценарий для run_headless"""
+
+    def __init__(self, name, seed, fps, keys, masks, events, checksum):
+        self.name = name
+        self.seed = seed
+        self.fps = fps
+        self.key_codes = keys
+        self.masks = masks
+        self.frames = len(masks)
+        self.checksum = checksum
+        self._events = {}
+        for frame, kind, a, b, c in events:
+            self._events.setdefault(frame, []).append(_decode_event(kind, a, b, c))
+        self._states = {}  # маска -> KeyState
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            data = file.read()
+        if data[:4] != MAGIC:
+            raise ValueError(f"{path}: это не файл записи")
+        if data[4] not in (1, VERSION):
+            raise ValueError(f"{path}: неизвестная версия записи {data[4]}")
+        event_format = _EVENT_V1 if data[4] == 1 else _EVENT
+        offset = 6 + data[5]
+        name = data[6:offset].decode("utf-8")
+        seed, fps, frames = _HEADER.unpack_from(data, offset)
+        offset += _HEADER.size
+        key_count = data[offset]
+        keys = struct.unpack_from(f"<{key_count}I", data, offset + 1)
+        offset += 1 + 4 * key_count
+
+        (run_count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        masks = []
+        for mask, length in _RUN.iter_unpack(data[offset:offset + run_count * _RUN.size]):
+            masks.extend([mask] * length)
+        offset += run_count * _RUN.size
+
+        (event_count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        events = list(event_format.iter_unpack(data[offset:offset + event_count * event_format.size]))
+        offset += event_count * event_format.size
+        (checksum,) = _COUNT.unpack_from(data, offset)
+
+        if len(masks) != frames:
+            raise ValueError(f"{path}: запись повреждена ({len(masks)} кадров вместо {frames})")
+        return cls(name, seed, fps, keys, masks, events, checksum)
+
+    # Интерфейс сценария для run_headless
+    def keys(self, frame):
+        mask = self.masks[frame]
+        state = self._states.get(mask)
+        if state is None:
+            state = KeyState(key for bit, key in enumerate(self.key_codes) if mask >> bit & 1)
+            self._states[mask] = state
+        return state
+
+    def events(self, frame):
+        return self._events.get(frame, ())
+
+
+class PlaybackResult:
+    def __init__(self, replay, headless_result, checksum):
+        self.replay = replay
+        self.headless = headless_result
+        self.checksum = checksum
+
+    @property
+    def matches(self):
+        return self.checksum == self.replay.checksum
+
+    def __str__(self):
+        status = "совпадает" if self.matches else "НЕ совпадает"
+        return (f"{self.headless}\nконтрольная сумма {self.checksum:08x}, "
+                f"в записи {self.replay.checksum:08x}: {status}")
+
+
+def play(replay, make_game, render=False, speed=None):
+    """Воспроизводит запись на игре из make_game().
+
+    Без render кадры не рисуются и идут так быстро, как позволяет процессор.
+    С render игра рисует каждый кадр; speed — множитель скорости (None — без ограничения).
+    """
+    if not render:
+        result = run_headless(make_game, replay.frames, replay, replay.seed, replay.fps)
+        return PlaybackResult(replay, result, state_checksum(result.game))
+
+    random.seed(replay.seed)
+    game = make_game()
+    clock = pygame.time.Clock()
+    start = time.perf_counter()
+    frame = 0
+    while frame < replay.frames and game.running:
+        pygame.event.pump()  # Окно должно отвечать, но ввод берётся из записи
+        for event in replay.events(frame):
+            game.handle_event(event)
+        game.update(replay.keys(frame))
+        game.draw()
+        frame += 1
+        if speed:
+            clock.tick(replay.fps * speed)
+    result = HeadlessResult(game, frame, time.perf_counter() - start, 1 / replay.fps)
+    return PlaybackResult(replay, result, state_checksum(game))
+
@@ -0,0 +1,123 @@
+"""Хранилище фигур в виде массивов NumPy (structure of arrays).
+
+Координаты, скорости, размеры и повороты всех фигур лежат в отдельных
+массивах, поэтому движение, отскок и проверка столкновения с игроком
+делаются одной векторной операцией на все фигуры сразу. Отдельная фигура —
+это тонкое представление одной строки массивов (см. RowField).
+"""
+import numpy as np
+
+
+class RowField:
+    """Атрибут объекта-представления, который читает и пишет ячейку массива store[name][row]"""
+
+    def __init__(self, convert=float):
+        self.convert = convert
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, view, owner=None):
+        if view is None:
+            return self
+        return self.convert(view._store.arrays[self.name][view._row])
+
+    def __set__(self, view, value):
+        view._store.arrays[self.name][view._row] = value
+
+
+class ShapeStore:
+    """Массивы фигур; строки 0..count-1 заняты, удаление — перестановкой последней строки"""
+
+    FIELDS = ("x", "y", "prev_x", "prev_y", "speed_x", "speed_y", "size", "rotation", "rotation_speed")
+
+    def __init__(self, width, height, capacity=64):
+        self.width = width
+        self.height = height
+        self.count = 0
+        self.arrays = {name: np.zeros(capacity) for name in self.FIELDS}
+        self.order = np.zeros(capacity, dtype=np.int64)  # Порядок появления, как в списке фигур
+        self.views = []
+        self._next_order = 0
+
+    @property
+    def capacity(self):
+        return len(self.order)
+
+    def _grow(self):
+        capacity = self.capacity * 2
+        for name, array in self.arrays.items():
+            grown = np.zeros(capacity)
+            grown[:self.count] = array[:self.count]
+            self.arrays[name] = grown
+        order = np.zeros(capacity, dtype=np.int64)
+        order[:self.count] = self.order[:self.count]
+        self.order = order
+
+    def add(self, view):
+        """Выделяет строку под объект-представление и возвращает её номер"""
+        if self.count == self.capacity:
+            self._grow()
+        row = self.count
+        self.count += 1
+        self.order[row] = self._next_order
+        self._next_order += 1
+        self.views.append(view)
+        view._store = self
+        view._row = row
+        return row
+
+    def remove(self, view):
+        """Удаляет строку за O(1): на её место переезжает последняя"""
+        row = view._row
+        last = self.count - 1
+        if row != last:
+            for array in self.arrays.values():
+                array[row] = array[last]
+            self.order[row] = self.order[last]
+            moved = self.views[last]
+            moved._row = row
+            self.views[row] = moved
+        self.views.pop()
+        self.count = last
+        view._store = None
+
+    def clear(self):
+        for view in self.views:
+            view._store = None
+        self.views = []
+        self.count = 0
+        self._next_order = 0
+
+    def step(self):
+        """Движение, отскок от границ и вращение всех фигур за один шаг"""
+        n = self.count
+        a = self.arrays
+        x, y = a["x"][:n], a["y"][:n]
+        speed_x, speed_y = a["speed_x"][:n], a["speed_y"][:n]
+        size = a["size"][:n]
+
+        # Позиции до шага нужны для интерполяции при отрисовке
+        a["prev_x"][:n] = x
+        a["prev_y"][:n] = y
+        x += speed_x
+        y += speed_y
+
+        # Отскок от границ экрана
+        speed_x[(x < size) | (x > self.width - size)] *= -1
+        speed_y[(y < size) | (y > self.height - size)] *= -1
+
+        a["rotation"][:n] += a["rotation_speed"][:n]
+
+    def collide(self, x, y, radius):
+        """Объекты, задевающие круг (x, y, radius), в порядке их появления"""
+        n = self.count
+        a = self.arrays
+        dx = a["x"][:n] - x
+        dy = a["y"][:n] - y
+        reach = a["size"][:n] + radius
+        rows = np.flatnonzero(dx * dx + dy * dy < reach * reach)
+        if len(rows) > 1:
+            rows = rows[np.argsort(self.order[rows])]
+        return [self.views[row] for row in rows]
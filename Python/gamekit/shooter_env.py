@@ -0,0 +1,314 @@
+"""Пакетная среда для ботов: N независимых копий игры 31_1.py в массивах NumPy.
+
+Игрок, фигуры и лучи всех копий лежат в двумерных массивах (копия x
+место), и шаг делается векторными операциями сразу для всех копий, без
+цикла Python по копиям. Правила те же, что в Player, GeometricShape и Laser
+из 31_1.py (они — эталон, см. bench/bench_env.py), только отрисовки нет.
+
+Порядок важен так же, как в игре: фигуры и лучи помнят порядковый номер
+появления, луч попадает в самую раннюю из задетых фигур, а лучи одной
+копии проверяются по очереди — цикл идёт по номеру луча в очереди (их
+единицы), а не по копиям.
+
+Случайные числа для новых фигур берутся не из random, а из счётчика:
+параметры k-й фигуры копии — хэш (seed, k). Так их можно считать сразу для
+всех копий, и результат не зависит от того, какие ещё копии идут рядом.
+"""
+import numpy as np
+
+# Как в Player, Laser и GeometricShape из 31_1.py
+PLAYER_RADIUS = 20
+PLAYER_SPEED = 5
+PLAYER_LIVES = 3
+LASER_RADIUS = 5
+LASER_SPEED = 10
+LASER_LIFETIME = 60
+SHAPE_TYPES = ("circle", "square", "triangle")
+SHAPE_COLORS = 3
+HIT_SCORE = 100
+FRAME_SCORE = 0.1
+
+_FAR = np.iinfo(np.int64).max
+
+
+def _mix(z):
+    """Финальное перемешивание SplitMix64"""
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def uniform(seeds, counters, stream):
+    """Числа в [0, 1) по (seed, номер фигуры, номер поля) — для массивов любой длины"""
+    seeds = np.asarray(seeds, dtype=np.uint64)
+    counters = np.asarray(counters, dtype=np.uint64)
+    z = _mix(seeds * np.uint64(0x9E3779B97F4A7C15) + np.uint64(stream))
+    z = _mix(z ^ (counters * np.uint64(0xD1B54A32D192ED03)))
+    return (z >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+
+def spawn_values(seeds, counters, width, height):
+    """Параметры новых фигур: те же диапазоны, что у GeometricShape.reset"""
+    size = 15 + np.floor(uniform(seeds, counters, 0) * 26)
+    return {
+        "size": size,
+        "x": size + np.floor(uniform(seeds, counters, 1) * (width - 2 * size + 1)),
+        "y": size + np.floor(uniform(seeds, counters, 2) * (height - 2 * size + 1)),
+        "color": np.floor(uniform(seeds, counters, 3) * SHAPE_COLORS),
+        "speed_x": uniform(seeds, counters, 4) * 4 - 2,
+        "speed_y": uniform(seeds, counters, 5) * 4 - 2,
+        "kind": np.floor(uniform(seeds, counters, 6) * len(SHAPE_TYPES)),
+    }
+
+
+class Slots:
+    """Места под объекты у каждой копии: поля (копия, место), флаг занятости и номер появления"""
+
+    def __init__(self, count, capacity, fields):
+        self.arrays = {name: np.zeros((count, capacity)) for name in fields}
+        self.alive = np.zeros((count, capacity), dtype=bool)
+        self.order = np.zeros((count, capacity), dtype=np.int64)
+
+    @property
+    def capacity(self):
+        return self.alive.shape[1]
+
+    def _grow(self):
+        def wider(array):
+            grown = np.zeros((array.shape[0], array.shape[1] * 2), dtype=array.dtype)
+            grown[:, :array.shape[1]] = array
+            return grown
+
+        self.arrays = {name: wider(array) for name, array in self.arrays.items()}
+        self.alive = wider(self.alive)
+        self.order = wider(self.order)
+
+    def allocate(self, rows):
+        """По свободному месту в каждой из копий rows (места занимаются); при нехватке массивы удваиваются"""
+        free = ~self.alive[rows]
+        if not free.any(axis=1).all():
+            self._grow()
+            free = ~self.alive[rows]
+        slots = free.argmax(axis=1)
+        self.alive[rows, slots] = True
+        return slots
+
+    def ranked(self, mask):
+        """Места, отсортированные по номеру появления (занятые из mask первыми), и их число у каждой копии"""
+        return np.argsort(np.where(mask, self.order, _FAR), axis=1, kind="stable"), mask.sum(axis=1)
+
+
+class ShooterEnv:
+    """count копий игры; параметры баланса — как константы в 31_1.py (make_env передаёт их оттуда).
+
+    reset(seeds) начинает игры заново, step(actions) делает один кадр всех копий.
+    actions — массив (count, 5): ход по x (-1, 0, 1), ход по y (-1, 0, 1), выстрел (0/1)
+    и точка прицела x, y (как клик мыши; NaN — выстрел вверх, как пробелом).
+    Наблюдение — массив float32 (count, 4 + 4 * nearest): x, y, жизни и перезарядка
+    игрока, затем nearest ближайших фигур (есть ли фигура, dx, dy, размер).
+    Награда — прирост счёта за кадр. Закончившаяся копия стоит до reset.
+    """
+
+    SHAPE_FIELDS = ("x", "y", "speed_x", "speed_y", "size", "color", "kind")
+    LASER_FIELDS = ("x", "y", "direction_x", "direction_y", "lifetime")
+
+    def __init__(self, count, width=800, height=600, start_shapes=5, spawn_delay=60, max_shapes=15,
+                 cooldown=20, level_score=500, nearest=8):
+        self.count = count
+        self.width = width
+        self.height = height
+        self.start_shapes = start_shapes
+        self.spawn_delay = spawn_delay
+        self.max_shapes = max_shapes
+        self.max_cooldown = cooldown
+        self.level_score = level_score
+        self.nearest = nearest
+        self.seeds = np.zeros(count, dtype=np.uint64)
+        self.x = np.zeros(count)
+        self.y = np.zeros(count)
+        self.cooldown = np.zeros(count, dtype=np.int64)
+        self.lives = np.zeros(count, dtype=np.int64)
+        self.score = np.zeros(count)
+        self.level = np.zeros(count, dtype=np.int64)
+        self.spawn_timer = np.zeros(count, dtype=np.int64)
+        self.done = np.zeros(count, dtype=bool)
+        self.spawned = np.zeros(count, dtype=np.int64)     # Сколько фигур копия уже создала (счётчик для хэша)
+        self.next_order = np.zeros(count, dtype=np.int64)  # Номер появления следующей фигуры или луча
+        self.shapes = Slots(count, max(16, start_shapes * 2), self.SHAPE_FIELDS)
+        # Больше лучей, чем выпускается за время жизни одного, быть не может
+        self.lasers = Slots(count, LASER_LIFETIME // max(1, cooldown) + 1, self.LASER_FIELDS)
+        self.reset(np.arange(count))
+
+    def reset(self, seeds, which=None):
+        """Новые игры с seeds у копий which (по умолчанию у всех); возвращает наблюдение"""
+        rows = np.arange(self.count) if which is None else np.asarray(which)
+        if rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+        self.seeds[rows] = seeds
+        self.x[rows] = self.width // 2
+        self.y[rows] = self.height // 2
+        self.cooldown[rows] = 0
+        self.lives[rows] = PLAYER_LIVES
+        self.score[rows] = 0
+        self.level[rows] = 1
+        self.spawn_timer[rows] = 0
+        self.done[rows] = False
+        self.spawned[rows] = 0
+        self.next_order[rows] = 0
+        self.shapes.alive[rows] = False
+        self.lasers.alive[rows] = False
+        for _ in range(self.start_shapes):
+            self._spawn(rows)
+        return self.observe()
+
+    def _take_order(self, rows):
+        order = self.next_order[rows]
+        self.next_order[rows] += 1
+        return order
+
+    def _spawn(self, rows):
+        """По новой фигуре в каждой из копий rows"""
+        if len(rows) == 0:
+            return
+        values = spawn_values(self.seeds[rows], self.spawned[rows], self.width, self.height)
+        self.spawned[rows] += 1
+        slots = self.shapes.allocate(rows)
+        for name, value in values.items():
+            self.shapes.arrays[name][rows, slots] = value
+        self.shapes.order[rows, slots] = self._take_order(rows)
+
+    def _shoot(self, rows, target_x, target_y):
+        """Player.shoot: луч от края игрока в сторону прицела (или вверх)"""
+        dx = target_x - self.x[rows]
+        dy = target_y - self.y[rows]
+        length = np.sqrt(dx**2 + dy**2)
+        aim = length > 0  # NaN (нет прицела) тоже даёт False
+        with np.errstate(divide="ignore", invalid="ignore"):
+            direction_x = np.where(aim, dx / length, 0.0)
+            direction_y = np.where(aim, dy / length, -1.0)
+        slots = self.lasers.allocate(rows)
+        a = self.lasers.arrays
+        a["x"][rows, slots] = self.x[rows] + direction_x * (PLAYER_RADIUS + 5)
+        a["y"][rows, slots] = self.y[rows] + direction_y * (PLAYER_RADIUS + 5)
+        a["direction_x"][rows, slots] = direction_x
+        a["direction_y"][rows, slots] = direction_y
+        a["lifetime"][rows, slots] = LASER_LIFETIME
+        self.lasers.order[rows, slots] = self._take_order(rows)
+        self.cooldown[rows] = self.max_cooldown
+
+    def step(self, actions):
+        """Один кадр всех копий: (наблюдение, награда, закончилась ли игра)"""
+        actions = np.asarray(actions, dtype=np.float64)
+        live = ~self.done
+        score_before = self.score.copy()
+
+        # Выстрел обрабатывается до обновления, как событие в Game.run
+        rows = np.flatnonzero(live & (actions[:, 2] > 0) & (self.cooldown <= 0))
+        if len(rows):
+            self._shoot(rows, actions[rows, 3], actions[rows, 4])
+
+        # Player.move: клавиши проверяются по очереди, каждая видит уже сдвинутую позицию
+        move_x, move_y = actions[:, 0], actions[:, 1]
+        self.x = np.where(live & (move_x < 0) & (self.x > PLAYER_RADIUS), self.x - PLAYER_SPEED, self.x)
+        self.x = np.where(live & (move_x > 0) & (self.x < self.width - PLAYER_RADIUS), self.x + PLAYER_SPEED, self.x)
+        self.y = np.where(live & (move_y < 0) & (self.y > PLAYER_RADIUS), self.y - PLAYER_SPEED, self.y)
+        self.y = np.where(live & (move_y > 0) & (self.y < self.height - PLAYER_RADIUS), self.y + PLAYER_SPEED, self.y)
+        self.cooldown -= live & (self.cooldown > 0)
+
+        # GeometricShape.move с отскоком от границ
+        shapes = self.shapes
+        s = shapes.arrays
+        moving = shapes.alive & live[:, None]
+        s["x"] += np.where(moving, s["speed_x"], 0.0)
+        s["y"] += np.where(moving, s["speed_y"], 0.0)
+        size = s["size"]
+        s["speed_x"][moving & ((s["x"] < size) | (s["x"] > self.width - size))] *= -1
+        s["speed_y"][moving & ((s["y"] < size) | (s["y"] > self.height - size))] *= -1
+
+        # Столкновения игрока с фигурами: каждая отнимает жизнь и заменяется новой
+        dx = self.x[:, None] - s["x"]
+        dy = self.y[:, None] - s["y"]
+        reach = PLAYER_RADIUS + size
+        hit = moving & (dx * dx + dy * dy < reach * reach)
+        hits = hit.sum(axis=1)
+        self.lives -= hits
+        shapes.alive[hit] = False
+        for replaced in range(hits.max(initial=0)):
+            self._spawn(np.flatnonzero(hits > replaced))
+        self.done |= live & (self.lives <= 0)
+
+        # Laser.move
+        lasers = self.lasers
+        a = lasers.arrays
+        flying = lasers.alive & live[:, None]
+        a["x"] += np.where(flying, a["direction_x"] * LASER_SPEED, 0.0)
+        a["y"] += np.where(flying, a["direction_y"] * LASER_SPEED, 0.0)
+        a["lifetime"] -= flying
+        gone = ((a["x"] < 0) | (a["x"] > self.width) | (a["y"] < 0) | (a["y"] > self.height) | (a["lifetime"] <= 0))
+        lasers.alive &= ~(flying & gone)
+        flying &= ~gone
+
+        # Лучи каждой копии по очереди появления: луч сбивает самую раннюю задетую фигуру,
+        # а новая фигура сразу доступна следующим лучам
+        ranks, counts = lasers.ranked(flying)
+        for rank in range(counts.max(initial=0)):
+            rows = np.flatnonzero(counts > rank)
+            slots = ranks[rows, rank]
+            s = shapes.arrays
+            dx = a["x"][rows, slots][:, None] - s["x"][rows]
+            dy = a["y"][rows, slots][:, None] - s["y"][rows]
+            size = s["size"][rows]
+            reach = LASER_RADIUS + np.where(s["kind"][rows] == 0, size, size * 1.2)
+            touching = shapes.alive[rows] & (dx * dx + dy * dy < reach * reach)
+            struck = touching.any(axis=1)
+            targets = np.where(touching, shapes.order[rows], _FAR).argmin(axis=1)[struck]
+            rows, slots = rows[struck], slots[struck]
+            shapes.alive[rows, targets] = False
+            lasers.alive[rows, slots] = False
+            self.score[rows] += HIT_SCORE
+            self._spawn(rows)
+
+        # Очки за время, уровень и появление фигур по таймеру
+        self.score[live] += FRAME_SCORE
+        rows = np.flatnonzero(live & (self.score > self.level * self.level_score))
+        self.level[rows] += 1
+        self._spawn(rows)
+        self._spawn(rows)
+        self.spawn_timer += live
+        due = live & (self.spawn_timer >= self.spawn_delay)
+        self.spawn_timer[due] = 0
+        self._spawn(np.flatnonzero(due & (shapes.alive.sum(axis=1) < self.max_shapes)))
+
+        return self.observe(), self.score - score_before, self.done.copy()
+
+    def observe(self):
+        """Игрок и nearest ближайших фигур каждой копии одним массивом float32"""
+        s = self.shapes.arrays
+        dx = s["x"] - self.x[:, None]
+        dy = s["y"] - self.y[:, None]
+        distance = np.where(self.shapes.alive, dx * dx + dy * dy, np.inf)
+        k = min(self.nearest, self.shapes.capacity)
+        rows = np.arange(self.count)[:, None]
+        closest = np.argsort(distance, axis=1, kind="stable")[:, :k]
+        shapes = np.zeros((self.count, self.nearest, 4), dtype=np.float32)
+        shapes[:, :k, 0] = self.shapes.alive[rows, closest]
+        shapes[:, :k, 1] = dx[rows, closest]
+        shapes[:, :k, 2] = dy[rows, closest]
+        shapes[:, :k, 3] = s["size"][rows, closest]
+        shapes[:, :k, 1:] *= shapes[:, :k, :1]  # У пустых мест всё по нулям
+        player = np.stack([self.x, self.y, self.lives, self.cooldown], axis=1).astype(np.float32)
+        return np.concatenate([player, shapes.reshape(self.count, -1)], axis=1)
+
+    def signature(self, i):
+        """Состояние копии i в виде Game.state_signature"""
+        s = self.shapes.arrays
+        a = self.lasers.arrays
+        shapes = np.flatnonzero(self.shapes.alive[i])
+        shapes = shapes[np.argsort(self.shapes.order[i, shapes])]
+        lasers = np.flatnonzero(self.lasers.alive[i])
+        lasers = lasers[np.argsort(self.lasers.order[i, lasers])]
+        return (int(self.level[i]), float(self.score[i]), int(self.lives[i]), bool(self.done[i]),
+                float(self.x[i]), float(self.y[i]), int(self.cooldown[i]),
+                [(float(s["x"][i, j]), float(s["y"][i, j]), int(s["size"][i, j]), SHAPE_TYPES[int(s["kind"][i, j])])
+                 for j in shapes],
+                [(float(a["x"][i, j]), float(a["y"][i, j])) for j in lasers])
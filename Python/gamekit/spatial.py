@@ -0,0 +1,277 @@
+"""Равномерная сетка (spatial hash) для быстрого поиска соседей.
+
+Каждый объект кладётся в одну клетку по своему центру. Запрос по точке
+смотрит только клетки, до которых может дотянуться самый большой объект,
+поэтому проверка N пуль против M целей стоит O(N * k), а не O(N * M).
+Удаление — O(1): объект знает своё место в клетке, на него переезжает
+последний объект клетки. Без заданного размера клетки rebuild подбирает его
+по самому большому радиусу объектов и запросов, так что запрос смотрит
+ровно 3 x 3 клетки.
+
+collide_circles проверяет сразу много точек (например, все лучи) против
+списка кругов одним расчётом NumPy, без сетки из словарей: объекты
+сортируются по номеру клетки, соседние клетки всех точек берутся из таблицы
+начал клеток, а точная проверка кругов идёт над всеми парами кандидатов
+разом, без вызова Python-функции на каждого кандидата. Без NumPy остаются
+query и first_hit.
+
+PlatformIndex — то же для неподвижных прямоугольников уровня: они
+разложены по классам ширины (степени четвёрки) и внутри класса
+отсортированы по левому краю. Запрос по горизонтальному отрезку делает в
+каждом классе бинарный поиск и отступает влево лишь на самую широкую
+платформу класса, а она не больше чем вчетверо шире любой другой в нём.
+Поэтому запрос стоит O(c * log n + k), где c — число классов (не больше
+log4 самой широкой платформы), а k — число найденных.
+"""
+import bisect
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BATCHED = np is not None  # Доступен ли collide_circles
+
+
+class SpatialHash:
+    """Сетка из квадратных клеток со стороной cell_size (None — подбирать в rebuild по радиусам)"""
+
+    def __init__(self, cell_size=64):
+        self.auto_cell = cell_size is None
+        self.cell_size = 64 if cell_size is None else cell_size
+        self.max_radius = 0
+        self._cells = {}
+        self._where = {}  # объект -> (клетка, место в клетке, x, y, радиус)
+        self._seq = 0
+
+    def _cell(self, x, y):
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def clear(self):
+        self._cells.clear()
+        self._where.clear()
+        self.max_radius = 0
+        self._seq = 0
+
+    def insert(self, obj, x, y, radius=0):
+        """Добавляет объект; radius — на сколько он выступает из своей клетки"""
+        cell = self._cell(x, y)
+        bucket = self._cells.setdefault(cell, [])
+        self._where[obj] = (cell, len(bucket), x, y, radius)
+        bucket.append((self._seq, obj))
+        self._seq += 1
+        if radius > self.max_radius:
+            self.max_radius = radius
+
+    def remove(self, obj):
+        """Убирает объект за O(1): на его место в клетке переезжает последний"""
+        cell, slot = self._where.pop(obj)[:2]
+        bucket = self._cells[cell]
+        last = bucket.pop()
+        if slot < len(bucket):
+            bucket[slot] = last
+            self._where[last[1]] = (cell, slot) + self._where[last[1]][2:]
+        elif not bucket:
+            del self._cells[cell]
+
+    def rebuild(self, objects, radius_of, query_radius=0):
+        """Раскладывает объекты заново; порядок вставки совпадает с порядком в списке.
+
+        Если размер клетки подбирается сам, он становится равен самому большому
+        радиусу объекта плюс query_radius — радиус, с которым потом будут запросы.
+        """
+        objects = [(obj, radius_of(obj)) for obj in objects]
+        self.clear()
+        self.max_radius = max((radius for _, radius in objects), default=0)
+        if self.auto_cell:
+            self.cell_size = max(1, math.ceil(self.max_radius + query_radius))
+        # То же, что insert для каждого объекта, но без вызова метода на объект: rebuild идёт каждый тик
+        size = self.cell_size
+        cells = self._cells
+        where = self._where
+        for seq, (obj, radius) in enumerate(objects):
+            x, y = obj.x, obj.y
+            cell = (int(x // size), int(y // size))
+            bucket = cells.get(cell)
+            if bucket is None:
+                bucket = cells[cell] = []
+            where[obj] = (cell, len(bucket), x, y, radius)
+            bucket.append((seq, obj))
+        self._seq = len(objects)
+
+    def snapshot(self):
+        """Копия раскладки для restore: вернуть её дешевле, чем вставить объекты заново"""
+        return ({cell: list(bucket) for cell, bucket in self._cells.items()},
+                dict(self._where), self.max_radius, self._seq)
+
+    def restore(self, state):
+        cells, where, self.max_radius, self._seq = state
+        self._cells = {cell: list(bucket) for cell, bucket in cells.items()}
+        self._where = dict(where)
+
+    def _nearby(self, x, y, radius):
+        reach = int(math.ceil((radius + self.max_radius) / self.cell_size))
+        cx, cy = self._cell(x, y)
+        cells = self._cells
+        for gx in range(cx - reach, cx + reach + 1):
+            for gy in range(cy - reach, cy + reach + 1):
+                bucket = cells.get((gx, gy))
+                if bucket:
+                    yield bucket
+
+    def query(self, x, y, radius=0):
+        """Кандидаты рядом с точкой в порядке вставки (точную проверку делает вызывающий)"""
+        found = []
+        for bucket in self._nearby(x, y, radius):
+            found.extend(bucket)
+        found.sort()  # Номера вставки уникальны, сами объекты не сравниваются
+        return [obj for _, obj in found]
+
+    def first_hit(self, x, y, radius, test):
+        """Самый ранний по порядку вставки объект рядом с точкой, для которого test(obj) истинно.
+
+        Даёт тот же результат, что и перебор списка с break на первом попадании.
+        """
+        best_seq = None
+        best = None
+        for bucket in self._nearby(x, y, radius):
+            for seq, obj in bucket:
+                if (best_seq is None or seq < best_seq) and test(obj):
+                    best_seq = seq
+                    best = obj
+        return best
+
+    def __contains__(self, obj):
+        return obj in self._where
+
+    def __iter__(self):
+        """Все объекты в порядке вставки"""
+        return iter(self._where)
+
+    def __len__(self):
+        return len(self._where)
+
+
+class BatchHits:
+    """Итог collide_circles: пары (точка, объект), отсортированные по точке, затем по месту объекта.
+
+    Объекты точки достаются лениво: обычно вызывающему нужен только первый ещё живой.
+    """
+
+    def __init__(self, objects, found, counts):
+        self._objects = objects
+        self._found = found
+        # Пары точки point лежат в found[bounds[point]:bounds[point + 1]]
+        self._bounds = [0] + np.cumsum(counts).tolist()
+
+    def objects(self, point):
+        """Объекты, которые задевает точка с номером point, в порядке списка объектов"""
+        if point + 1 >= len(self._bounds):
+            return
+        start, end = self._bounds[point], self._bounds[point + 1]
+        if start < end:
+            for index in self._found[start:end].tolist():
+                yield self._objects[index]
+
+    def __len__(self):
+        """Число пар"""
+        return len(self._found)
+
+
+BatchHits.EMPTY = BatchHits([], [], [])
+
+
+def collide_circles(objects, ox, oy, oradius, xs, ys, radii):
+    """Какие объекты задевает каждая точка: круг точки (xs[j], ys[j], radii[j]) пересекает
+    круг объекта objects[i] с центром (ox[i], oy[i]) и радиусом oradius[i].
+
+    Одним расчётом NumPy, без вызова Python-функции на каждого кандидата.
+    Возвращает BatchHits: объекты каждой точки идут в порядке списка objects.
+    """
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    radii = np.broadcast_to(np.asarray(radii, dtype=float), xs.shape)
+    if not len(objects) or not len(xs):
+        return BatchHits.EMPTY
+    ox = np.asarray(ox, dtype=float)
+    oy = np.asarray(oy, dtype=float)
+    oradius = np.asarray(oradius, dtype=float)
+
+    # Клетка со стороной в самый большой радиус объекта плюс точки: каждой точке хватает 3 x 3 клеток.
+    # Объекты переставляются по возрастанию номера клетки; в одной клетке — по порядку списка
+    size = max(1, math.ceil(oradius.max() + radii.max()))
+    cx = np.floor(ox / size).astype(np.int64)
+    cy = np.floor(oy / size).astype(np.int64)
+    left, top = cx.min(), cy.min()
+    width, height = cx.max() - left + 1, cy.max() - top + 1
+    keys = (cx - left) * height + (cy - top)
+    order = np.argsort(keys, kind="stable")
+    ox, oy, oradius = ox[order], oy[order], oradius[order]
+    counts = np.bincount(keys, minlength=width * height)
+    starts = np.cumsum(counts) - counts  # Клетка key — это объекты starts[key] ... starts[key] + counts[key] - 1
+
+    # Соседние клетки всех точек разом: строка на точку, столбец на сдвиг
+    shifts = np.arange(-1, 2)
+    gx = (np.floor(xs / size).astype(np.int64) - left)[:, None, None] + shifts[None, :, None]
+    gy = (np.floor(ys / size).astype(np.int64) - top)[:, None, None] + shifts[None, None, :]
+    inside = ((gx >= 0) & (gx < width) & (gy >= 0) & (gy < height)).reshape(len(xs), -1)
+    cell = np.where(inside, (gx * height + gy).reshape(len(xs), -1), 0)
+    count = np.where(inside, counts[cell], 0).ravel()
+    total = int(count.sum())
+    if not total:
+        return BatchHits.EMPTY
+    # Номера объектов подряд для каждой клетки: start, start + 1, ... start + count - 1
+    points = np.repeat(np.arange(len(xs)), count.reshape(len(xs), -1).sum(axis=1))
+    found = np.repeat(starts[cell].ravel() - np.cumsum(count) + count, count)
+    found += np.arange(total)
+
+    # Точная проверка теми же действиями, что и у вызывающего: dx² + dy² < (r + R)²
+    dx = xs[points]
+    dx -= ox[found]
+    dx *= dx
+    dy = ys[points]
+    dy -= oy[found]
+    dy *= dy
+    dx += dy
+    limit = radii[points]
+    limit += oradius[found]
+    limit *= limit
+    hit = dx < limit
+    # Пары уже идут по точкам; внутри точки упорядочиваем по месту в objects одним ключом
+    pairs = np.sort(points[hit] * len(objects) + order[found[hit]])
+    return BatchHits(objects, pairs % len(objects), np.bincount(pairs // len(objects), minlength=len(xs)))
+
+
+class PlatformIndex:
+    """Прямоугольники (x, y, w, h), отсортированные по x, для запросов по полосе [left, right)"""
+
+    def __init__(self, rects):
+        self.rects = sorted(rects, key=lambda rect: rect[0])
+        groups = {}
+        for number, rect in enumerate(self.rects):
+            groups.setdefault(max(0, int(rect[2])).bit_length() // 2, []).append(number)
+        # Класс ширины [4^(k-1), 4^k): (самая широкая в классе, левые края, номера в rects).
+        # Платформа, начавшаяся левее полосы, может дотянуться до неё не дальше самой широкой
+        # в своём классе, поэтому одна очень широкая платформа не расширяет поиск для остальных
+        self._classes = [(max(self.rects[number][2] for number in numbers),
+                          [self.rects[number][0] for number in numbers], numbers)
+                         for numbers in groups.values()]
+
+    def overlapping(self, left, right):
+        """Прямоугольники, которые по горизонтали пересекают отрезок (left, right), по возрастанию x"""
+        rects = self.rects
+        found = []
+        for max_width, lefts, numbers in self._classes:
+            start = bisect.bisect_right(lefts, left - max_width)
+            end = bisect.bisect_left(lefts, right)
+            found.extend(number for number in numbers[start:end] if rects[number][0] + rects[number][2] > left)
+        if len(self._classes) > 1:
+            found.sort()  # Номера в rects — тот же порядок, что и при одном общем списке
+        return [rects[number] for number in found]
+
+    def __iter__(self):
+        return iter(self.rects)
+
+    def __len__(self):
+        return len(self.rects)
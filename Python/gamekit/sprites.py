@@ -0,0 +1,152 @@
+"""Кэш заранее нарисованных повёрнутых спрайтов.
+
+Вместо того чтобы каждый кадр считать синусы вершин и растеризовать
+многоугольник, спрайт для (ключ, угол) рисуется один раз, а угол
+округляется до шага step градусов. Память ограничена: при превышении
+бюджета выкидываются давно не использованные кадры. Кадры можно нарисовать
+заранее (bake) с ограничением по времени, остальные дорисуются по запросу.
+
+Если бюджет меньше рабочего набора, LRU начинает гонять одни и те же кадры
+по кругу, и кэш становится медленнее точной отрисовки. lookup следит за
+долей вытеснений: при превышении max_eviction_rate он перестаёт рисовать
+новые кадры и отдаёт только уже готовые (иначе None — рисует вызывающий),
+а через retry_windows окон пробует кэшировать снова.
+
+Кадр — поверхность или пара (поверхность, сдвиг) от trim: прозрачные поля
+обрезаны, а сдвиг говорит, куда переехал левый верхний угол.
+"""
+import time
+from collections import OrderedDict
+
+
+class RotationAtlas:
+    """Повёрнутые кадры по ключу; render(key, angle) рисует кадр при промахе"""
+
+    def __init__(self, render, step=3, budget_bytes=16 * 1024 * 1024,
+                 max_eviction_rate=None, window=1000, retry_windows=30):
+        self.render = render
+        self.step = step
+        self.budget_bytes = budget_bytes
+        self.max_eviction_rate = max_eviction_rate  # None — всегда кэшировать
+        self.window = window  # Запросов в окне, по которому считается доля вытеснений
+        self.retry_windows = retry_windows
+        self.memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bypassed = 0  # Запросов, отданных на точную отрисовку
+        self.bypassing = False
+        self._window_lookups = 0
+        self._window_evictions = 0
+        self._bypass_windows = 0
+        self._frames = OrderedDict()
+
+    def frame_index(self, angle, period=360):
+        """Номер ближайшего кадра; period — угол симметрии фигуры (90 для квадрата)"""
+        frames = max(1, round(period / self.step))
+        return round(angle / self.step) % frames
+
+    def get(self, key, angle, period=360):
+        index = self.frame_index(angle, period)
+        frame_key = (key, index)
+        surface = self._frames.get(frame_key)
+        if surface is not None:
+            self._frames.move_to_end(frame_key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.render(key, index * self.step)
+        self._frames[frame_key] = surface
+        self.memory_bytes += frame_bytes(surface)
+        while self.memory_bytes > self.budget_bytes and len(self._frames) > 1:
+            _, old = self._frames.popitem(last=False)
+            self.memory_bytes -= frame_bytes(old)
+            self.evictions += 1
+        return surface
+
+    def lookup(self, key, angle, period=360):
+        """Как get, но при постоянных вытеснениях возвращает None для кадров, которых нет в кэше"""
+        if self.max_eviction_rate is None:
+            return self.get(key, angle, period)
+        self._window_lookups += 1
+        if self._window_lookups >= self.window:
+            self._end_window()
+        if not self.bypassing:
+            return self.get(key, angle, period)
+        surface = self._frames.get((key, self.frame_index(angle, period)))
+        if surface is None:
+            self.bypassed += 1
+        else:
+            self.hits += 1
+        return surface
+
+    def _end_window(self):
+        if self.bypassing:
+            self._bypass_windows -= 1
+            self.bypassing = self._bypass_windows > 0
+        elif self.evictions - self._window_evictions > self.max_eviction_rate * self._window_lookups:
+            self.bypassing = True
+            self._bypass_windows = self.retry_windows
+        self._window_lookups = 0
+        self._window_evictions = self.evictions
+
+    def bake(self, frames, seconds=None):
+        """Заранее рисует кадры из frames — пар (ключ, угол) или троек (ключ, угол, период).
+
+        Останавливается, когда прошло seconds секунд (None — без ограничения);
+        возвращает, сколько кадров нарисовано.
+        """
+        deadline = None if seconds is None else time.perf_counter() + seconds
+        baked = 0
+        for frame in frames:
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            misses = self.misses
+            self.get(*frame)
+            baked += self.misses - misses
+        return baked
+
+    def clear(self):
+        self._frames.clear()
+        self.memory_bytes = 0
+        self.bypassing = False
+        self._window_lookups = 0
+        self._window_evictions = self.evictions
+
+    def stats(self):
+        return {
+            "frames": len(self._frames),
+            "memory_kb": self.memory_bytes // 1024,
+            "budget_kb": self.budget_bytes // 1024,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "bypassed": self.bypassed,
+        }
+
+    def summary(self, name="спрайты"):
+        stats = self.stats()
+        text = (f"Кэш {name}: кадров {stats['frames']}, {stats['memory_kb']} КБ из {stats['budget_kb']} КБ, "
+                f"попаданий {stats['hits']}, промахов {stats['misses']}, вытеснений {stats['evictions']}")
+        if stats["bypassed"]:
+            text += f", нарисовано без кэша {stats['bypassed']}"
+        return text
+
+    def __len__(self):
+        return len(self._frames)
+
+
+def surface_bytes(surface):
+    """Сколько байт пикселей занимает поверхность"""
+    return surface.get_pitch() * surface.get_height()
+
+
+def frame_bytes(frame):
+    return surface_bytes(frame[0] if isinstance(frame, tuple) else frame)
+
+
+def trim(surface):
+    """Обрезает прозрачные поля: (поверхность, сдвиг её левого верхнего угла)"""
+    rect = surface.get_bounding_rect()
+    return surface.subsurface(rect).copy(), rect.topleft
@@ -0,0 +1,185 @@
+"""Звёздное небо и туманности для фона.
+
+Звёзды лежат в массивах NumPy: мерцание всех звёзд считается одной
+векторной операцией, а рисование — одна запись в пиксели экрана через
+pygame.surfarray (без вызова pygame.draw.circle на каждую звезду). Какие
+пиксели закрашивает звезда, считается один раз: pygame.draw.circle
+обрезает дробный радиус до целого, и звезда выглядит так же, как
+нарисованная кругом. Без NumPy звёзды рисуются кругами по одной.
+
+Туманности — полупрозрачные круги нескольких заранее нарисованных радиусов
+вместо новой поверхности SRCALPHA на каждом кадре.
+"""
+import math
+import random
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DIRTY_STAR_LIMIT = 2000  # Больше звёзд — отдаём один прямоугольник на всё небо
+
+
+class StarField:
+    """count звёзд в окне width x height; случайные числа берутся так же, как в прежнем create_stars"""
+
+    def __init__(self, count, width, height, rng=random):
+        self.count = count
+        self.width = width
+        self.height = height
+        stars = [(rng.randint(0, width), rng.randint(0, height), rng.uniform(0.5, 2),
+                  rng.randint(150, 255), rng.uniform(0.01, 0.05)) for _ in range(count)]
+        x, y, size, brightness, speed = zip(*stars) if stars else ((),) * 5
+        if np is not None:
+            self.x = np.array(x, dtype=np.int64)
+            self.y = np.array(y, dtype=np.int64)
+            self.radius = np.array(size).astype(np.int64)  # Как у pygame.draw.circle
+            self.brightness = np.array(brightness, dtype=np.int64)
+            self.speed = np.array(speed)
+            self.phase = np.zeros(count)
+        else:
+            self.x, self.y = list(x), list(y)
+            self.radius = [int(value) for value in size]
+            self.brightness, self.speed = list(brightness), list(speed)
+            self.phase = [0.0] * count
+        self._stamp_cache = None  # (размер поверхности, (x, y) пикселей, их номера по строкам, номер звезды)
+        self._palettes = {}       # формат поверхности -> цвет пикселя для яркости 0..255
+        self._rects = None
+
+    def update(self):
+        """Мерцание: фаза растёт, яркость 150 +- 50 по синусу"""
+        if np is not None:
+            self.phase += self.speed
+            self.brightness = 150 + (np.sin(self.phase) * 50).astype(np.int64)
+            return
+        for i in range(self.count):
+            self.phase[i] += self.speed[i]
+            self.brightness[i] = 150 + int(math.sin(self.phase[i]) * 50)
+
+    def _stamps(self, size):
+        """Пиксели всех звёзд в пределах поверхности; при наложении побеждает звезда, нарисованная позже"""
+        if self._stamp_cache is not None and self._stamp_cache[0] == size:
+            return self._stamp_cache[1:]
+        width, height = size
+        xs, ys, owners = [], [], []
+        for radius in np.unique(self.radius).tolist():
+            if radius <= 0:
+                continue
+            stars = np.flatnonzero(self.radius == radius)
+            for dx, dy in circle_offsets(radius):
+                xs.append(self.x[stars] + dx)
+                ys.append(self.y[stars] + dy)
+                owners.append(stars)
+        if xs:
+            xs, ys, owners = np.concatenate(xs), np.concatenate(ys), np.concatenate(owners)
+        else:
+            xs = ys = owners = np.zeros(0, dtype=np.int64)
+        inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+        xs, ys, owners = xs[inside], ys[inside], owners[inside]
+        # Звёзды рисовались по порядку, поэтому для общего пикселя берётся звезда с большим номером.
+        # Пиксели идут по строкам экрана: запись по возрастающим адресам памяти намного быстрее
+        pixel = ys * width + xs
+        order = np.lexsort((owners, pixel))
+        last = np.ones(len(order), dtype=bool)
+        last[:-1] = pixel[order][1:] != pixel[order][:-1]
+        order = order[last]
+        self._stamp_cache = (size, (xs[order], ys[order]), pixel[order], owners[order])
+        return self._stamp_cache[1:]
+
+    def _palette(self, surface):
+        key = (surface.get_bitsize(), surface.get_masks())
+        palette = self._palettes.get(key)
+        if palette is None:
+            palette = np.array([surface.map_rgb((level, level, level)) for level in range(256)], dtype=np.uint32)
+            self._palettes[key] = palette
+        return palette
+
+    def draw(self, surface):
+        """Рисует звёзды; возвращает прямоугольники для грязного вывода"""
+        if np is None or surface.get_bytesize() not in (1, 2, 4):
+            for i in range(self.count):
+                level = int(self.brightness[i])
+                pygame.draw.circle(surface, (level, level, level), (int(self.x[i]), int(self.y[i])),
+                                   float(self.radius[i]))
+        else:
+            where, flat, owners = self._stamps(surface.get_size())
+            colors = self._palette(surface)[self.brightness[owners]]
+            pixels = pygame.surfarray.pixels2d(surface)
+            rows = pixels.T
+            if rows.flags.c_contiguous:
+                rows.reshape(-1)[flat] = colors  # Строки лежат в памяти подряд, без отступов
+            else:
+                pixels[where] = colors
+            del pixels, rows  # Снимает блокировку поверхности
+        return self.rects(surface.get_rect())
+
+    def rects(self, bounds):
+        """Прямоугольники звёзд (как у pygame.draw.circle); для очень большого неба — одно окно целиком"""
+        if self.count > DIRTY_STAR_LIMIT:
+            return [bounds]
+        if self._rects is None:
+            self._rects = []
+            for x, y, radius in zip(self.x, self.y, self.radius):
+                x, y, radius = int(x), int(y), int(radius)
+                if radius > 0:
+                    self._rects.append(pygame.Rect(x - radius, y - radius, radius * 2, radius * 2).clip(bounds))
+        return self._rects
+
+    def __len__(self):
+        return self.count
+
+
+_circle_offsets = {}
+
+
+def circle_offsets(radius):
+    """Сдвиги пикселей круга радиуса radius от центра — ровно те, что закрашивает pygame.draw.circle"""
+    offsets = _circle_offsets.get(radius)
+    if offsets is None:
+        side = radius * 2 + 3
+        probe = pygame.Surface((side, side))
+        probe.fill((0, 0, 0))
+        center = radius + 1
+        pygame.draw.circle(probe, (255, 255, 255), (center, center), radius)
+        offsets = [(x - center, y - center) for x in range(side) for y in range(side)
+                   if probe.get_at((x, y))[0]]
+        _circle_offsets[radius] = offsets
+    return offsets
+
+
+class NebulaSprites:
+    """Полупрозрачные круги туманности; радиус округляется до шага step"""
+
+    def __init__(self, step=10, alpha=30):
+        self.step = step
+        self.alpha = alpha
+        self._sprites = {}
+
+    def radius(self, radius):
+        return max(self.step, int(round(radius / self.step)) * self.step)
+
+    def get(self, radius, color):
+        """Готовый круг ближайшего радиуса и сам этот радиус"""
+        radius = self.radius(radius)
+        key = (radius, color)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            # Постоянная прозрачность всей поверхности вместо попиксельной: копируется быстрее
+            sprite = pygame.Surface((radius * 2, radius * 2))
+            sprite.fill((0, 0, 0))
+            pygame.draw.circle(sprite, color, (radius, radius), radius)
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert()
+            sprite.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+            sprite.set_alpha(self.alpha, pygame.RLEACCEL)
+            self._sprites[key] = sprite
+        return sprite, radius
+
+    def memory_bytes(self):
+        return sum(sprite.get_pitch() * sprite.get_height() for sprite in self._sprites.values())
+
+    def __len__(self):
+        return len(self._sprites)
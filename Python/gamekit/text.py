@@ -0,0 +1,97 @@
+"""Кэш шрифтов и готовых надписей.
+
+pygame.font.SysFont ищет шрифт в системе при каждом вызове, поэтому шрифт
+каждого размера создаётся один раз, а отрендеренные надписи хранятся
+в LRU-кэше по ключу (текст, размер, цвет).
+"""
+from collections import OrderedDict
+
+import pygame
+
+
+class FontRegistry:
+    """Шрифты по размеру: каждый размер загружается только один раз"""
+
+    def __init__(self, name=None):
+        self.name = name
+        self._fonts = {}
+
+    def get(self, size):
+        """Возвращает шрифт нужного размера, создавая его при первом запросе"""
+        font = self._fonts.get(size)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            if self.name is None:
+                # Шрифт по умолчанию: SysFont при первом вызове опрашивает все шрифты системы
+                font = pygame.font.Font(None, size)
+            else:
+                font = pygame.font.SysFont(self.name, size)
+            self._fonts[size] = font
+        return font
+
+    def __len__(self):
+        return len(self._fonts)
+
+
+class TextCache:
+    """LRU-кэш поверхностей с текстом по ключу (текст, размер, цвет)"""
+
+    def __init__(self, fonts=None, max_items=256):
+        self.fonts = fonts if fonts is not None else FontRegistry()
+        self.max_items = max_items
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, size, color):
+        """Возвращает готовую поверхность, рендеря текст только при промахе"""
+        key = (text, size, tuple(color))
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.fonts.get(size).render(text, True, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_items:
+            self._surfaces.popitem(last=False)  # Выкидываем самую старую надпись
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def __len__(self):
+        return len(self._surfaces)
+
+
+class TextLabel:
+    """Строка HUD по шаблону вида "Счет: {}", которая перерисовывается только при смене значений или цвета.
+
+    Меняющиеся числа рендерятся мимо LRU-кэша, чтобы не вытеснять
+    из него постоянные надписи. font — готовый шрифт pygame (например,
+    FontRegistry.get(size)).
+    """
+
+    def __init__(self, font, template, color, pos=(0, 0)):
+        self.font = font
+        self.template = template
+        self.color = color
+        self.pos = pos
+        self.renders = 0
+        self._key = None
+        self._surface = None
+
+    def get_surface(self, *values, color=None):
+        color = color or self.color
+        key = (values, color)
+        if key != self._key:
+            self._surface = self.font.render(self.template.format(*values), True, color)
+            self._key = key
+            self.renders += 1
+        return self._surface
+
+    def draw(self, surface, *values, color=None):
+        return surface.blit(self.get_surface(*values, color=color), self.pos)
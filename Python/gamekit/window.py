@@ -0,0 +1,27 @@
+"""Запуск pygame только с теми модулями, которые нужны играм.
+
+pygame.init() поднимает все подсистемы сразу, в том числе звук и
+джойстики, которыми игры не пользуются (звуковое устройство открывается
+дольше всего остального). Игры открывают окно в своей точке входа, а не
+при импорте, поэтому их классы и функции можно импортировать из
+инструментов и бенчмарков без окна.
+"""
+import pygame
+
+
+def init_modules():
+    """Видео (окно, события, клавиатура) и шрифты; повторный вызов ничего не делает"""
+    if not pygame.display.get_init():
+        pygame.display.init()
+    if not pygame.font.get_init():
+        pygame.font.init()
+
+
+def open_window(size, title):
+    """Окно игры размера size; если окно уже открыто с тем же размером, возвращается оно"""
+    init_modules()
+    screen = pygame.display.get_surface()
+    if screen is None or screen.get_size() != tuple(size):
+        screen = pygame.display.set_mode(size)
+    pygame.display.set_caption(title)
+    return screen
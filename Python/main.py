@@ -1,17 +1,36 @@
 import pygame
+import os
 import sys
-# Инициализация PyGame
-pygame.init()
+
+from gamekit.camera import Camera
+from gamekit.dirty import DirtyRenderer
+from gamekit.items import ItemStore
+from gamekit.layers import LayeredRenderer
+from gamekit.levels import ChunkStreamer, LevelFile, pack_level
+from gamekit.loop import FixedStepLoop, lerp
+from gamekit.profiler import FrameProfiler
+from gamekit.replay import Recorder
+from gamekit.spatial import PlatformIndex
+from gamekit.text import FontRegistry, TextCache, TextLabel
+from gamekit.window import open_window
 
 # Константы
 WIDTH, HEIGHT = 800, 600
-FPS = 60
+TICK_RATE = 60  # Шагов игры в секунду (скорости и гравитация заданы на один шаг)
+MAX_FPS = 60  # Предел частоты кадров; None — без ограничения (игрок интерполируется между шагами)
 WHITE = (255, 255, 255)
 BLUE = (0, 120, 255)
 GREEN = (0, 180, 0)
 RED = (255, 50, 50)
 YELLOW = (255, 255, 0)
 PURPLE = (180, 0, 180)
+BACKGROUND = (30, 30, 50)  # Темно-синий фон
+DIRTY_RECTS = True  # Обновлять на экране только изменившиеся прямоугольники
+LOG_PICKUPS = True  # Печатать в консоль каждый собранный предмет
+RECORDED_KEYS = (pygame.K_LEFT, pygame.K_a, pygame.K_RIGHT, pygame.K_d)  # Клавиши для записи сессии
+LEVEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "levels")  # Файлы levelN.gklv
+STREAM_RADIUS = 1000  # Куски уровня ближе этого расстояния до игрока держатся в памяти
+ITEM_CELL = 64  # Клетка сетки предметов (отсечение камерой и сбор)
 
 # ========================================
 
@@ -87,21 +106,44 @@ def handle_item_collection(item_type, player):
     player.collected_items.append(item_type)
 
     # Можно добавить звуковые эффекты (заглушка)
-    print(f"Собран: {item_type}! Счет: {player.score}")
+    if LOG_PICKUPS:
+        print(f"Собран: {item_type}! Счет: {player.score}")
+
+
+def level_numbers():
+    """Номера уровней: из словаря LEVELS и из файлов в папке levels"""
+    numbers = set(LEVELS)
+    if os.path.isdir(LEVEL_DIR):
+        for name in os.listdir(LEVEL_DIR):
+            if name.startswith("level") and name.endswith(".gklv") and name[5:-5].isdigit():
+                numbers.add(int(name[5:-5]))
+    return sorted(numbers)
+
+
+def open_level(number):
+    """Файл levels/levelN.gklv (читается только оглавление), а если его нет — уровень из LEVELS"""
+    path = os.path.join(LEVEL_DIR, f"level{number}.gklv")
+    if os.path.exists(path):
+        return LevelFile.open(path)
+    return LevelFile(pack_level(LEVELS[number], (WIDTH, HEIGHT)))
 
 
 # ========================================
 
-# Создание окна
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Python Dictionary Platformer")
-clock = pygame.time.Clock()
+# Окно создаётся в create_window (при запуске игры), а не при импорте
+screen = None
+
+
+def create_window():
+    global screen
+    screen = open_window((WIDTH, HEIGHT), "Python Dictionary Platformer")
+    return screen
 
 
 class Player:
     def __init__(self, x, y):
-        self.x = x
-        self.y = y
+        self.x = self.prev_x = x
+        self.y = self.prev_y = y  # prev_* — позиция до последнего шага (для интерполяции)
         self.width = 40
         self.height = 60
         self.vel_y = 0
@@ -110,38 +152,49 @@ class Player:
         self.on_ground = False
         self.score = 0
         self.collected_items = []
+        self.bounds = (WIDTH, HEIGHT)  # Размер мира (уровень может быть больше экрана)
 
-    def draw(self):
-        pygame.draw.rect(screen, BLUE, (self.x, self.y, self.width, self.height))
-        pygame.draw.circle(screen, WHITE, (self.x + 10, self.y + 15), 5)
-        pygame.draw.circle(screen, WHITE, (self.x + 30, self.y + 15), 5)
+    def draw(self, camera, alpha=1.0):
+        x, y = camera.to_screen(lerp(self.prev_x, self.x, alpha), lerp(self.prev_y, self.y, alpha))
+        rect = pygame.draw.rect(screen, BLUE, (x, y, self.width, self.height))
+        pygame.draw.circle(screen, WHITE, (x + 10, y + 15), 5)
+        pygame.draw.circle(screen, WHITE, (x + 30, y + 15), 5)
+        return rect
 
-    def update(self, platforms):
+    def update(self, platform_index):
         # Гравитация
         self.vel_y += 0.8
+        previous_bottom = self.y + self.height
         self.y += self.vel_y
+        bottom = self.y + self.height
 
-        # Проверка платформ
+        # Проверка платформ: за кадр ноги прошли весь путь от previous_bottom до bottom,
+        # поэтому при большой скорости падения игрок не пролетает платформу насквозь.
+        # Из индекса берутся только платформы над и под игроком
         self.on_ground = False
-        for platform in platforms:
-            if (self.x + self.width > platform[0] and
-                    self.x < platform[0] + platform[2] and
-                    self.y + self.height > platform[1] and
-                    self.y + self.height < platform[1] + 20):
-                self.y = platform[1] - self.height
-                self.vel_y = 0
-                self.on_ground = True
-
-        # Границы экрана
-        if self.y > HEIGHT - self.height:
-            self.y = HEIGHT - self.height
+        swept_top = min(previous_bottom, bottom)
+        landing = None
+        for platform in platform_index.overlapping(self.x, self.x + self.width):
+            if bottom > platform[1] and swept_top < platform[1] + 20:
+                # Из нескольких пересечённых платформ ноги первой встретили самую верхнюю
+                if landing is None or platform[1] < landing[1]:
+                    landing = platform
+        if landing is not None:
+            self.y = landing[1] - self.height
+            self.vel_y = 0
+            self.on_ground = True
+
+        # Границы мира
+        world_width, world_height = self.bounds
+        if self.y > world_height - self.height:
+            self.y = world_height - self.height
             self.vel_y = 0
             self.on_ground = True
 
         if self.x < 0:
             self.x = 0
-        if self.x > WIDTH - self.width:
-            self.x = WIDTH - self.width
+        if self.x > world_width - self.width:
+            self.x = world_width - self.width
 
     def jump(self):
         if self.on_ground:
@@ -155,124 +208,271 @@ class Player:
 
 
 class Item:
-    def __init__(self, x, y, item_type):
+    def __init__(self, x, y, item_type, number=None):
         self.x = x
         self.y = y
         self.type = item_type
+        self.number = number  # Номер предмета в уровне
         self.width = 30
         self.height = 30
+        # Предмет не двигается, поэтому прямоугольник создаётся один раз
+        self.rect = pygame.Rect(x, y, self.width, self.height)
 
-    def draw(self):
+    def draw(self, camera):
         # Цвет предмета определяется в словаре ITEM_COLORS
         color = ITEM_COLORS.get(self.type, WHITE)
-        pygame.draw.rect(screen, color, (self.x, self.y, self.width, self.height))
+        x, y = camera.to_screen(self.x, self.y)
+        rect = pygame.draw.rect(screen, color, (x, y, self.width, self.height))
 
         # Специальные эффекты для разных типов
         if self.type == "bonus":
-            pygame.draw.circle(screen, YELLOW, (self.x + 15, self.y + 15), 10)
+            pygame.draw.circle(screen, YELLOW, (x + 15, y + 15), 10)
         elif self.type == "key":
-            pygame.draw.rect(screen, WHITE, (self.x + 10, self.y + 5, 10, 20))
-            pygame.draw.circle(screen, WHITE, (self.x + 15, self.y + 10), 8)
+            pygame.draw.rect(screen, WHITE, (x + 10, y + 5, 10, 20))
+            pygame.draw.circle(screen, WHITE, (x + 15, y + 10), 8)
+        return rect
 
     def get_rect(self):
-        return pygame.Rect(self.x, self.y, self.width, self.height)
+        return self.rect
 
 
 
+# Шрифты создаются один раз на размер, готовые надписи берутся из кэша
+fonts = FontRegistry()
+text_cache = TextCache(fonts)
+
+
 def draw_text(text, size, color, x, y):
-    font = pygame.font.SysFont(None, size)
-    render = font.render(text, True, color)
-    screen.blit(render, (x, y))
+    render = text_cache.render(text, size, color)
+    return screen.blit(render, (x, y))
 
 
-def main():
-    current_level = 1
-    level_data = LEVELS[current_level]
-
-    player = Player(*level_data["start_pos"])
-
-    # Создаем платформы
-    platforms = level_data["platforms"]
-
-    # Создаем предметы из словаря уровня
-    items = []
-    for item_data in level_data["items"]:
-        items.append(Item(item_data["x"], item_data["y"], item_data["type"]))
-
-    running = True
-
-    while running:
-        screen.fill((30, 30, 50))  # Темно-синий фон
-
-        # Обработка событий
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    player.jump()
-                if event.key == pygame.K_r:
-                    # Рестарт уровня
-                    player = Player(*level_data["start_pos"])
-                    items = []
-                    for item_data in level_data["items"]:
-                        items.append(Item(item_data["x"], item_data["y"], item_data["type"]))
-                if event.key == pygame.K_n:
-                    # Следующий уровень
-                    current_level = current_level + 1 if current_level + 1 in LEVELS else 1
-                    level_data = LEVELS[current_level]
-                    platforms = level_data["platforms"]
-                    player = Player(*level_data["start_pos"])
-                    items = []
-                    for item_data in level_data["items"]:
-                        items.append(Item(item_data["x"], item_data["y"], item_data["type"]))
+def create_hud():
+    """Строки HUD перерисовываются только когда меняется их значение"""
+    return {
+        "level": TextLabel(fonts.get(36), "Уровень: {}", WHITE, (20, 20)),
+        "score": TextLabel(fonts.get(36), "Счет: {}", WHITE, (20, 60)),
+        "collected": TextLabel(fonts.get(36), "Собрано предметов: {}", WHITE, (20, 100)),
+    }
+
+
+# Класс игры: уровень, игрок и предметы; обновление и отрисовка одного кадра
+class Platformer:
+    def __init__(self, level=1, profiler=None, headless=False):
+        # Без окна (headless) игра только считает: окно не открывается
+        self.headless = headless
+        if not headless:
+            create_window()
+        self.hud = None if headless else create_hud()  # Шрифты нужны только для отрисовки
+        self.profiler = profiler or FrameProfiler()  # Время фаз кадра (по умолчанию выключен)
+        # Фон вместе с платформами: пересобирается, только когда сдвинулась камера
+        # или поменялся набор загруженных кусков
+        self.background = LayeredRenderer([self.paint_level])
+        self.renderer = DirtyRenderer(self.background, DIRTY_RECTS)
+        self.running = True
+        self.load_level(level)
+
+    def load_level(self, number):
+        """Открывает уровень; платформы и предметы догружаются кусками рядом с игроком"""
+        self.current_level = number
+        self.level = open_level(number)
+        self.streamer = ChunkStreamer(self.level, STREAM_RADIUS)
+        self.item_objects = {}  # Номер -> Item: объекты предметов создаются один раз на уровень
+        self.items = ItemStore(ITEM_CELL)
+        self.items_template = None  # (версия набора кусков, раскладка всех их предметов)
+        self.camera = Camera((WIDTH, HEIGHT), self.level.size)
+        self.restart()
+
+    def restart(self):
+        """Рестарт уровня: игрок на старте, все предметы на месте"""
+        self.player = Player(*self.level.start_pos)
+        self.player.bounds = self.level.size
+        self.collected = set()  # Номера собранных предметов (переживают выгрузку куска)
+        # Куски не перечитываются: если старт рядом, предметы вернутся из шаблона
+        self.stream_chunks(force=True)
+
+    def stream_chunks(self, force=False):
+        """Догружает куски у игрока; если набор изменился — пересобирает платформы, предметы и фон"""
+        if not (self.streamer.update(self.player.x, self.player.y) or force):
+            return
+        self.platforms = self.streamer.platforms()
+        self.platform_index = PlatformIndex(self.platforms)  # Платформы по x для поиска приземления
+        # Предметы загруженных кусков раскладываются в ItemStore (сетка нужна и для сбора,
+        # и для отсечения камерой) один раз на набор кусков, дальше берутся из шаблона
+        version = self.streamer.version
+        if self.items_template is None or self.items_template[0] != version:
+            self.items.reset(self.level_item(*entry) for entry in self.streamer.items())
+            self.items_template = (version, self.items.snapshot())
+        else:
+            self.items.restore(self.items_template[1])
+        for number in self.collected:
+            item = self.item_objects[number]
+            if item in self.items:
+                self.items.remove(item)
+        self.background.invalidate()
+        self.renderer.invalidate()
+
+    def level_item(self, number, x, y, item_type):
+        """Item с этим номером; создаётся при первой загрузке его куска и дальше переиспользуется"""
+        item = self.item_objects.get(number)
+        if item is None:
+            item = self.item_objects[number] = Item(x, y, item_type, number)
+        return item
+
+    def paint_level(self, surface):
+        """Слой фона: заливка и платформы, попавшие в окно камеры"""
+        surface.fill(BACKGROUND)
+        visible = self.camera.visible_platforms(self.platform_index)
+        for x, y, width, height in visible:
+            pygame.draw.rect(surface, GREEN, (x - self.camera.x, y - self.camera.y, width, height))
+        self.camera.count("платформы", len(visible), len(self.platforms))
+
+    @property
+    def items_left(self):
+        """Сколько предметов уровня ещё не собрано (в том числе в невыгруженных кусках)"""
+        return self.level.item_count - len(self.collected)
+
+    def handle_event(self, event):
+        """Обработка одного события (из очереди pygame или из сценария)"""
+        self.profiler.handle_event(event)
+        if event.type == pygame.QUIT:
+            self.running = False
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_SPACE:
+                self.player.jump()
+            if event.key == pygame.K_r:
+                # Рестарт уровня
+                self.restart()
+            if event.key == pygame.K_n:
+                # Следующий уровень
+                numbers = level_numbers()
+                later = [number for number in numbers if number > self.current_level]
+                self.load_level(later[0] if later else numbers[0])
+
+    def update(self, keys):
+        """Один шаг игры; keys — состояние клавиш как у pygame.key.get_pressed()"""
+        player = self.player
+        lap = self.profiler.lap
+        player.prev_x, player.prev_y = player.x, player.y
 
         # Движение игрока
-        keys = pygame.key.get_pressed()
         if keys[pygame.K_LEFT] or keys[pygame.K_a]:
             player.move(-1)
         if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
             player.move(1)
 
-        # Обновление игрока
-        player.update(platforms)
-
-        # Проверка сбора предметов
-        for item in items[:]:
-            if player.get_rect().colliderect(item.get_rect()):
-                handle_item_collection(item.type, player)
-                items.remove(item)
+        # Куски уровня рядом с игроком
+        self.stream_chunks()
+        lap("update")
+
+        # Обновление игрока (падение и приземление на платформы)
+        player.update(self.platform_index)
+
+        # Проверка сбора предметов: из сетки берутся только предметы рядом с игроком
+        for item in self.items.colliding(player.get_rect()):
+            handle_item_collection(item.type, player)
+            self.items.remove(item)
+            self.collected.add(item.number)
+        lap("collision")
+
+    def state_signature(self):
+        """Состояние игры для контрольной суммы записи"""
+        player = self.player
+        return (self.current_level, player.x, player.y, player.vel_y, player.score,
+                player.speed, player.jump_power, tuple(player.collected_items),
+                [(item.x, item.y, item.type) for item in sorted(self.items, key=lambda item: item.number)])
+
+    def draw(self, alpha=1.0):
+        """Отрисовка кадра и вывод его на экран; alpha — доля шага после последнего update (для интерполяции)"""
+        camera = self.camera
+        player = self.player
+        if camera.follow(lerp(player.prev_x, player.x, alpha) + player.width / 2,
+                         lerp(player.prev_y, player.y, alpha) + player.height / 2):
+            # Платформы запечены в фон, поэтому при сдвиге камеры он пересобирается целиком
+            self.background.invalidate()
+            self.renderer.invalidate()
+
+        # Фон с платформами (целиком или только под прошлыми позициями объектов)
+        lap = self.profiler.lap
+        self.renderer.begin(screen)
+        dirty = self.renderer.add
+        lap("draw-background")
 
         # Проверка завершения уровня
-        if len(items) == 0:
-            draw_text("Уровень пройден! Нажми N для следующего", 40, GREEN, 100, HEIGHT // 2)
-
-        # Отрисовка платформ
-        for platform in platforms:
-            pygame.draw.rect(screen, GREEN, platform)
-
-        # Отрисовка предметов
-        for item in items:
-            item.draw()
+        if self.items_left == 0:
+            dirty(draw_text("Уровень пройден! Нажми N для следующего", 40, GREEN, 100, HEIGHT // 2))
+
+        # Отрисовка предметов: из сетки берутся только те, что рядом с окном
+        view = camera.rect
+        drawn = 0
+        for item in camera.nearby(self.items):
+            if view.colliderect(item.rect):
+                dirty(item.draw(camera))
+                drawn += 1
+        camera.count("предметы", drawn, len(self.items))
 
         # Отрисовка игрока
-        player.draw()
+        dirty(player.draw(camera, alpha))
+        lap("draw-entities")
 
         # Отрисовка информации
-        draw_text(f"Уровень: {current_level}", 36, WHITE, 20, 20)
-        draw_text(f"Счет: {player.score}", 36, WHITE, 20, 60)
-        draw_text(f"Собрано предметов: {len(player.collected_items)}", 36, WHITE, 20, 100)
+        dirty(self.hud["level"].draw(screen, self.current_level))
+        dirty(self.hud["score"].draw(screen, self.player.score))
+        dirty(self.hud["collected"].draw(screen, len(self.player.collected_items)))
 
         # Подсказки
-        draw_text("Управление: стрелки/A-D, Пробел - прыжок", 24, WHITE, 20, HEIGHT - 80)
-        draw_text("R - рестарт уровня, N - следующий уровень", 24, WHITE, 20, HEIGHT - 50)
+        dirty(draw_text("Управление: стрелки/A-D, Пробел - прыжок", 24, WHITE, 20, HEIGHT - 80))
+        dirty(draw_text("R - рестарт уровня, N - следующий уровень", 24, WHITE, 20, HEIGHT - 50))
 
-        pygame.display.flip()
-        clock.tick(FPS)
+        # Таблица профилировщика (F3)
+        dirty(self.profiler.draw(screen, (WIDTH - 290, 20)))
+        lap("hud")
 
+        self.renderer.present()
+        lap("flip")
+
+
+def main():
+    # С --record ФАЙЛ сессия записывается для tools/replay.py,
+    # с --profile [ФАЙЛ] включается профилировщик кадра,
+    # --max-fps N меняет предел частоты кадров (0 — без ограничения)
+    recorder = Recorder.from_argv("platformer", RECORDED_KEYS, fps=TICK_RATE)
+    profiler = FrameProfiler.from_argv()
+    loop = FixedStepLoop.from_argv(TICK_RATE, MAX_FPS)
+    game = Platformer(profiler=profiler)
+
+    events = []
+    while game.running:
+        profiler.begin_frame()
+        # События копятся до ближайшего шага: запись и воспроизведение идут по шагам
+        events.extend(pygame.event.get())
+        profiler.lap("events")
+
+        for _ in range(loop.ticks()):
+            keys = pygame.key.get_pressed()
+            if recorder is not None:
+                recorder.record(keys, events)
+
+            # Обработка событий
+            for event in events:
+                game.handle_event(event)
+            events = []
+            profiler.lap("events")
+
+            game.update(keys)
+        game.draw(loop.alpha)
+        profiler.end_frame()
+        loop.wait()
+
+    if recorder is not None:
+        print(f"Сессия записана в {recorder.save(game)}")
+    print(loop.summary())
+    print(game.renderer.summary())
+    print(game.camera.summary())
+    profiler.finish()
     pygame.quit()
     sys.exit()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
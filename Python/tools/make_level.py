@@ -0,0 +1,67 @@
+"""Создание файлов уровней платформера (формат gamekit/levels.py).
+
+Примеры:
+    python tools/make_level.py levels/level1.gklv --from 1
+    python tools/make_level.py levels/level3.gklv --generate 200000x600 --seed 5
+
+--from берёт уровень из словаря LEVELS в main.py, --generate строит
+длинный мир из случайных платформ с предметами над ними. main.py сам
+находит файлы levels/levelN.gklv и переключается на них клавишей N.
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gamekit.headless import use_dummy_video
+from gamekit.levels import CHUNK_SIZE, save_level
+
+ITEM_TYPES = ["coin", "coin", "coin", "gem", "bonus", "key"]
+
+
+def generate(width, height, seed):
+    """Платформы идут слева направо на доступной для прыжка высоте, над частью из них — предметы"""
+    rng = random.Random(seed)
+    platforms, items = [], []
+    x, y = 0, height - 100
+    while x < width - 300:
+        w = rng.randrange(80, 300)
+        platforms.append((x, y, w, 20))
+        if rng.random() < 0.4:
+            items.append({"type": rng.choice(ITEM_TYPES), "x": x + w // 2 - 15, "y": y - 60})
+        x += w + rng.randrange(40, 140)
+        y = min(height - 40, max(120, y + rng.randrange(-110, 120)))
+    return {"platforms": platforms, "items": items, "start_pos": (platforms[0][0] + 10, platforms[0][1] - 60)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Создание файла уровня")
+    parser.add_argument("path")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--from", dest="number", type=int, help="номер уровня из LEVELS в main.py")
+    source.add_argument("--generate", metavar="ШxВ", help="размер случайного мира в пикселях")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk", type=int, default=CHUNK_SIZE, help="сторона куска в пикселях")
+    args = parser.parse_args()
+
+    if args.number is not None:
+        use_dummy_video()
+        from gamekit.games import load_game
+        platformer = load_game("platformer")
+        level, size = platformer.LEVELS[args.number], (platformer.WIDTH, platformer.HEIGHT)
+    else:
+        size = tuple(int(value) for value in args.generate.lower().split("x"))
+        level = generate(*size, args.seed)
+
+    folder = os.path.dirname(args.path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    save_level(args.path, level, size, args.chunk)
+    print(f"{args.path}: {len(level['platforms'])} платформ, {len(level['items'])} предметов, "
+          f"мир {size[0]}x{size[1]}, {os.path.getsize(args.path)} байт")
+
+
+if __name__ == "__main__":
+    main()
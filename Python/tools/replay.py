@@ -0,0 +1,46 @@
+"""Воспроизведение записанной сессии (запись: python main.py --record session.rpl).
+
+Примеры:
+    python tools/replay.py session.rpl             # без окна, быстрее реального времени
+    python tools/replay.py session.rpl --render    # с отрисовкой в окне
+    python tools/replay.py session.rpl --render --speed 4
+
+В конце сверяется контрольная сумма итогового состояния с записанной;
+код выхода 1, если она не совпала.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gamekit.games import create_headless, game_class, load_game
+from gamekit.headless import use_dummy_video
+from gamekit.replay import Replay, play
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Воспроизведение записанной сессии")
+    parser.add_argument("path")
+    parser.add_argument("--render", action="store_true", help="рисовать кадры в окне")
+    parser.add_argument("--speed", type=float, help="множитель скорости при --render (по умолчанию без ограничения)")
+    args = parser.parse_args()
+
+    if not args.render:
+        use_dummy_video()
+
+    replay = Replay.load(args.path)
+    if replay.name == "platformer":
+        load_game("platformer").LOG_PICKUPS = False  # Не засоряем вывод при перемотке
+
+    if args.render:
+        result = play(replay, game_class(replay.name), render=True, speed=args.speed)
+    else:
+        result = play(replay, lambda: create_headless(replay.name))
+    print(f"{replay.name}, seed {replay.seed}")
+    print(result)
+    sys.exit(0 if result.matches else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Безоконный прогон любой из трёх игр: фиксированный шаг, seed и бот вместо игрока.
+
+Примеры:
+    python tools/simulate.py shooter --frames 1000000 --seed 7
+    python tools/simulate.py treasure --frames 200000 --idle
+
+Работает и там, где есть только SDL dummy: окно не создаётся.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gamekit import headless
+from gamekit.games import GAMES, create_headless, load_game
+
+import pygame
+
+# Какие клавиши бот зажимает и какие иногда нажимает в каждой игре
+BOT_KEYS = {
+    "platformer": ([pygame.K_LEFT, pygame.K_RIGHT], [pygame.K_SPACE]),
+    "shooter": ([pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN], [pygame.K_SPACE, pygame.K_r]),
+    "treasure": ([pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN], [pygame.K_r]),
+}
+
+# Итоговое состояние для отчёта
+SUMMARY = {
+    "platformer": lambda game: f"уровень {game.current_level}, счет {game.player.score}, "
+                               f"предметов собрано {len(game.player.collected_items)}",
+    "shooter": lambda game: f"уровень {game.level}, счет {int(game.player.score)}, "
+                            f"жизни {game.player.lives}, фигур {len(game.shapes)}",
+    "treasure": lambda game: f"счет {game.score}, собрано {game.collected_count}, время {game.game_time}",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Безоконный детерминированный прогон игры")
+    parser.add_argument("game", choices=sorted(GAMES))
+    parser.add_argument("--frames", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--idle", action="store_true", help="без бота: никакие клавиши не нажимаются")
+    args = parser.parse_args()
+
+    headless.use_dummy_video()
+    if args.game == "platformer":
+        load_game("platformer").LOG_PICKUPS = False  # Не засоряем вывод на миллионах кадров
+
+    if args.idle:
+        script = headless.InputScript()
+    else:
+        hold_keys, press_keys = BOT_KEYS[args.game]
+        script = headless.RandomInput(args.seed, hold_keys, press_keys)
+
+    result = headless.run_headless(lambda: create_headless(args.game), args.frames, script, args.seed)
+    print(result)
+    print(SUMMARY[args.game](result.game))
+
+
+if __name__ == "__main__":
+    main()
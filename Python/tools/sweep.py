@@ -0,0 +1,170 @@
+"""Перебор параметров баланса 31_1.py: много безоконных прогонов на всех ядрах.
+
+Примеры:
+    python tools/sweep.py --spawn-delay 30,60,90 --max-shapes 10,15,25 --seeds 8
+    python tools/sweep.py --cooldown 5,10,20 --level-score 300,500 --bot random --out cooldown.csv
+
+Каждое сочетание параметров проигрывается с seed 0..N-1 до конца игры или
+до --frames кадров (по умолчанию 10 минут игрового времени). Прогоны
+независимы, поэтому раздаются процессам ProcessPoolExecutor пачками, а
+назад возвращаются только итоговые числа. В CSV по каждому сочетанию —
+время жизни, счёт и достигнутый уровень.
+"""
+import argparse
+import csv
+import itertools
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gamekit import headless
+from gamekit.games import load_game
+
+import pygame
+
+# Параметр командной строки -> константа баланса в 31_1.py
+PARAMS = {
+    "start_shapes": "START_SHAPES",
+    "spawn_delay": "SPAWN_DELAY",
+    "max_shapes": "MAX_SHAPES",
+    "cooldown": "LASER_COOLDOWN",
+    "level_score": "LEVEL_SCORE",
+}
+
+MOVE_KEYS = [pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN]
+
+
+class Bot:
+    """Игрок-бот: случайно ходит и стреляет; aim — в ближайшую фигуру, иначе пробелом вверх.
+
+    Свой генератор случайных чисел, чтобы не сбивать random игры.
+    """
+
+    def __init__(self, seed, aim=True):
+        self.aim = aim
+        self.moves = headless.RandomInput(seed, MOVE_KEYS)
+        self.rng = random.Random(seed)
+
+    def keys(self, frame):
+        return self.moves.keys(frame)
+
+    def events(self, game):
+        player = game.player
+        if player.laser_cooldown > 0 or not game.shapes:
+            return ()
+        if not self.aim:
+            if self.rng.random() < 0.2:
+                return [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE)]
+            return ()
+        target = min(game.shapes, key=lambda shape: (shape.x - player.x) ** 2 + (shape.y - player.y) ** 2)
+        return [pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(int(target.x), int(target.y)), button=1)]
+
+
+def init_worker():
+    """Один раз на процесс: SDL без окна и загрузка игры"""
+    headless.use_dummy_video()
+    load_game("shooter")
+
+
+def play(task):
+    """Один прогон: task = (параметры, seed, предел кадров, aim); возвращает итог прогона"""
+    params, seed, frames, aim = task
+    shooter = load_game("shooter")
+    for name, value in params.items():
+        setattr(shooter, PARAMS[name], value)
+    random.seed(seed)
+    game = shooter.Game(headless=True)
+    bot = Bot(seed, aim)
+    frame = 0
+    while frame < frames and not game.game_over:
+        for event in bot.events(game):
+            game.handle_event(event)
+        game.update(bot.keys(frame))
+        frame += 1
+    return {**params, "seed": seed, "frames": frame, "score": int(game.player.score),
+            "level": game.level, "died": game.game_over}
+
+
+def sweep(grid, seeds, frames, aim=True, workers=None, chunksize=None):
+    """Все сочетания из grid (имя -> список значений) по seeds прогонов; возвращает итоги прогонов"""
+    names = list(grid)
+    tasks = [(dict(zip(names, values)), seed, frames, aim)
+             for values in itertools.product(*(grid[name] for name in names)) for seed in range(seeds)]
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        # Несколько пачек на процесс: меньше пересылок, а неравные прогоны всё равно распределяются ровно
+        chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+        return list(executor.map(play, tasks, chunksize=chunksize))
+
+
+def aggregate(runs, fps):
+    """Итоги по сочетаниям параметров: строки для CSV"""
+    groups = {}
+    for run in runs:
+        key = tuple(run[name] for name in PARAMS if name in run)
+        groups.setdefault(key, []).append(run)
+    rows = []
+    for key, group in groups.items():
+        seconds = [run["frames"] / fps for run in group]
+        row = dict(zip((name for name in PARAMS if name in group[0]), key))
+        row.update({
+            "runs": len(group),
+            "survival_mean_s": round(sum(seconds) / len(seconds), 2),
+            "survival_min_s": round(min(seconds), 2),
+            "survival_max_s": round(max(seconds), 2),
+            "survived_share": round(sum(not run["died"] for run in group) / len(group), 3),
+            "score_mean": round(sum(run["score"] for run in group) / len(group), 1),
+            "level_mean": round(sum(run["level"] for run in group) / len(group), 2),
+            "level_max": max(run["level"] for run in group),
+        })
+        rows.append(row)
+    return rows
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def int_list(text):
+    return [int(value) for value in text.split(",")]
+
+
+def main():
+    headless.use_dummy_video()
+    shooter = load_game("shooter")
+    parser = argparse.ArgumentParser(description="Перебор параметров баланса 31_1.py на всех ядрах")
+    for name, constant in PARAMS.items():
+        parser.add_argument("--" + name.replace("_", "-"), type=int_list, default=[getattr(shooter, constant)],
+                            help=f"значения {constant} через запятую (сейчас {getattr(shooter, constant)})")
+    parser.add_argument("--seeds", type=int, default=8, help="прогонов на каждое сочетание")
+    parser.add_argument("--frames", type=int, default=shooter.TICK_RATE * 600, help="предел длины прогона в шагах")
+    parser.add_argument("--bot", choices=["aim", "random"], default="aim")
+    parser.add_argument("--workers", type=int, default=None, help="процессов (по умолчанию по числу ядер)")
+    parser.add_argument("--out", default="sweep.csv")
+    args = parser.parse_args()
+
+    grid = {name: getattr(args, name) for name in PARAMS}
+    combos = math.prod(len(values) for values in grid.values())
+    workers = args.workers or os.cpu_count() or 1
+    print(f"{combos} сочетаний x {args.seeds} seed = {combos * args.seeds} прогонов на {workers} процессах")
+    start = time.perf_counter()
+    runs = sweep(grid, args.seeds, args.frames, args.bot == "aim", workers)
+    seconds = time.perf_counter() - start
+    rows = aggregate(runs, shooter.TICK_RATE)
+    write_csv(args.out, rows)
+    frames = sum(run["frames"] for run in runs)
+    print(f"{len(runs)} прогонов, {frames} кадров за {seconds:.1f} с ({frames / seconds:,.0f} кадров/с); "
+          f"итоги в {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,42 @@
 import pygame
 import random
 import math
+import os
 import sys
+import time
+from collections import deque
+
+# Общие модули игр лежат в папке Python, на уровень выше
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gamekit.camera import Camera
+from gamekit.dirty import DirtyRenderer
+from gamekit.hud import GradientBar, Panel
+from gamekit.layers import LayeredRenderer
+from gamekit.loop import FixedStepLoop, lerp
+from gamekit.particles import ParticlePool
+from gamekit.profiler import FrameProfiler
+from gamekit.spatial import SpatialHash
+from gamekit.sprites import RotationAtlas, trim
+from gamekit.starfield import NebulaSprites, StarField
+from gamekit.text import TextLabel
+from gamekit.window import init_modules, open_window
 
 # ===================================================
 # ОБЛАСТЬ ДЛЯ РЕДАКТИРОВАНИЯ (НАЧАЛО)
 
 # Настройки окна
 WIDTH, HEIGHT = 1000, 700
-FPS = 60
+TICK_RATE = 60  # Шагов игры в секунду (скорости и таймеры заданы в шагах)
+MAX_FPS = 60  # Предел частоты кадров; None — без ограничения (игрок интерполируется между шагами)
+
+# Размер мира (если он больше окна, камера следует за игроком)
+WORLD_WIDTH, WORLD_HEIGHT = WIDTH, HEIGHT
 
 # Настройки игрока
 PLAYER_SIZE = 60
 PLAYER_COLOR = (70, 130, 255)  # Приятный синий
 PLAYER_SPEED = 7
+TRAIL_LENGTH = 10  # Сколько прошлых позиций игрока рисуется в следе
 
 # Настройки квадратов (монет)
 NUM_SQUARES = 15  # Количество квадратов
@@ -41,68 +64,65 @@ TEXT_COLOR = (240, 240, 255)  # Светлый почти белый
 SCORE_COLOR = (100, 255, 100)  # Светло-зелёный
 HIGHLIGHT_COLOR = (255, 255, 100)  # Жёлтый для выделений
 
+# Звёздное небо (для большого экрана можно десятки тысяч звёзд)
+STAR_COUNT = 200
+NEBULA_RADIUS_STEP = 10  # Туманности рисуются готовыми кругами с радиусом, кратным шагу
+
 # Эффекты частиц
 PARTICLE_COUNT = 15  # Количество частиц при сборе
+MAX_PARTICLES = 20000  # Ёмкость пула частиц
+
+# Обновлять на экране только изменившиеся прямоугольники
+# (если меняется больше половины экрана, кадр всё равно выводится целиком)
+DIRTY_RECTS = True
+TREASURE_CELL = 128  # Клетка сетки сокровищ для отсечения камерой
+TREASURE_ROTATION_STEP = 3  # Шаг углов (градусы) для заранее нарисованных вращающихся сокровищ
+TREASURE_SPRITE_MB = 32  # Предел памяти кэша кадров сокровищ
+PLAYER_SPRITE_MB = 32  # Предел памяти кэша повёрнутых кадров игрока (360 кадров — около 21 МБ)
+SPRITE_BAKE_SECONDS = 0.2  # Сколько времени при запуске рисовать кадры игрока и сокровищ (остальные — по запросу)
 # ===================================================
 # ОБЛАСТЬ ДЛЯ РЕДАКТИРОВАНИЯ (КОНЕЦ)
 # ===================================================
 
-# Инициализация PyGame
-pygame.init()
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("✨ Космический Сборщик Сокровищ ✨")
-clock = pygame.time.Clock()
-
-# Шрифты
-try:
-    font_large = pygame.font.Font(None, 72)
-    font_medium = pygame.font.Font(None, 48)
-    font_small = pygame.font.Font(None, 28)
-    font_tiny = pygame.font.Font(None, 22)
-except:
-    font_large = pygame.font.Font(None, 48)
-    font_medium = pygame.font.Font(None, 36)
-    font_small = pygame.font.Font(None, 24)
-    font_tiny = pygame.font.Font(None, 18)
-
-
-# Класс для частиц
-class Particle:
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.size = random.randint(3, 8)
-        self.speed_x = random.uniform(-3, 3)
-        self.speed_y = random.uniform(-3, 3)
-        self.life = random.randint(20, 40)
-        self.gravity = 0.1
+# Окно и шрифты создаются при запуске игры (create_window, load_fonts), а не при импорте
+screen = None
+font_large = font_medium = font_small = font_tiny = None
 
-    def update(self):
-        self.x += self.speed_x
-        self.y += self.speed_y
-        self.speed_y += self.gravity
-        self.life -= 1
-        self.size = max(0, self.size - 0.1)
 
-    def draw(self, surface):
-        if self.life > 0:
-            alpha = min(255, self.life * 6)
-            color_with_alpha = (*self.color, alpha)
-            particle_surf = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(particle_surf, color_with_alpha, (self.size, self.size), self.size)
-            surface.blit(particle_surf, (self.x - self.size, self.y - self.size))
+def create_window():
+    global screen
+    screen = open_window((WIDTH, HEIGHT), "✨ Космический Сборщик Сокровищ ✨")
+    return screen
+
+
+def load_fonts():
+    """Шрифты интерфейса (загружаются один раз)"""
+    global font_large, font_medium, font_small, font_tiny
+    if font_large is not None:
+        return
+    init_modules()
+    try:
+        font_large = pygame.font.Font(None, 72)
+        font_medium = pygame.font.Font(None, 48)
+        font_small = pygame.font.Font(None, 28)
+        font_tiny = pygame.font.Font(None, 22)
+    except:
+        font_large = pygame.font.Font(None, 48)
+        font_medium = pygame.font.Font(None, 36)
+        font_small = pygame.font.Font(None, 24)
+        font_tiny = pygame.font.Font(None, 18)
 
 
 # Класс для игрока
 class Player:
     def __init__(self):
-        self.rect = pygame.Rect(WIDTH // 2, HEIGHT // 2, PLAYER_SIZE, PLAYER_SIZE)
+        self.rect = pygame.Rect(WORLD_WIDTH // 2, WORLD_HEIGHT // 2, PLAYER_SIZE, PLAYER_SIZE)
+        self.prev_x, self.prev_y = self.rect.topleft  # Позиция до последнего шага (для интерполяции)
         self.color = PLAYER_COLOR
         self.speed = PLAYER_SPEED
         self.angle = 0
-        self.trail = []
-        self.trail_length = 10
+        self.trail_length = TRAIL_LENGTH
+        self.trail = deque(maxlen=self.trail_length)  # Старые позиции выпадают сами
 
     def move(self, keys):
         dx, dy = 0, 0
@@ -117,58 +137,95 @@ class Player:
 
         # Добавляем позицию в след
         self.trail.append((self.rect.centerx, self.rect.centery))
-        if len(self.trail) > self.trail_length:
-            self.trail.pop(0)
+        self.prev_x, self.prev_y = self.rect.topleft
 
         # Плавное движение с ограничениями
-        new_x = max(0, min(WIDTH - PLAYER_SIZE, self.rect.x + dx))
-        new_y = max(0, min(HEIGHT - PLAYER_SIZE, self.rect.y + dy))
+        new_x = max(0, min(WORLD_WIDTH - PLAYER_SIZE, self.rect.x + dx))
+        new_y = max(0, min(WORLD_HEIGHT - PLAYER_SIZE, self.rect.y + dy))
         self.rect.x = new_x
         self.rect.y = new_y
 
         # Вращение игрока
         self.angle = (self.angle + 1) % 360
 
-    def draw(self, surface):
-        # Рисуем след
+    def draw(self, surface, camera, alpha=1.0):
+        # Прямоугольники, которые закрасил игрок (для режима грязных прямоугольников)
+        drawn = []
+
+        # Рисуем след: круги нужного размера и прозрачности нарисованы заранее
+        count = len(self.trail)
         for i, pos in enumerate(self.trail):
-            alpha = int(50 * (i / len(self.trail)))
-            size = int(PLAYER_SIZE * (i / len(self.trail)))
-            trail_surf = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-            color = (*self.color, alpha)
-            pygame.draw.circle(trail_surf, color, (size, size), size)
-            surface.blit(trail_surf, (pos[0] - size, pos[1] - size))
-
-        # Рисуем игрока с градиентом
-        player_surf = pygame.Surface((PLAYER_SIZE * 2, PLAYER_SIZE * 2), pygame.SRCALPHA)
-
-        # Внешний круг
-        pygame.draw.circle(player_surf, self.color, (PLAYER_SIZE, PLAYER_SIZE), PLAYER_SIZE)
-
-        # Внутренний круг (более светлый)
-        inner_color = tuple(min(255, c + 40) for c in self.color)
-        pygame.draw.circle(player_surf, inner_color, (PLAYER_SIZE, PLAYER_SIZE), PLAYER_SIZE - 8)
-
-        # Глаза
-        eye_offset = PLAYER_SIZE // 3
-        pygame.draw.circle(player_surf, (255, 255, 255),
-                           (PLAYER_SIZE - eye_offset, PLAYER_SIZE - eye_offset // 2), 8)
-        pygame.draw.circle(player_surf, (255, 255, 255),
-                           (PLAYER_SIZE + eye_offset, PLAYER_SIZE - eye_offset // 2), 8)
-        pygame.draw.circle(player_surf, (30, 30, 60),
-                           (PLAYER_SIZE - eye_offset, PLAYER_SIZE - eye_offset // 2), 4)
-        pygame.draw.circle(player_surf, (30, 30, 60),
-                           (PLAYER_SIZE + eye_offset, PLAYER_SIZE - eye_offset // 2), 4)
-
-        # Поворачиваем игрока
-        rotated = pygame.transform.rotate(player_surf, self.angle)
-        surface.blit(rotated, (self.rect.x - PLAYER_SIZE // 2, self.rect.y - PLAYER_SIZE // 2))
+            size = int(PLAYER_SIZE * (i / count))
+            if size > 0:
+                pos = camera.to_screen(*pos)
+                trail_alpha = int(50 * (i / count))
+                drawn.append(surface.blit(trail_circle(self.color, size, trail_alpha), (pos[0] - size, pos[1] - size)))
+
+        # Игрок: готовый кадр с нужным углом поворота
+        sprite, (dx, dy) = player_sprites.get(self.color, self.angle)
+        x, y = camera.to_screen(lerp(self.prev_x, self.rect.x, alpha), lerp(self.prev_y, self.rect.y, alpha))
+        rect = surface.blit(sprite, (x - PLAYER_SIZE // 2 + dx, y - PLAYER_SIZE // 2 + dy))
+        return rect.unionall(drawn)
+
+
+def paint_player(color):
+    """Игрок с градиентом и глазами на прозрачной поверхности 2 * PLAYER_SIZE"""
+    player_surf = pygame.Surface((PLAYER_SIZE * 2, PLAYER_SIZE * 2), pygame.SRCALPHA)
+
+    # Внешний круг
+    pygame.draw.circle(player_surf, color, (PLAYER_SIZE, PLAYER_SIZE), PLAYER_SIZE)
+
+    # Внутренний круг (более светлый)
+    inner_color = tuple(min(255, c + 40) for c in color)
+    pygame.draw.circle(player_surf, inner_color, (PLAYER_SIZE, PLAYER_SIZE), PLAYER_SIZE - 8)
+
+    # Глаза
+    eye_offset = PLAYER_SIZE // 3
+    pygame.draw.circle(player_surf, (255, 255, 255),
+                       (PLAYER_SIZE - eye_offset, PLAYER_SIZE - eye_offset // 2), 8)
+    pygame.draw.circle(player_surf, (255, 255, 255),
+                       (PLAYER_SIZE + eye_offset, PLAYER_SIZE - eye_offset // 2), 8)
+    pygame.draw.circle(player_surf, (30, 30, 60),
+                       (PLAYER_SIZE - eye_offset, PLAYER_SIZE - eye_offset // 2), 4)
+    pygame.draw.circle(player_surf, (30, 30, 60),
+                       (PLAYER_SIZE + eye_offset, PLAYER_SIZE - eye_offset // 2), 4)
+    return player_surf
+
+
+def render_player_sprite(color, angle):
+    """Повёрнутый кадр игрока для кэша: (поверхность без прозрачных полей, сдвиг)"""
+    sprite = pygame.transform.rotate(paint_player(color), angle)
+    if pygame.display.get_surface() is not None:
+        sprite = sprite.convert_alpha()
+    sprite, offset = trim(sprite)
+    sprite.set_alpha(255, pygame.RLEACCEL)  # Как у сокровищ: прозрачные поля копируются сериями
+    return sprite, offset
+
+
+# Угол игрока меняется на 1° за кадр, поэтому кэш держит все 360 кадров
+player_sprites = RotationAtlas(render_player_sprite, 1, budget_bytes=PLAYER_SPRITE_MB * 1024 * 1024)
+
+# Круги следа игрока: (цвет, радиус, прозрачность) -> поверхность
+trail_circles = {}
+
+
+def trail_circle(color, size, alpha):
+    key = (color, size, alpha)
+    circle = trail_circles.get(key)
+    if circle is None:
+        circle = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+        pygame.draw.circle(circle, (*color, alpha), (size, size), size)
+        if pygame.display.get_surface() is not None:
+            circle = circle.convert_alpha()
+        trail_circles[key] = circle
+    return circle
 
 
 # Класс для квадратов (сокровищ)
 class Treasure:
     def __init__(self, x, y, treasure_type):
         self.rect = pygame.Rect(x, y, SQUARE_SIZE, SQUARE_SIZE)
+        self.info = treasure_type  # Запись из SQUARES_INFO (ключ кэша кадров)
         self.color, self.description, self.points, self.animation_type = treasure_type
         self.collected = False
         self.animation_progress = 0
@@ -184,324 +241,446 @@ class Treasure:
             if self.particle_timer > 30:
                 self.particle_timer = 0
 
-    def draw(self, surface):
+    def draw(self, surface, camera):
         if not self.collected:
             # Эффекты анимации
+            rect = camera.apply(self.rect)
             if self.animation_type == "pulse":
                 size_mod = math.sin(self.animation_progress * 2) * 5
-                draw_rect = self.rect.inflate(size_mod, size_mod)
+                draw_rect = rect.inflate(size_mod, size_mod)
             elif self.animation_type == "float":
                 float_y = math.sin(self.animation_progress + self.float_offset) * 10
-                draw_rect = self.rect.move(0, float_y)
+                draw_rect = rect.move(0, float_y)
             else:  # rotate
-                draw_rect = self.rect
-
-            # Рисуем сокровище с эффектами
-            treasure_surf = pygame.Surface((SQUARE_SIZE * 2, SQUARE_SIZE * 2), pygame.SRCALPHA)
+                draw_rect = rect
 
-            # Внешний блеск
+            # Готовый кадр: блеск пульсирующих сокровищ зависит от размера,
+            # вращающихся — от угла, остальные рисуются одним кадром
             if self.animation_type == "pulse":
                 glow_size = int(abs(math.sin(self.animation_progress)) * 15)
-                glow_color = tuple(min(255, c + 100) for c in self.color)
-                pygame.draw.circle(treasure_surf, (*glow_color, 100),
-                                   (SQUARE_SIZE, SQUARE_SIZE), SQUARE_SIZE + glow_size)
-
-            # Основная форма (ромб для драгоценностей)
-            if self.points >= 25:  # Дорогие сокровища - ромбы
-                points = [
-                    (SQUARE_SIZE, SQUARE_SIZE - SQUARE_SIZE // 1.5),
-                    (SQUARE_SIZE + SQUARE_SIZE // 1.5, SQUARE_SIZE),
-                    (SQUARE_SIZE, SQUARE_SIZE + SQUARE_SIZE // 1.5),
-                    (SQUARE_SIZE - SQUARE_SIZE // 1.5, SQUARE_SIZE)
-                ]
-                pygame.draw.polygon(treasure_surf, self.color, points)
-            else:  # Обычные монеты - круги
-                pygame.draw.circle(treasure_surf, self.color, (SQUARE_SIZE, SQUARE_SIZE), SQUARE_SIZE)
-
-                # Внутренний круг
-                inner_color = tuple(min(255, c + 50) for c in self.color)
-                pygame.draw.circle(treasure_surf, inner_color,
-                                   (SQUARE_SIZE, SQUARE_SIZE), SQUARE_SIZE - 10)
-
-            # Блестящие блики
-            highlight_size = SQUARE_SIZE // 3
-            highlight_pos = (SQUARE_SIZE - highlight_size, SQUARE_SIZE - highlight_size)
-            pygame.draw.circle(treasure_surf, (255, 255, 255, 150),
-                               highlight_pos, highlight_size)
-
-            # Вращение для некоторых типов
-            if self.animation_type == "rotate":
-                angle = self.animation_progress * 30
-                rotated = pygame.transform.rotate(treasure_surf, angle)
-                surface.blit(rotated, (draw_rect.x - SQUARE_SIZE, draw_rect.y - SQUARE_SIZE))
+                x, y = draw_rect.x - SQUARE_SIZE // 2, draw_rect.y - SQUARE_SIZE // 2
+                sprite, (dx, dy) = treasure_sprites.get((self.info, glow_size), 0)
+            elif self.animation_type == "rotate":
+                x, y = draw_rect.x - SQUARE_SIZE, draw_rect.y - SQUARE_SIZE
+                sprite, (dx, dy) = treasure_sprites.get((self.info, None), self.animation_progress * 30)
             else:
-                surface.blit(treasure_surf, (draw_rect.x - SQUARE_SIZE // 2, draw_rect.y - SQUARE_SIZE // 2))
-
-
-# Создание объектов игры
-player = Player()
-treasures = []
-particles = []
-
-# Создаём сокровища в случайных местах
-for _ in range(NUM_SQUARES):
-    x = random.randint(SQUARE_SIZE, WIDTH - SQUARE_SIZE)
-    y = random.randint(SQUARE_SIZE, HEIGHT - SQUARE_SIZE)
-    treasure_type = random.choice(SQUARES_INFO)
-    treasures.append(Treasure(x, y, treasure_type))
-
-# Переменные игры
-score = 0
-collected_count = 0
-current_message = ""
-message_timer = 0
-combo = 0
-combo_timer = 0
-game_time = 0
-
-
-# Функция для создания фоновых звёзд
-def create_stars(count):
-    stars = []
+                x, y = draw_rect.x - SQUARE_SIZE // 2, draw_rect.y - SQUARE_SIZE // 2
+                sprite, (dx, dy) = treasure_sprites.get((self.info, None), 0)
+            return surface.blit(sprite, (x + dx, y + dy))
+        return None
+
+
+def paint_treasure(color, points, glow_size=None):
+    """Сокровище на прозрачной поверхности 2 * SQUARE_SIZE; glow_size — размер блеска (None — без него)"""
+    treasure_surf = pygame.Surface((SQUARE_SIZE * 2, SQUARE_SIZE * 2), pygame.SRCALPHA)
+
+    # Внешний блеск
+    if glow_size is not None:
+        glow_color = tuple(min(255, c + 100) for c in color)
+        pygame.draw.circle(treasure_surf, (*glow_color, 100),
+                           (SQUARE_SIZE, SQUARE_SIZE), SQUARE_SIZE + glow_size)
+
+    # Основная форма (ромб для драгоценностей)
+    if points >= 25:  # Дорогие сокровища - ромбы
+        corners = [
+            (SQUARE_SIZE, SQUARE_SIZE - SQUARE_SIZE // 1.5),
+            (SQUARE_SIZE + SQUARE_SIZE // 1.5, SQUARE_SIZE),
+            (SQUARE_SIZE, SQUARE_SIZE + SQUARE_SIZE // 1.5),
+            (SQUARE_SIZE - SQUARE_SIZE // 1.5, SQUARE_SIZE)
+        ]
+        pygame.draw.polygon(treasure_surf, color, corners)
+    else:  # Обычные монеты - круги
+        pygame.draw.circle(treasure_surf, color, (SQUARE_SIZE, SQUARE_SIZE), SQUARE_SIZE)
+
+        # Внутренний круг
+        inner_color = tuple(min(255, c + 50) for c in color)
+        pygame.draw.circle(treasure_surf, inner_color,
+                           (SQUARE_SIZE, SQUARE_SIZE), SQUARE_SIZE - 10)
+
+    # Блестящие блики
+    highlight_size = SQUARE_SIZE // 3
+    highlight_pos = (SQUARE_SIZE - highlight_size, SQUARE_SIZE - highlight_size)
+    pygame.draw.circle(treasure_surf, (255, 255, 255, 150),
+                       highlight_pos, highlight_size)
+    return treasure_surf
+
+
+def render_treasure_sprite(key, angle):
+    """Один кадр сокровища для кэша: (поверхность без прозрачных полей, сдвиг)"""
+    (color, _, points, animation_type), glow_size = key
+    sprite = paint_treasure(color, points, glow_size)
+    if animation_type == "rotate":
+        sprite = pygame.transform.rotate(sprite, angle)
+    if pygame.display.get_surface() is not None:
+        sprite = sprite.convert_alpha()
+    sprite, offset = trim(sprite)
+    # RLE пропускает прозрачные и непрозрачные серии пикселей: копирование втрое быстрее
+    # (полупрозрачные пиксели могут отличаться на единицу из-за округления)
+    sprite.set_alpha(255, pygame.RLEACCEL)
+    return sprite, offset
+
+
+def treasure_frames():
+    """Все кадры всех сокровищ из SQUARES_INFO: размеры блеска, углы поворота, статичные"""
+    for info in SQUARES_INFO:
+        if info[3] == "pulse":
+            for glow_size in range(16):
+                yield (info, glow_size), 0
+        elif info[3] == "rotate":
+            for angle in range(0, 360, TREASURE_ROTATION_STEP):
+                yield (info, None), angle
+        else:
+            yield (info, None), 0
+
+
+# Кэш кадров сокровищ: часть рисуется при запуске игры, остальное — при первом показе
+treasure_sprites = RotationAtlas(render_treasure_sprite, TREASURE_ROTATION_STEP,
+                                 budget_bytes=TREASURE_SPRITE_MB * 1024 * 1024)
+
+
+def bake_sprites(seconds=SPRITE_BAKE_SECONDS):
+    """Рисует кадры заранее, пока не пройдёт seconds секунд: сначала след и игрока
+    (они видны всегда), потом сокровища. Остальные кадры дорисуются при первом показе.
+    """
+    deadline = time.perf_counter() + seconds
+    for count in range(1, TRAIL_LENGTH + 1):
+        for i in range(1, count):
+            size = int(PLAYER_SIZE * (i / count))
+            if size > 0:
+                trail_circle(PLAYER_COLOR, size, int(50 * (i / count)))
+    player_sprites.bake(((PLAYER_COLOR, angle) for angle in range(360)), deadline - time.perf_counter())
+    treasure_sprites.bake(treasure_frames(), max(0, deadline - time.perf_counter()))
+
+
+# Готовые круги туманностей
+nebula_sprites = NebulaSprites(NEBULA_RADIUS_STEP)
+
+
+# Функция для создания сокровищ в случайных местах
+def create_treasures(count):
+    treasures = []
     for _ in range(count):
-        x = random.randint(0, WIDTH)
-        y = random.randint(0, HEIGHT)
-        size = random.uniform(0.5, 2)
-        brightness = random.randint(150, 255)
-        twinkle_speed = random.uniform(0.01, 0.05)
-        stars.append([x, y, size, brightness, twinkle_speed, 0])
-    return stars
+        x = random.randint(SQUARE_SIZE, WORLD_WIDTH - SQUARE_SIZE)
+        y = random.randint(SQUARE_SIZE, WORLD_HEIGHT - SQUARE_SIZE)
+        treasure_type = random.choice(SQUARES_INFO)
+        treasures.append(Treasure(x, y, treasure_type))
+    return treasures
 
 
-# Создаём звёздное небо
-stars = create_stars(200)
-
-# Главный игровой цикл
-running = True
-while running:
-    # Обработка событий
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_r:  # Перезапуск игры
-                player = Player()
-                treasures = []
-                particles = []
-                for _ in range(NUM_SQUARES):
-                    x = random.randint(SQUARE_SIZE, WIDTH - SQUARE_SIZE)
-                    y = random.randint(SQUARE_SIZE, HEIGHT - SQUARE_SIZE)
-                    treasure_type = random.choice(SQUARES_INFO)
-                    treasures.append(Treasure(x, y, treasure_type))
-                score = 0
-                collected_count = 0
-                current_message = "✨ Игра перезапущена! ✨"
-                message_timer = 60
-                combo = 0
-                combo_timer = 0
-                game_time = 0
-            if event.key == pygame.K_ESCAPE:  # Выход по ESC
-                running = False
-
-    # Обновление времени
-    game_time += 1
-    if combo_timer > 0:
-        combo_timer -= 1
-    else:
-        combo = 0
-
-    # Движение игрока
-    keys = pygame.key.get_pressed()
-    player.move(keys)
-
-    # Обновление сокровищ
-    for treasure in treasures:
-        treasure.update()
-
-        # Проверка столкновения с игроком
-        if not treasure.collected and player.rect.colliderect(treasure.rect):
-            treasure.collected = True
-            score += treasure.points
-            collected_count += 1
-
-            # Комбо-система
-            combo += 1
-            combo_timer = 60  # Комбо сбрасывается через 60 кадров
-            combo_bonus = max(0, (combo - 1) * 2)
-            score += combo_bonus
-
-            # Создаём частицы
-            for _ in range(PARTICLE_COUNT):
-                particles.append(Particle(
-                    treasure.rect.centerx,
-                    treasure.rect.centery,
-                    treasure.color
-                ))
-
-            current_message = f"{treasure.description} +{treasure.points}"
-            if combo_bonus > 0:
-                current_message += f" (Комбо x{combo} +{combo_bonus}!)"
-            message_timer = 90
-
-    # Обновление частиц
-    for particle in particles[:]:
-        particle.update()
-        if particle.life <= 0:
-            particles.remove(particle)
-
-    # Обновление звёзд (мерцание)
-    for star in stars:
-        star[5] += star[4]
-        star[3] = 150 + int(math.sin(star[5]) * 50)
-
-    # Обновление таймера сообщения
-    if message_timer > 0:
-        message_timer -= 1
-    else:
-        current_message = ""
-
-    # Проверка завершения игры
-    if collected_count >= NUM_SQUARES:
-        time_bonus = max(0, 3000 - game_time) // 10
-        score += time_bonus
-        current_message = f"🎉 Победа! Все сокровища собраны! 🎉"
-        message_timer = 180
-
-    # =============== ОТРИСОВКА ===============
-    # Фон с градиентом
-    for y in range(HEIGHT):
+def paint_gradient(surface):
+    """Фон с градиентом: рисуется один раз и кэшируется"""
+    width, height = surface.get_size()
+    for y in range(height):
         # Плавный переход от тёмно-синего к фиолетовому
-        r = int(20 + (y / HEIGHT) * 10)
-        g = int(25 + (y / HEIGHT) * 5)
-        b = int(45 + (y / HEIGHT) * 20)
-        pygame.draw.line(screen, (r, g, b), (0, y), (WIDTH, y))
-
-    # Звёзды
-    for x, y, size, brightness, _, _ in stars:
-        pygame.draw.circle(screen, (brightness, brightness, brightness), (x, y), size)
-
-    # Туманность (размытые цветные пятна)
-    if game_time % 600 < 300:  # Меняем каждые 5 секунд
-        for i in range(3):
-            x = WIDTH // 4 * i + (game_time % 100) * 0.5
-            y = HEIGHT // 3 + math.sin(game_time * 0.01 + i) * 100
-            radius = 100 + math.sin(game_time * 0.02 + i) * 50
-            color = (50 + i * 30, 30, 80 + i * 20, 30)
-            fog_surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(fog_surf, color, (radius, radius), radius)
-            screen.blit(fog_surf, (x - radius, y - radius))
-
-    # Частицы
-    for particle in particles:
-        particle.draw(screen)
-
-    # Сокровища
-    for treasure in treasures:
-        treasure.draw(screen)
-
-    # Игрок
-    player.draw(screen)
-
-    # =============== ИНТЕРФЕЙС ===============
-    # Панель статистики с закруглёнными углами
-    panel_rect = pygame.Rect(20, 20, 300, 160)
-    panel_surf = pygame.Surface((panel_rect.width, panel_rect.height), pygame.SRCALPHA)
-    pygame.draw.rect(panel_surf, (30, 35, 60, 200), panel_surf.get_rect(), border_radius=15)
-    pygame.draw.rect(panel_surf, (100, 110, 170, 100), panel_surf.get_rect(), width=2, border_radius=15)
-    screen.blit(panel_surf, panel_rect)
-
-    # Очки
-    score_text = font_medium.render(f"💰 {score}", True, SCORE_COLOR)
-    screen.blit(score_text, (40, 40))
-
-    # Собрано сокровищ
-    collected_text = font_small.render(f"Собрано: {collected_count}/{NUM_SQUARES}", True, TEXT_COLOR)
-    screen.blit(collected_text, (40, 85))
-
-    # Комбо
-    if combo > 1:
-        combo_color = (255, 255, 100) if combo_timer > 30 else (255, 200, 100)
-        combo_text = font_small.render(f"Комбо: x{combo}", True, combo_color)
-        screen.blit(combo_text, (40, 120))
-
-    # Время игры
-    minutes = game_time // 3600
-    seconds = (game_time // 60) % 60
-    time_text = font_tiny.render(f"Время: {minutes:02d}:{seconds:02d}", True, (200, 200, 220))
-    screen.blit(time_text, (40, 155))
-
-    # Отображение текущего сообщения
-    if current_message:
-        message_alpha = min(255, message_timer * 4)
-        message_surface = font_small.render(current_message, True, HIGHLIGHT_COLOR)
-        message_rect = message_surface.get_rect(center=(WIDTH // 2, 50))
-
-        # Фон сообщения
-        bg_rect = message_rect.inflate(40, 20)
-        bg_surf = pygame.Surface((bg_rect.width, bg_rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(bg_surf, (0, 0, 0, message_alpha // 2), bg_surf.get_rect(), border_radius=10)
-        pygame.draw.rect(bg_surf, (255, 255, 100, message_alpha // 3), bg_surf.get_rect(), width=2, border_radius=10)
-        screen.blit(bg_surf, bg_rect)
-        screen.blit(message_surface, message_rect)
-
-    # Панель управления
+        r = int(20 + (y / height) * 10)
+        g = int(25 + (y / height) * 5)
+        b = int(45 + (y / height) * 20)
+        pygame.draw.line(surface, (r, g, b), (0, y), (width, y))
+
+
+def paint_stats_panel(surface):
+    """Панель статистики с закруглёнными углами"""
+    pygame.draw.rect(surface, (30, 35, 60, 200), surface.get_rect(), border_radius=15)
+    pygame.draw.rect(surface, (100, 110, 170, 100), surface.get_rect(), width=2, border_radius=15)
+
+
+def paint_controls_panel(surface):
+    pygame.draw.rect(surface, (30, 35, 60, 200), surface.get_rect(), border_radius=15)
+
+
+def progress_color(i, width):
+    """Цвет столбца i градиента прогресс-бара"""
+    color_ratio = i / width
+    return int(50 + color_ratio * 200), int(150 + color_ratio * 100), 255
+
+
+def create_hud():
+    """Виджеты интерфейса: подложки рисуются один раз, надписи — при смене своих значений"""
     controls = [
         "Управление: WASD или Стрелки",
         "Перезапуск: R",
         "Выход: ESC",
         "Цель: Собрать все сокровища!"
     ]
+    bar_width = 400
+    load_fonts()
+    title_x = WIDTH // 2 - font_large.size("СОКРОВИЩА")[0] // 2
+    return {
+        "panel": Panel((300, 160), paint_stats_panel),
+        "score": TextLabel(font_medium, "💰 {}", SCORE_COLOR, (40, 40)),
+        "collected": TextLabel(font_small, "Собрано: {}/{}", TEXT_COLOR, (40, 85)),
+        "combo": TextLabel(font_small, "Комбо: x{}", (255, 255, 100), (40, 120)),
+        "time": TextLabel(font_tiny, "Время: {:02d}:{:02d}", (200, 200, 220), (40, 155)),
+        "message": TextLabel(font_small, "{}", HIGHLIGHT_COLOR),
+        "controls_panel": Panel((300, 120), paint_controls_panel),
+        "controls": [TextLabel(font_tiny, text, (200, 200, 220), (WIDTH - 300, 40 + i * 25))
+                     for i, text in enumerate(controls)],
+        "progress_bar": GradientBar((WIDTH // 2 - bar_width // 2, HEIGHT - 40, bar_width, 20), progress_color,
+                                    (50, 55, 80), (200, 220, 255)),
+        "progress": TextLabel(font_tiny, "{}/{}", TEXT_COLOR, (WIDTH // 2 - 20, HEIGHT - 65)),
+        "title_shadow": TextLabel(font_large, "СОКРОВИЩА", (0, 0, 0, 100), (title_x + 3, 103)),
+        "title": TextLabel(font_large, "СОКРОВИЩА", (255, 255, 200), (title_x, 100)),
+    }
+
+
+# Класс игры: всё состояние, обновление и отрисовка одного кадра
+class TreasureGame:
+    def __init__(self, profiler=None, headless=False):
+        # Без окна (headless) игра только считает: окно не открывается
+        self.headless = headless
+        if not headless:
+            create_window()
+        self.profiler = profiler or FrameProfiler()  # Время фаз кадра (по умолчанию выключен)
+        self.particles = ParticlePool(MAX_PARTICLES)  # Все частицы лежат в массивах пула
+        self.camera = Camera((WIDTH, HEIGHT), (WORLD_WIDTH, WORLD_HEIGHT))
+        self.reset()
+        # Создаём звёздное небо
+        self.stars = StarField(STAR_COUNT, WIDTH, HEIGHT)
+        # Статичные слои фона (пересобираются только при смене размера окна)
+        self.background = LayeredRenderer([paint_gradient])
+        self.hud = create_hud()
+        self.renderer = DirtyRenderer(self.background, DIRTY_RECTS)
+        self.running = True
+        self.stars_time = None  # Шаг, на котором звёзды мерцали в последний раз
+
+    def reset(self):
+        """Начальное состояние: новый игрок, сокровища и обнулённые счётчики"""
+        self.player = Player()
+        self.treasures = create_treasures(NUM_SQUARES)
+        # Сетка несобранных сокровищ, чтобы рисовать только те, что рядом с окном
+        self.treasure_grid = SpatialHash(TREASURE_CELL)
+        for treasure in self.treasures:
+            self.treasure_grid.insert(treasure, treasure.rect.centerx, treasure.rect.centery, SQUARE_SIZE * 2)
+        self.particles.clear()
+        self.score = 0
+        self.collected_count = 0
+        self.current_message = ""
+        self.message_timer = 0
+        self.combo = 0
+        self.combo_timer = 0
+        self.game_time = 0
+
+    def handle_event(self, event):
+        """Обработка одного события"""
+        self.profiler.handle_event(event)
+        if event.type == pygame.QUIT:
+            self.running = False
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_r:  # Перезапуск игры
+                self.reset()
+                self.current_message = "✨ Игра перезапущена! ✨"
+                self.message_timer = 60
+            if event.key == pygame.K_ESCAPE:  # Выход по ESC
+                self.running = False
+
+    def update(self, keys):
+        """Один шаг игры; keys — состояние клавиш как у pygame.key.get_pressed()"""
+        lap = self.profiler.lap
+
+        # Обновление времени
+        self.game_time += 1
+        if self.combo_timer > 0:
+            self.combo_timer -= 1
+        else:
+            self.combo = 0
+
+        # Движение игрока
+        self.player.move(keys)
+        lap("update")
+
+        # Обновление сокровищ (в этом же цикле — проверка столкновений)
+        for treasure in self.treasures:
+            treasure.update()
+
+            # Проверка столкновения с игроком
+            if not treasure.collected and self.player.rect.colliderect(treasure.rect):
+                treasure.collected = True
+                self.treasure_grid.remove(treasure)
+                self.score += treasure.points
+                self.collected_count += 1
+
+                # Комбо-система
+                self.combo += 1
+                self.combo_timer = 60  # Комбо сбрасывается через 60 кадров
+                combo_bonus = max(0, (self.combo - 1) * 2)
+                self.score += combo_bonus
+
+                # Создаём частицы
+                self.particles.emit(treasure.rect.centerx, treasure.rect.centery,
+                                    treasure.color, PARTICLE_COUNT)
+
+                self.current_message = f"{treasure.description} +{treasure.points}"
+                if combo_bonus > 0:
+                    self.current_message += f" (Комбо x{self.combo} +{combo_bonus}!)"
+                self.message_timer = 90
+        lap("collision")
+
+        # Обновление частиц
+        self.particles.update()
+
+        # Обновление таймера сообщения
+        if self.message_timer > 0:
+            self.message_timer -= 1
+        else:
+            self.current_message = ""
+
+        # Проверка завершения игры
+        if self.collected_count >= NUM_SQUARES:
+            time_bonus = max(0, 3000 - self.game_time) // 10
+            self.score += time_bonus
+            self.current_message = f"🎉 Победа! Все сокровища собраны! 🎉"
+            self.message_timer = 180
+        lap("update")
+
+    def draw(self, screen, alpha=1.0):
+        """Отрисовка кадра и вывод его на экран; alpha — доля шага после последнего update (для интерполяции)"""
+        game_time = self.game_time
+        dirty = self.renderer.add
+        lap = self.profiler.lap
+        camera = self.camera
+        player = self.player
+        # Фон привязан к окну, поэтому сдвиг камеры его не затрагивает
+        camera.follow(lerp(player.prev_x, player.rect.x, alpha) + PLAYER_SIZE // 2,
+                      lerp(player.prev_y, player.rect.y, alpha) + PLAYER_SIZE // 2)
+
+        # Фон с градиентом (целиком или только под прошлыми позициями объектов)
+        self.renderer.begin(screen)
+
+        # Обновление звёзд (мерцание): это только оформление, поэтому считается
+        # при отрисовке, и безоконный прогон его пропускает. Мерцание идёт
+        # по шагам игры, а не по кадрам, чтобы не ускоряться без предела кадров
+        if self.stars_time != game_time:
+            self.stars_time = game_time
+            self.stars.update()
+
+        # Звёзды: все сразу записываются в пиксели экрана
+        self.renderer.add_all(self.stars.draw(screen))
+
+        # Туманность (размытые цветные пятна)
+        if game_time % 600 < 300:  # Меняем каждые 5 секунд
+            for i in range(3):
+                x = WIDTH // 4 * i + (game_time % 100) * 0.5
+                y = HEIGHT // 3 + math.sin(game_time * 0.01 + i) * 100
+                radius = 100 + math.sin(game_time * 0.02 + i) * 50
+                color = (50 + i * 30, 30, 80 + i * 20)
+                fog_surf, radius = nebula_sprites.get(radius, color)
+                dirty(screen.blit(fog_surf, (x - radius, y - radius)))
+        lap("draw-background")
+
+        # Частицы
+        self.renderer.add_all(self.particles.draw(screen, (camera.x, camera.y)))
+
+        # Сокровища: из сетки берутся только те, что рядом с окном (с запасом на блеск и вращение)
+        view = camera.rect
+        drawn = 0
+        for treasure in camera.nearby(self.treasure_grid, SQUARE_SIZE):
+            if view.colliderect(treasure.rect.inflate(SQUARE_SIZE * 2, SQUARE_SIZE * 2)):
+                dirty(treasure.draw(screen, camera))
+                drawn += 1
+        camera.count("сокровища", drawn, len(self.treasure_grid))
+
+        # Игрок
+        dirty(player.draw(screen, camera, alpha))
+        lap("draw-entities")
+
+        # =============== ИНТЕРФЕЙС ===============
+        self.draw_hud(screen, dirty)
+
+        # Таблица профилировщика (F3)
+        dirty(self.profiler.draw(screen, (20, 190)))
+        lap("hud")
+
+        # Обновление экрана
+        self.renderer.present()
+        lap("flip")
+
+    def draw_hud(self, screen, dirty):
+        """Интерфейс поверх кадра; dirty(rect) получает каждый нарисованный прямоугольник"""
+        game_time = self.game_time
+        # Виджеты помнят свои картинки: надписи рендерятся только при смене значений
+        hud = self.hud
+        dirty(hud["panel"].draw(screen, (20, 20)))
+        dirty(hud["score"].draw(screen, self.score))
+        dirty(hud["collected"].draw(screen, self.collected_count, NUM_SQUARES))
+
+        # Комбо
+        if self.combo > 1:
+            combo_color = (255, 255, 100) if self.combo_timer > 30 else (255, 200, 100)
+            dirty(hud["combo"].draw(screen, self.combo, color=combo_color))
+
+        # Время игры (надпись меняется раз в секунду)
+        minutes = game_time // 3600
+        seconds = (game_time // 60) % 60
+        dirty(hud["time"].draw(screen, minutes, seconds))
+
+        # Отображение текущего сообщения
+        if self.current_message:
+            message_alpha = min(255, self.message_timer * 4)
+            message_surface = hud["message"].get_surface(self.current_message)
+            message_rect = message_surface.get_rect(center=(WIDTH // 2, 50))
+
+            # Фон сообщения (прозрачность меняется, пока сообщение гаснет)
+            bg_rect = message_rect.inflate(40, 20)
+            bg_surf = pygame.Surface((bg_rect.width, bg_rect.height), pygame.SRCALPHA)
+            pygame.draw.rect(bg_surf, (0, 0, 0, message_alpha // 2), bg_surf.get_rect(), border_radius=10)
+            pygame.draw.rect(bg_surf, (255, 255, 100, message_alpha // 3), bg_surf.get_rect(), width=2, border_radius=10)
+            dirty(screen.blit(bg_surf, bg_rect))
+            dirty(screen.blit(message_surface, message_rect))
+
+        # Панель управления
+        dirty(hud["controls_panel"].draw(screen, (WIDTH - 320, 20)))
+        for label in hud["controls"]:
+            dirty(label.draw(screen))
+
+        # Прогресс-бар: готовый градиент копируется на ширину заполнения
+        if NUM_SQUARES > 0:
+            dirty(hud["progress_bar"].draw(screen, self.collected_count / NUM_SQUARES))
+            dirty(hud["progress"].draw(screen, self.collected_count, NUM_SQUARES))
+
+        # Декоративные элементы
+        if game_time % 120 < 60:  # Мерцающий заголовок
+            title_color = (255, 255, 200) if game_time % 60 < 30 else (200, 230, 255)
+            dirty(hud["title_shadow"].draw(screen))
+            dirty(hud["title"].draw(screen, color=title_color))
+
 
-    control_panel = pygame.Rect(WIDTH - 320, 20, 300, 120)
-    control_surf = pygame.Surface((control_panel.width, control_panel.height), pygame.SRCALPHA)
-    pygame.draw.rect(control_surf, (30, 35, 60, 200), control_surf.get_rect(), border_radius=15)
-    screen.blit(control_surf, control_panel)
-
-    for i, text in enumerate(controls):
-        instr_surface = font_tiny.render(text, True, (200, 200, 220))
-        screen.blit(instr_surface, (WIDTH - 300, 40 + i * 25))
-
-    # Прогресс-бар
-    if NUM_SQUARES > 0:
-        progress = collected_count / NUM_SQUARES
-        bar_width = 400
-        bar_rect = pygame.Rect(WIDTH // 2 - bar_width // 2, HEIGHT - 40, bar_width, 20)
-
-        # Фон прогресс-бара
-        pygame.draw.rect(screen, (50, 55, 80), bar_rect, border_radius=10)
-
-        # Заполненная часть
-        fill_width = max(10, int(bar_width * progress))
-        fill_rect = pygame.Rect(bar_rect.x, bar_rect.y, fill_width, bar_rect.height)
-
-        # Градиент для прогресс-бара
-        for i in range(fill_width):
-            color_ratio = i / bar_width
-            r = int(50 + color_ratio * 200)
-            g = int(150 + color_ratio * 100)
-            b = int(255)
-            pygame.draw.line(screen, (r, g, b),
-                             (bar_rect.x + i, bar_rect.y),
-                             (bar_rect.x + i, bar_rect.y + bar_rect.height))
-
-        pygame.draw.rect(screen, (200, 220, 255), bar_rect, width=2, border_radius=10)
-
-        # Текст прогресса
-        progress_text = font_tiny.render(f"{collected_count}/{NUM_SQUARES}", True, TEXT_COLOR)
-        screen.blit(progress_text, (bar_rect.centerx - 20, bar_rect.y - 25))
-
-    # Декоративные элементы
-    if game_time % 120 < 60:  # Мерцающий заголовок
-        title_color = (255, 255, 200) if game_time % 60 < 30 else (200, 230, 255)
-        title = font_large.render("СОКРОВИЩА", True, title_color)
-        title_shadow = font_large.render("СОКРОВИЩА", True, (0, 0, 0, 100))
-        screen.blit(title_shadow, (WIDTH // 2 - title.get_width() // 2 + 3, 103))
-        screen.blit(title, (WIDTH // 2 - title.get_width() // 2, 100))
-
-    # Обновление экрана
-    pygame.display.flip()
-    clock.tick(FPS)
-
-# Завершение игры
-pygame.quit()
-sys.exit()
\ No newline at end of file
+# Главный игровой цикл
+def main():
+    # С ключом --profile [ФАЙЛ] включается профилировщик кадра,
+    # --max-fps N меняет предел частоты кадров (0 — без ограничения)
+    profiler = FrameProfiler.from_argv()
+    loop = FixedStepLoop.from_argv(TICK_RATE, MAX_FPS)
+    game = TreasureGame(profiler)
+
+    # Первый кадр выводится сразу, а кадры спрайтов дорисовываются, пока он на экране
+    profiler.begin_frame()
+    game.draw(screen)
+    profiler.end_frame()
+    bake_sprites()
+
+    while game.running:
+        profiler.begin_frame()
+        # Обработка событий (R и ESC срабатывают сразу, движение — на ближайшем шаге)
+        for event in pygame.event.get():
+            game.handle_event(event)
+        profiler.lap("events")
+
+        for _ in range(loop.ticks()):
+            game.update(pygame.key.get_pressed())
+        game.draw(screen, loop.alpha)
+        profiler.end_frame()
+        loop.wait()
+
+    # Завершение игры
+    print(loop.summary())
+    print(game.renderer.summary())
+    print(game.camera.summary())
+    print(player_sprites.summary("игрока"))
+    print(treasure_sprites.summary("сокровищ"))
+    profiler.finish()
+    pygame.quit()
+    sys.exit()
+
+
+if __name__ == "__main__":
+    main()